@@ -48,6 +48,90 @@ WINDOW_TITLE = "SkyTracker - GRUPO 7"
 # Ubicación del observador (longitud en grados)
 LOCATION_LONGITUDE = -58.229712
 LOCATION_LATITUDE = -32.495417
+LOCATION_UTC_OFFSET = -3  # Horas respecto de UTC (hora local de Argentina)
+LOCATION_ELEVATION = 20.0  # Metros sobre el elipsoide (paralaje de satélites)
+# UT1 − UTC en segundos (IERS Bulletin A, cambia ~1 ms por día). Solo lo usan los
+# satélites: sin corregir, 0.1 s desvía ~15" la dirección de un satélite en órbita baja
+UT1_UTC_OFFSET = 0.0
+
+# Proyección por matriz de rotación sobre vectores unitarios precalculados
+# (False = proyección trigonométrica con project_many)
+USE_ROTATION_PIPELINE = False
+
+# Posición aparente: convierte el catálogo J2000 a coordenadas de la fecha
+# (precesión, nutación y aberración) recalculando las matrices cada intervalo
+USE_APPARENT_PLACE = False
+APPARENT_PLACE_INTERVAL = 3600.0  # segundos
+USE_REFRACTION = False
+
+# Movimiento propio: las estrellas con pm_ra_mas/pm_dec_mas en el catálogo se
+# propagan desde su época (campo 'epoch' o metadata.epoch; J2000 por defecto)
+# a la fecha actual al cargar, y de nuevo cuando la época se aleja más que esto
+PROPER_MOTION_EPOCH_THRESHOLD = 0.1  # años julianos (~36 días)
+
+# Catálogo de estrellas columnar (.npy por columna, abierto con memmap) para
+# catálogos grandes como Hipparcos o Tycho-2. El JSON queda como capa editable
+# encima: una estrella del JSON reemplaza a la del mismo nombre del catálogo
+STAR_CATALOG_DIR = None       # p. ej. 'shared/catalogs/hipparcos'
+STAR_CATALOG_MAG_LIMIT = 6.5  # magnitud máxima que se proyecta y dibuja (None = todas)
+
+# Precisión del motor de proyección ('float32' o 'float64')
+# El renderer no necesita más que float32; el apuntado de la montura usa float64
+RENDER_PRECISION = 'float32'
+POINTING_PRECISION = 'float64'
+
+# Tabla de posiciones periódica en LST para estrellas y galaxias
+# (pasos × objetos × 12 bytes; con un archivo se abre con memmap. Si cambia el
+# catálogo, la posición aparente o la época de los movimientos propios, se reconstruye)
+USE_SIDEREAL_TABLE = False
+SIDEREAL_TABLE_STEPS = 1440
+SIDEREAL_TABLE_FILE = None  # p. ej. 'shared/sidereal_table.npy'
+SIDEREAL_TABLE_INTERPOLATION = 'linear'  # 'linear' o 'slerp'
+
+# Tablas de efemérides precalculadas (python -m shared.calculations.ephemeris_tables)
+# Si cubren la fecha actual, el inicio no importa skyfield ni usa la red
+EPHEMERIS_TABLE_FILE = 'shared/ephemeris_tables.npz'
+
+# Kernels SPK de skyfield. El recortado (python -m shared.calculations.kernel_excerpt)
+# se usa si existe y cubre la fecha; si no, el completo (se descarga si falta)
+EPHEMERIS_KERNEL = 'de421.bsp'
+EPHEMERIS_SLIM_KERNEL = 'shared/de421_slim.bsp'
+
+# Sin tablas ni skyfield (o sin kernel ni red), usar la teoría analítica de baja
+# precisión (Standish/Schlyter/Meeus, ~1') en lugar de las posiciones viejas del JSON
+EPHEMERIS_ANALYTIC_FALLBACK = True
+
+# Cache de resultados de efemérides por (ubicación, intervalo de tiempo)
+EPHEMERIS_CACHE_BUCKET = 60.0  # segundos
+EPHEMERIS_CACHE_SIZE = 256     # resultados en memoria (LRU)
+EPHEMERIS_CACHE_FILE = None    # p. ej. 'shared/ephemeris_cache.json' para persistir entre ejecuciones
+
+# Estado de efemérides (últimas posiciones de Luna, planetas y Sol) en un archivo
+# aparte del catálogo: celestial_data.json no se reescribe. Se escribe con
+# temporal + rename y como mucho una vez por intervalo; al cargar se aplica encima del JSON
+EPHEMERIS_STATE_FILE = 'shared/ephemeris_state.json'  # None = no persistir
+EPHEMERIS_STATE_INTERVAL = 60.0  # segundos mínimos entre escrituras
+
+# Recálculo de efemérides en segundo plano durante la sesión. Cada cuerpo se
+# recalcula según su velocidad angular aparente para no superar el error de
+# apuntado permitido (la Luna, ~0.5°/h, cada ~2 min; Saturno cada hora)
+USE_EPHEMERIS_WORKER = True
+EPHEMERIS_ERROR_BUDGET = 60.0        # segundos de arco
+EPHEMERIS_MIN_INTERVAL = 10.0        # segundos
+EPHEMERIS_REFRESH_INTERVAL = 3600.0  # segundos (máximo entre recálculos de un cuerpo)
+
+# Satélites artificiales desde un archivo TLE local (requiere sgp4)
+# Se propagan en cada cuadro; fuera de línea, solo con el archivo
+USE_SATELLITES = False
+SATELLITE_TLE_FILE = 'shared/satellites.tle'
+
+# Asteroides y cometas desde un archivo de elementos del MPC (MPCORB.DAT o
+# CometEls.txt). Todo el catálogo se propaga por bloques en segundo plano
+USE_MINOR_BODIES = False
+MINOR_BODIES_FILE = 'shared/MPCORB.DAT'
+MINOR_BODIES_MAX_H = 12.0               # magnitud absoluta máxima (None = todos)
+MINOR_BODIES_CHUNK = 50000              # órbitas por bloque al leer y propagar
+MINOR_BODIES_REFRESH_INTERVAL = 600.0   # segundos entre propagaciones del catálogo
 
 # Estrellas de fondo
 NUM_BACKGROUND_STARS = 150
@@ -63,6 +147,8 @@ COLOR_GALAXY = (0.5, 1.0, 0.5)
 COLOR_PLANET = (1.0, 0.6, 0.2)        
 COLOR_MOON = (0.9, 0.9, 1.0)        
 COLOR_SUN = (1.0, 1.0, 0.0)           
+COLOR_SATELLITE = (0.6, 1.0, 1.0)
+COLOR_MINOR_BODY = (0.8, 0.7, 0.5)
 COLOR_VECTOR = (1.0, 0.0, 0.0)
 COLOR_VECTOR_TIP = (1.0, 1.0, 0.0)
 COLOR_HIT_POINT = (1.0, 1.0, 1.0)
@@ -73,6 +159,8 @@ COLOR_CARDINALS = (1, 1, 0)
 POINT_SIZE_STAR = 6
 POINT_SIZE_BRIGHT_STAR = 8
 POINT_SIZE_GALAXY = 8
+POINT_SIZE_SATELLITE = 4
+POINT_SIZE_MINOR_BODY = 2
 SPHERE_RADIUS_PLANET = 0.4
 SPHERE_RADIUS_MOON = 1.2
 SPHERE_RADIUS_SUN = 1.8
@@ -3,6 +3,7 @@
 Gestión de la cámara y controles
 """
 import math
+import numpy as np
 from pyglet.gl import *
 from config import (
     CAM_X, CAM_Y, CAM_Z, CAM_YAW, CAM_PITCH,
@@ -75,6 +76,22 @@ class Camera:
         # Comparar con el coseno del ángulo FOV/2
         return dot >= self._cos_fov_half
     
+    def in_view_mask(self, points, max_distance=200.0):
+        """
+        Versión vectorizada de is_in_view
+        
+        Args:
+            points: array (N, 3) de posiciones en la escena
+        
+        Returns:
+            np.ndarray: máscara booleana (N,) de los puntos dentro del campo de visión
+        """
+        delta = np.asarray(points, dtype=np.float64) - (self.x, self.y, self.z)
+        distance = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+        dot = delta @ (self._dir_x, self._dir_y, self._dir_z)
+        # dot >= cos · distancia evita dividir (y no falla con distancia 0)
+        return (distance <= max_distance) & (dot >= self._cos_fov_half * distance) & (distance > 0)
+    
     def rotate(self, dx, dy):
         """Rota la cámara según el movimiento del mouse"""
         
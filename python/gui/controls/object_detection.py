@@ -3,12 +3,45 @@
 Detección de objetos celestes apuntados por cámara o vector
 """
 import math
+import numpy as np
 from config import (
     THRESHOLD_OBJECT, THRESHOLD_MOON, 
     THRESHOLD_PLANET, THRESHOLD_CAMERA
 )
 
 
+def _first_within_distance(point, names, xyz, threshold):
+    """Retorna el primer nombre cuya posición está a menos de threshold del punto"""
+    if len(names) == 0:
+        return None
+    
+    d2 = np.sum((xyz - point)**2, axis=1)
+    hits = np.flatnonzero(d2 < threshold*threshold)
+    if hits.size:
+        return names[hits[0]]
+    return None
+
+
+def _closest_within_angle(origin, direction, names, xyz, threshold_deg):
+    """Retorna el nombre con menor ángulo respecto a la dirección, si está bajo el umbral"""
+    if len(names) == 0:
+        return None
+    
+    # Vectores desde el origen a cada objeto
+    v = xyz - origin
+    norm = np.sqrt(np.sum(v*v, axis=1))
+    valid = norm > 0
+    
+    # Producto punto normalizado (coseno del ángulo)
+    dot = np.full(len(names), -1.0)
+    dot[valid] = (v[valid] @ direction) / norm[valid]
+    
+    best = int(np.argmax(dot))
+    if dot[best] > math.cos(math.radians(threshold_deg)):
+        return names[best]
+    return None
+
+
 def detect_pointed_object_by_vector(hit_coords, stars_coords, galaxies_coords, 
                                      planets_coords, moon_coords):
     """
@@ -16,9 +49,9 @@ def detect_pointed_object_by_vector(hit_coords, stars_coords, galaxies_coords,
     
     Args:
         hit_coords: tupla (x, y, z) del punto de impacto del vector
-        stars_coords: lista de coordenadas de estrellas
-        galaxies_coords: lista de coordenadas de galaxias
-        planets_coords: lista de coordenadas de planetas
+        stars_coords: tupla (nombres, array Nx3) de estrellas
+        galaxies_coords: tupla (nombres, array Nx3) de galaxias
+        planets_coords: tupla (nombres, array Nx3) de planetas
         moon_coords: tupla (x, y, z) de la luna
     
     Returns:
@@ -27,31 +60,21 @@ def detect_pointed_object_by_vector(hit_coords, stars_coords, galaxies_coords,
     if hit_coords[0] is None:
         return None
     
-    hit_x, hit_y, hit_z = hit_coords
-    
-    # Verificar estrellas
-    for name, x, y, z in stars_coords:
-        dist = math.sqrt((hit_x - x)**2 + (hit_y - y)**2 + (hit_z - z)**2)
-        if dist < THRESHOLD_OBJECT:
-            return name
-    
-    # Verificar galaxias
-    for name, x, y, z in galaxies_coords:
-        dist = math.sqrt((hit_x - x)**2 + (hit_y - y)**2 + (hit_z - z)**2)
-        if dist < THRESHOLD_OBJECT:
-            return name
+    hit = np.asarray(hit_coords, dtype=np.float64)
     
-    # Verificar planetas
-    for name, x, y, z in planets_coords:
-        dist = math.sqrt((hit_x - x)**2 + (hit_y - y)**2 + (hit_z - z)**2)
-        if dist < THRESHOLD_PLANET:
+    # Verificar estrellas, galaxias y planetas
+    for (names, xyz), threshold in ((stars_coords, THRESHOLD_OBJECT),
+                                    (galaxies_coords, THRESHOLD_OBJECT),
+                                    (planets_coords, THRESHOLD_PLANET)):
+        name = _first_within_distance(hit, names, xyz, threshold)
+        if name:
             return name
     
     # Verificar luna
     dist_moon = math.sqrt(
-        (hit_x - moon_coords[0])**2 + 
-        (hit_y - moon_coords[1])**2 + 
-        (hit_z - moon_coords[2])**2
+        (hit[0] - moon_coords[0])**2 + 
+        (hit[1] - moon_coords[1])**2 + 
+        (hit[2] - moon_coords[2])**2
     )
     if dist_moon < THRESHOLD_MOON:
         return "Luna"
@@ -66,76 +89,24 @@ def detect_looked_object_by_camera(camera, stars_coords, galaxies_coords,
     
     Args:
         camera: objeto Camera
-        stars_coords: lista de coordenadas de estrellas
-        galaxies_coords: lista de coordenadas de galaxias
-        planets_coords: lista de coordenadas de planetas
+        stars_coords: tupla (nombres, array Nx3) de estrellas
+        galaxies_coords: tupla (nombres, array Nx3) de galaxias
+        planets_coords: tupla (nombres, array Nx3) de planetas
         moon_coords: tupla (x, y, z) de la luna
     
     Returns:
         str: nombre del objeto detectado o None
     """
-    cam_dx, cam_dy, cam_dz = camera.get_direction()
-    
-    def check_object(coords, threshold):
-        """Verifica si algún objeto está siendo mirado"""
-        closest_name = None
-        closest_angle = 999
-        
-        for name, x, y, z in coords:
-            # Vector desde cámara al objeto
-            vx = x - camera.x
-            vy = y - camera.y
-            vz = z - camera.z
-            norm = math.sqrt(vx*vx + vy*vy + vz*vz)
-            
-            if norm == 0:
-                continue
-            
-            vx /= norm
-            vy /= norm
-            vz /= norm
-            
-            # Producto punto para calcular ángulo
-            dot = vx*cam_dx + vy*cam_dy + vz*cam_dz
-            dot = max(-1, min(1, dot))  # clamp
-            angle = math.degrees(math.acos(dot))
-            
-            if angle < threshold and angle < closest_angle:
-                closest_angle = angle
-                closest_name = name
-        
-        return closest_name
+    origin = np.array([camera.x, camera.y, camera.z], dtype=np.float64)
+    direction = np.array(camera.get_direction(), dtype=np.float64)
     
-    # Verificar estrellas
-    looked = check_object(stars_coords, THRESHOLD_CAMERA)
-    if looked:
-        return looked
-    
-    # Verificar galaxias
-    looked = check_object(galaxies_coords, THRESHOLD_CAMERA)
-    if looked:
-        return looked
-    
-    # Verificar planetas
-    looked = check_object(planets_coords, THRESHOLD_CAMERA)
-    if looked:
-        return looked
+    # Verificar estrellas, galaxias y planetas
+    for names, xyz in (stars_coords, galaxies_coords, planets_coords):
+        looked = _closest_within_angle(origin, direction, names, xyz, THRESHOLD_CAMERA)
+        if looked:
+            return looked
     
     # Verificar luna
-    vx = moon_coords[0] - camera.x
-    vy = moon_coords[1] - camera.y
-    vz = moon_coords[2] - camera.z
-    norm = math.sqrt(vx*vx + vy*vy + vz*vz)
-    
-    if norm > 0:
-        vx /= norm
-        vy /= norm
-        vz /= norm
-        dot = vx*cam_dx + vy*cam_dy + vz*cam_dz
-        dot = max(-1, min(1, dot))
-        angle = math.degrees(math.acos(dot))
-        
-        if angle < THRESHOLD_CAMERA:
-            return "Luna"
-    
-    return None
\ No newline at end of file
+    return _closest_within_angle(
+        origin, direction, ["Luna"], np.array([moon_coords], dtype=np.float64), THRESHOLD_CAMERA
+    )
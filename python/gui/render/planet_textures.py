@@ -6,6 +6,7 @@ import pyglet
 from pyglet.gl import *
 import os
 import ctypes
+import numpy as np
 from config import SHOW_TEXTURES, POINT_SIZE_GALAXY
 from gui.render.custom_sphere_vbo import draw_sphere
 from gui.controls.camera import Camera
@@ -111,20 +112,83 @@ class PlanetTextureManager:
         return planet_name.lower() in self.textures
 
 
-def draw_celestial_objects_with_textures(stars_coords, galaxies_coords, planets_coords, 
-                                        moon_coords, planet_sphere_vbo, texture_manager, camera, fov, use_lighting=True):
+SUN_NAMES = ("sun", "sol")
+
+
+def star_style(names, celestial_objects):
+    """
+    Tamaño y color de dibujo de las estrellas del JSON (cambian solo con el catálogo)
+    
+    Args:
+        names: nombres de las estrellas en el orden de su bloque de coordenadas
+        celestial_objects: diccionario objects del CatalogState
+    
+    Returns:
+        tuple: (order, sizes, colors, sun_index)
+            order: índices de las estrellas sin el Sol, ordenadas por tamaño
+            sizes, colors: tamaño de punto y RGB (N, 3) float32 en ese orden
+            sun_index: índice del Sol en el bloque (o None)
+    """
+    from config import COLOR_STAR
+    
+    sun_index = None
+    indices, sizes, colors = [], [], []
+    for i, name in enumerate(names):
+        if name.lower() in SUN_NAMES:
+            sun_index = i
+            continue
+        obj_data = celestial_objects.get(name.lower(), {})
+        indices.append(i)
+        sizes.append(obj_data.get("size", 6))
+        colors.append([min(c * 1.25, 1.15) for c in obj_data.get("color", list(COLOR_STAR))])
+    
+    sizes = np.asarray(sizes, dtype=np.float32)
+    order = np.argsort(sizes, kind='stable')
+    sizes = sizes[order]
+    colors = np.asarray(colors, dtype=np.float32).reshape(-1, 3)[order]
+    return np.asarray(indices, dtype=np.intp)[order], sizes, colors, sun_index
+
+
+def _draw_points(xyz):
+    """Envía un array (N, 3) como puntos en un solo glDrawArrays (con el estado GL actual)"""
+    if len(xyz) == 0:
+        return
+    vertices = np.ascontiguousarray(xyz, dtype=np.float32)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, vertices.ctypes.data)
+    glDrawArrays(GL_POINTS, 0, len(vertices))
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+
+def draw_celestial_objects_with_textures(stars, galaxies, planets, 
+                                        moon_coords, planet_sphere_vbo, texture_manager, camera, fov, use_lighting=True,
+                                        celestial_objects=None, stars_style=None):
     """
     Versión con ILUMINACIÓN OPCIONAL para realismo
     
     Args:
+        stars, galaxies, planets: tuplas (nombres, array (N, 3)) de CoordinateCache.get_arrays
+        moon_coords: posición (x, y, z) de la Luna
         texture_manager: instancia de PlanetTextureManager
         use_lighting: si True, aplica iluminación realista a planetas
+        celestial_objects: diccionario objects del CatalogState con el que se
+                           proyectaron las coordenadas (None = el publicado ahora)
+        stars_style: resultado de star_style para ese estado (None = calcularlo aquí)
     """
-    from shared.celestial_data import get_all_celestial_objects
-    from config import COLOR_STAR, COLOR_SUN, COLOR_GALAXY, COLOR_PLANET, COLOR_MOON
-    from gui.render.renderer import push_inside_dome
+    from config import COLOR_SUN, COLOR_GALAXY, COLOR_PLANET, COLOR_MOON, DOME_PUSH_FACTOR
+    from gui.render.renderer import push_inside_dome, draw_catalog_stars
+    
+    if celestial_objects is None:
+        from shared.celestial_data import get_all_celestial_objects
+        celestial_objects = get_all_celestial_objects()
     
-    celestial_objects = get_all_celestial_objects()
+    star_names, stars_xyz = stars
+    _, galaxies_xyz = galaxies
+    planet_names, planets_xyz = planets
+    if stars_style is None:
+        stars_style = star_style(star_names, celestial_objects)
+    star_order, star_sizes, star_colors, sun_index = stars_style
+    sun_pos = tuple(stars_xyz[sun_index].tolist()) if sun_index is not None else None
 
     # =================================================================
     # CONFIGURAR ILUMINACIÓN SI ESTÁ ACTIVADA
@@ -134,12 +198,6 @@ def draw_celestial_objects_with_textures(stars_coords, galaxies_coords, planets_
         glEnable(GL_LIGHT0)
         
         # Luz desde el Sol (posición del Sol si existe)
-        sun_pos = None
-        for name, x, y, z in stars_coords:
-            if name.lower() in ("sun", "sol"):
-                sun_pos = (x, y, z)
-                break
-        
         if sun_pos:
             light_pos = (GLfloat * 4)(sun_pos[0], sun_pos[1], sun_pos[2], 1.0)
         else:
@@ -166,24 +224,14 @@ def draw_celestial_objects_with_textures(stars_coords, galaxies_coords, planets_
     glEnable(GL_BLEND)
     glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
     
-    for name, x, y, z in stars_coords:
-        if name.lower() not in ("sun", "sol"):
-            x, y, z = push_inside_dome(x, y, z)
-            
-            if not camera.is_in_view((x, y, z), fov):
-                continue
-
-            obj_data = celestial_objects.get(name.lower(), {"size": 6, "color": list(COLOR_STAR)})
-            size = obj_data.get("size", 6)
-            color = obj_data.get("color", list(COLOR_STAR))
-            
-            bright_color = [min(c * 1.25, 1.15) for c in color]
-            
-            glPointSize(size)
-            glColor3f(*bright_color)
-            glBegin(GL_POINTS)
-            glVertex3f(x, y, z)
-            glEnd()
+    # Arrays ordenados por tamaño: un draw call por tamaño, sin tuplas por estrella
+    xyz = stars_xyz[star_order] * DOME_PUSH_FACTOR
+    in_view = camera.in_view_mask(xyz)
+    sizes = star_sizes[in_view]
+    values, starts = np.unique(sizes, return_index=True)
+    stops = np.append(starts[1:], len(sizes))
+    draw_catalog_stars(xyz[in_view], star_colors[in_view],
+                       list(zip(values.tolist(), starts.tolist(), stops.tolist())))
     
     glDisable(GL_POINT_SMOOTH)
     glDisable(GL_BLEND)
@@ -193,13 +241,11 @@ def draw_celestial_objects_with_textures(stars_coords, galaxies_coords, planets_
     # =================================================================
     glDisable(GL_LIGHTING)  # El Sol no recibe luz
     
-    for name, x, y, z in stars_coords:
-        if name.lower() in ("sun", "sol"):
-            x, y, z = push_inside_dome(x, y, z)
-            
-            if not camera.is_in_view((x, y, z), fov):
-                continue
-
+    if sun_pos is not None:
+        name = star_names[sun_index]
+        x, y, z = push_inside_dome(*sun_pos)
+        
+        if camera.is_in_view((x, y, z), fov):
             obj_data = celestial_objects.get(name.lower(), {"size": 1.8, "color": list(COLOR_SUN)})
             size = obj_data.get("size", 1.8)
             
@@ -223,7 +269,6 @@ def draw_celestial_objects_with_textures(stars_coords, galaxies_coords, planets_
                 draw_sphere(planet_sphere_vbo, size)
             
             glPopMatrix()
-            break
 
     # =================================================================
     # GALAXIAS - CON/FALLO DE TEXTURA, SIN ILUMINACIÓN
@@ -246,6 +291,7 @@ def draw_celestial_objects_with_textures(stars_coords, galaxies_coords, planets_
     glPointParameterf(GL_POINT_SIZE_MIN, 1.0)
     glPointParameterf(GL_POINT_SIZE_MAX, 1024.0)
 
+    visible_galaxies = galaxies_xyz[camera.in_view_mask(galaxies_xyz)]
     texture_id = texture_manager.get_texture_id("andromeda")
 
     if texture_id is not None:
@@ -255,12 +301,7 @@ def draw_celestial_objects_with_textures(stars_coords, galaxies_coords, planets_
         glPointSize(point_size)
         glColor4f(1, 1, 1, 0.1)
         glBindTexture(GL_TEXTURE_2D, texture_id)
-        glBegin(GL_POINTS)
-        for name, x, y, z in galaxies_coords:
-            if not camera.is_in_view((x, y, z), fov):
-                continue
-            glVertex3f(x, y, z)
-        glEnd()
+        _draw_points(visible_galaxies)
         glBindTexture(GL_TEXTURE_2D, 0)
         glDisable(GL_TEXTURE_2D)
     else:
@@ -269,12 +310,7 @@ def draw_celestial_objects_with_textures(stars_coords, galaxies_coords, planets_
         glPointSize(POINT_SIZE_GALAXY)
         from config import COLOR_GALAXY
         glColor4f(*COLOR_GALAXY, 1) 
-        glBegin(GL_POINTS)
-        for name, x, y, z in galaxies_coords:
-            if not camera.is_in_view((x, y, z), fov):
-                continue
-            glVertex3f(x, y, z)
-        glEnd()
+        _draw_points(visible_galaxies)
 
     # Restaurar estado
     glDisable(GL_POINT_SPRITE)
@@ -292,7 +328,7 @@ def draw_celestial_objects_with_textures(stars_coords, galaxies_coords, planets_
         # Modo que combina textura con iluminación
         glTexEnvi(GL_TEXTURE_ENV, GL_TEXTURE_ENV_MODE, GL_MODULATE)
     
-    for name, x, y, z in planets_coords:
+    for name, (x, y, z) in zip(planet_names, planets_xyz.tolist()):
         x, y, z = push_inside_dome(x, y, z)
 
         if not camera.is_in_view((x, y, z), fov):
@@ -2,16 +2,17 @@
 Funciones de renderizado de objetos 3D - VERSIÓN SEGURA CON DEBUG
 """
 import math
+import numpy as np
 import pyglet
 from pyglet.gl import *
-from shared.celestial_data import get_all_celestial_objects
 from config import (
     WORLD_MIN, WORLD_MAX,
     COLOR_GROUND, COLOR_GRID, COLOR_WALLS,
     COLOR_STAR, COLOR_STAR_BLUE, COLOR_STAR_RED, COLOR_GALAXY, COLOR_PLANET, COLOR_SUN, COLOR_MOON,
     COLOR_VECTOR, COLOR_VECTOR_TIP, COLOR_HIT_POINT,
     COLOR_CROSSHAIR, COLOR_CARDINALS,
-    CROSSHAIR_SIZE, USE_DOME_GEOMETRY, DOME_RADIUS
+    CROSSHAIR_SIZE, USE_DOME_GEOMETRY, DOME_RADIUS,
+    COLOR_SATELLITE, POINT_SIZE_SATELLITE, COLOR_MINOR_BODY, POINT_SIZE_MINOR_BODY
 )
 
 
@@ -108,6 +109,69 @@ def draw_environment(camera, background_stars, use_dome=False):
     glEnd()
 
 
+def draw_satellites(xyz):
+    """
+    Dibuja los satélites visibles como puntos
+    
+    Args:
+        xyz: array (N, 3) de posiciones en la escena (se envía entero en un solo draw call)
+    """
+    _draw_point_array(xyz, POINT_SIZE_SATELLITE, COLOR_SATELLITE)
+
+
+def draw_minor_bodies(xyz):
+    """
+    Dibuja los asteroides y cometas sobre el horizonte como puntos
+    
+    Args:
+        xyz: array (N, 3) de posiciones en la escena (se envía entero en un solo draw call)
+    """
+    _draw_point_array(xyz, POINT_SIZE_MINOR_BODY, COLOR_MINOR_BODY)
+
+
+def draw_catalog_stars(xyz, colors, batches):
+    """
+    Dibuja las estrellas del catálogo columnar con su color y tamaño
+    
+    Args:
+        xyz: array (N, 3) de posiciones en la escena, ordenadas por tamaño de punto
+        colors: array (N, 3) RGB 0-1
+        batches: lista de (tamaño, inicio, fin); un draw call por tamaño
+    """
+    if xyz is None or len(xyz) == 0:
+        return
+    
+    vertices = np.ascontiguousarray(xyz, dtype=np.float32)
+    rgb = np.ascontiguousarray(colors, dtype=np.float32)
+    glDisable(GL_LIGHTING)
+    glDisable(GL_TEXTURE_2D)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glEnableClientState(GL_COLOR_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, vertices.ctypes.data)
+    glColorPointer(3, GL_FLOAT, 0, rgb.ctypes.data)
+    for size, start, stop in batches:
+        glPointSize(size)
+        glDrawArrays(GL_POINTS, start, stop - start)
+    glDisableClientState(GL_COLOR_ARRAY)
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+
+def _draw_point_array(xyz, size, color):
+    """Dibuja un array de posiciones como puntos con un único glDrawArrays"""
+    if xyz is None or len(xyz) == 0:
+        return
+    
+    vertices = np.ascontiguousarray(xyz, dtype=np.float32)
+    glDisable(GL_LIGHTING)
+    glDisable(GL_TEXTURE_2D)
+    glPointSize(size)
+    glColor3f(*color)
+    glEnableClientState(GL_VERTEX_ARRAY)
+    glVertexPointer(3, GL_FLOAT, 0, vertices.ctypes.data)
+    glDrawArrays(GL_POINTS, 0, len(vertices))
+    glDisableClientState(GL_VERTEX_ARRAY)
+
+
 def push_inside_dome(x, y, z, factor=None):
     """Empuja un punto ligeramente hacia adentro del domo para evitar clipping."""
     from config import DOME_PUSH_FACTOR
@@ -58,9 +58,21 @@ class LookAtDisplay:
 class SearchBox:
     """Clase para gestionar el cuadro de búsqueda de objetos - OPTIMIZADA"""
     
-    def __init__(self):
+    # Caracteres aceptados además de letras, números y espacios ('C/2020 F3', "Barnard's")
+    EXTRA_CHARS = "-()'./+"
+    
+    def __init__(self, suggest=None, max_suggestions=5):
+        """
+        Args:
+            suggest: función (texto, límite) -> lista de nombres sugeridos (opcional)
+            max_suggestions: sugerencias visibles debajo del texto
+        """
         self.active = False
         self.text = ""
+        self.suggest = suggest
+        self.max_suggestions = max_suggestions
+        self.suggestions = []
+        self.selected = -1  # -1 = sin selección (ENTER usa el texto escrito)
         
         # Pre-crear labels para evitar recreación
         self.title_label = pyglet.text.Label(
@@ -79,11 +91,12 @@ class SearchBox:
         )
         
         self.help_label = pyglet.text.Label(
-            "ENTER: buscar | ESC: cancelar",
+            "ENTER: buscar | TAB: completar | ESC: cancelar",
             x=0, y=0,
             color=(200, 200, 200, 255),
             font_size=10
         )
+        self.suggestion_labels = []
         
         # Batch para renderizar todo junto
         self.batch = pyglet.graphics.Batch()
@@ -96,6 +109,8 @@ class SearchBox:
         self.title_label.delete()
         self.search_label.delete()
         self.help_label.delete()
+        for label in self.suggestion_labels:
+            label.delete()
         
         self.title_label = pyglet.text.Label(
             "Buscar objeto celeste:",
@@ -115,39 +130,86 @@ class SearchBox:
         )
         
         self.help_label = pyglet.text.Label(
-            "ENTER: buscar | ESC: cancelar",
+            "ENTER: buscar | TAB: completar | ESC: cancelar",
             x=0, y=0,
             color=(200, 200, 200, 255),
             font_size=10,
             batch=self.batch
         )
+        
+        self.suggestion_labels = [
+            pyglet.text.Label(
+                "",
+                x=0, y=0,
+                color=(160, 200, 200, 255),
+                font_size=11,
+                batch=self.batch
+            )
+            for _ in range(self.max_suggestions)
+        ]
     
     def activate(self):
         """Activa el cuadro de búsqueda"""
         self.active = True
-        self.text = ""
+        self.clear()
     
     def deactivate(self):
         """Desactiva el cuadro de búsqueda"""
         self.active = False
-        self.text = ""
+        self.clear()
     
     def add_char(self, char):
         """Agrega un carácter al texto de búsqueda"""
-        if len(self.text) < 30 and char.isprintable() and (char.isalnum() or char.isspace()):
+        if len(self.text) < 30 and char.isprintable() and (
+                char.isalnum() or char.isspace() or char in self.EXTRA_CHARS):
             self.text += char
+            self._update_suggestions()
     
     def backspace(self):
         """Elimina el último carácter"""
         self.text = self.text[:-1]
+        self._update_suggestions()
     
     def get_text(self):
         """Retorna el texto actual"""
         return self.text.strip()
     
+    def get_selection(self):
+        """Retorna la sugerencia elegida o, si no hay, el texto actual"""
+        if 0 <= self.selected < len(self.suggestions):
+            return self.suggestions[self.selected]
+        return self.get_text()
+    
+    def move_selection(self, step):
+        """Mueve la selección entre las sugerencias (step = +1 abajo, -1 arriba)"""
+        if self.suggestions:
+            self.selected = max(-1, min(len(self.suggestions) - 1, self.selected + step))
+    
+    def complete(self):
+        """Reemplaza el texto por la sugerencia elegida (o la primera)"""
+        if self.suggestions:
+            self.text = self.suggestions[max(self.selected, 0)]
+            self._update_suggestions()
+    
     def clear(self):
         """Limpia el texto"""
         self.text = ""
+        self.suggestions = []
+        self.selected = -1
+    
+    def _update_suggestions(self):
+        """
+        Recalcula las sugerencias para el texto actual
+        
+        Corre en el hilo de la GUI: los índices de nombres (prefijos y
+        trigramas) se arman al cargar los catálogos, acá solo se consultan.
+        """
+        self.selected = -1
+        text = self.get_text()
+        if self.suggest is None or not text:
+            self.suggestions = []
+            return
+        self.suggestions = self.suggest(text, self.max_suggestions)[:self.max_suggestions]
     
     def draw(self, window):
         """Dibuja el cuadro de búsqueda - OPTIMIZADO"""
@@ -163,11 +225,13 @@ class SearchBox:
         glLoadIdentity()
         glDisable(GL_DEPTH_TEST)
         
-        # Dimensiones y posición del cuadro
+        # Dimensiones y posición del cuadro (crece hacia abajo con las sugerencias)
+        line_height = 20
+        extra_height = line_height * len(self.suggestions)
         box_width = 400
-        box_height = 100
+        box_height = 100 + extra_height
         box_x = window.width - 550
-        box_y = window.height - 150
+        box_y = window.height - 150 - extra_height
         
         # Cuadro de fondo
         glColor4f(0.0, 0.0, 0.0, 0.8)
@@ -190,11 +254,21 @@ class SearchBox:
         
         # Actualizar posiciones de los labels
         self.title_label.x = box_x + 10
-        self.title_label.y = box_y + 70
+        self.title_label.y = box_y + extra_height + 70
         
         self.search_label.text = self.text + "_"
         self.search_label.x = box_x + 10
-        self.search_label.y = box_y + 40
+        self.search_label.y = box_y + extra_height + 40
+        
+        for i, label in enumerate(self.suggestion_labels):
+            if i < len(self.suggestions):
+                selected = i == self.selected
+                label.text = ("> " if selected else "  ") + self.suggestions[i]
+                label.color = (255, 255, 0, 255) if selected else (160, 200, 200, 255)
+            else:
+                label.text = ""
+            label.x = box_x + 20
+            label.y = box_y + extra_height + 35 - line_height * (i + 1)
         
         self.help_label.x = box_x + 10
         self.help_label.y = box_y + 10
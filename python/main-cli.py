@@ -1,6 +1,5 @@
 import threading
 import time
-from datetime import datetime, timezone
 
 # ============================================================
 # ACTUALIZAR EFEMÉRIDES AL INICIO
@@ -10,22 +9,19 @@ print("Inicializando SkyTracker Console...")
 print("="*60)
 
 try:
-    from shared.calculations.ephemeris_calculator import calculate_ephemeris, update_json_file
+    from shared.calculations.ephemeris_cache import get_ephemeris
     
     print("\nActualizando posiciones planetarias...")
     # Ubicación: Concepción del Uruguay, Entre Ríos, Argentina
-    ephemeris = calculate_ephemeris(location_lat=-32.4833, location_lon=-58.229561)
+    # Tablas precalculadas (sin skyfield ni red), skyfield o teoría analítica, memoizado por minuto
+    ephemeris = get_ephemeris(location_lat=-32.4833, location_lon=-58.229561, verbose=True)
     
     if ephemeris is not None:
-        success = update_json_file(ephemeris, filename='shared/celestial_data.json')
-        if success:
-            print("¡Efemérides actualizadas correctamente!")
-            # Recargar los datos actualizados
-            import importlib
-            import shared.celestial_data
-            importlib.reload(shared.celestial_data)
-        else:
-            print("No se pudo actualizar el archivo, usando valores existentes")
+        # Se publican en el catálogo en memoria; el estado de efemérides se guarda
+        # aparte (celestial_data.json no se reescribe)
+        from shared.celestial_data import publish_ephemeris
+        publish_ephemeris(ephemeris, persist=True)
+        print("¡Efemérides actualizadas correctamente!")
     else:
         print("No se pudieron calcular efemérides (sin skyfield o sin internet)")
         print("Usando valores predeterminados del archivo JSON")
@@ -44,9 +40,12 @@ print("="*60 + "\n")
 # ============================================================
 
 from shared.celestial_data import get_object_list_text
-from shared.calculations.astronomy import calculate_lst
+from shared.sidereal_clock import sidereal_clock
+from shared.ephemeris_worker import ephemeris_worker
 from gui.controls.vector import PointerVector
 from shared.tracker import ObjectTracker
+from shared.calculations.satellites import SatelliteCatalog
+from shared.calculations.minor_bodies import MinorBodyCatalog
 from config import *
 from server.serial_comm import SerialComm
 from server.server import Server
@@ -56,7 +55,15 @@ class SkyTrackerConsole:
     def __init__(self):
         self.vector = PointerVector()          # Rojo
         self.sensor_vector = PointerVector()   # Verde
-        self.tracker = ObjectTracker()
+        self.clock = sidereal_clock
+        self.satellites = SatelliteCatalog.from_tle_file(SATELLITE_TLE_FILE) if USE_SATELLITES else None
+        # Cuerpos menores: la consola solo propaga el objeto rastreado
+        self.minor_bodies = (
+            MinorBodyCatalog.from_file(MINOR_BODIES_FILE) if USE_MINOR_BODIES else None
+        )
+        self.tracker = ObjectTracker(
+            clock=self.clock, satellites=self.satellites, minor_bodies=self.minor_bodies
+        )
         self.running = True
         self.input_text = ""
         self.current_input = ""
@@ -65,6 +72,11 @@ class SkyTrackerConsole:
         self.server = Server(self)
         self.server.start()
 
+        # Recálculo de efemérides en segundo plano (Luna y planetas)
+        self.ephemeris_worker = ephemeris_worker
+        if USE_EPHEMERIS_WORKER:
+            self.ephemeris_worker.start()
+
         # Simulación ESP32
         if not SIMULATE:
             self.serial_device = SerialComm(simulate=False)
@@ -102,8 +114,7 @@ class SkyTrackerConsole:
 
     # --- Dibuja consola ---
     def draw_console(self):
-        now_utc = datetime.now(timezone.utc)
-        lst_deg, lst_h = calculate_lst(now_utc, LOCATION_LONGITUDE)
+        lst_deg, lst_h = self.clock.lst()
         tracking_obj = self.tracker.get_tracked_object_name()
         server_ip = self.server.get_server_ip()
 
@@ -133,7 +144,7 @@ class SkyTrackerConsole:
         if text == "":
             self.tracker.stop_tracking()
         elif self.tracker.start_tracking(text):
-            print(f"\nRastreando {text}")
+            print(f"\nRastreando {self.tracker.get_tracked_object_name()}")
             time.sleep(0.5)
         else:
             print(f"\nNo se encontró el objeto '{text}'")
@@ -168,6 +179,7 @@ class SkyTrackerConsole:
         finally:
             termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
             self.server.stop()
+            self.ephemeris_worker.stop()
 
 
 if __name__ == "__main__":
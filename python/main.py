@@ -5,7 +5,6 @@ Programa de visualización astronómica 3D
 import pyglet
 from pyglet.gl import *
 from pyglet.window import key
-from datetime import datetime, timezone
 import random
 
 # ============================================================
@@ -16,22 +15,19 @@ print("Inicializando SkyTracker...")
 print("="*60)
 
 try:
-    from shared.calculations.ephemeris_calculator import calculate_ephemeris, update_json_file
+    from shared.calculations.ephemeris_cache import get_ephemeris
     
     print("\nActualizando posiciones planetarias...")
     # Ubicación: Concepción del Uruguay, Entre Ríos, Argentina
-    ephemeris = calculate_ephemeris(location_lat=-32.4833, location_lon=-58.229561)
+    # Tablas precalculadas (sin skyfield ni red), skyfield o teoría analítica, memoizado por minuto
+    ephemeris = get_ephemeris(location_lat=-32.4833, location_lon=-58.229561, verbose=True)
     
     if ephemeris is not None:
-        success = update_json_file(ephemeris, filename='shared/celestial_data.json')
-        if success:
-            print("¡Efemérides actualizadas correctamente!")
-            # Recargar los datos actualizados
-            import importlib
-            import shared.celestial_data
-            importlib.reload(shared.celestial_data)
-        else:
-            print("No se pudo actualizar el archivo, usando valores existentes")
+        # Se publican en el catálogo en memoria; el estado de efemérides se guarda
+        # aparte (celestial_data.json no se reescribe)
+        from shared.celestial_data import publish_ephemeris
+        publish_ephemeris(ephemeris, persist=True)
+        print("¡Efemérides actualizadas correctamente!")
     else:
         print("No se pudieron calcular efemérides (sin skyfield o sin internet)")
         print("Usando valores predeterminados del archivo JSON")
@@ -51,13 +47,20 @@ print("="*60 + "\n")
 
 # Importar módulos del proyecto
 from config import *
-from shared.celestial_data import REAL_STARS, GALAXIES, PLANETS, MOON_RA_DEC
-from shared.calculations.astronomy import calculate_lst, ra_dec_to_xyz
+from shared.celestial_data import get_catalog_state, get_catalog_version
+from shared.calculations.astronomy import (
+    project_many, project_unit_vectors, scale_projection, precision_dtype
+)
+from shared.calculations.apparent_place import apparent_place, apply_refraction
+from shared.calculations.sidereal_table import SiderealLookupTable, catalog_hash
+from shared.calculations.satellites import SatelliteCatalog
+from shared.calculations.minor_bodies import MinorBodyCatalog
 from gui.controls.camera import Camera
 from gui.controls.vector import PointerVector
 from gui.render.renderer import (
     draw_crosshair, draw_environment, 
-    draw_cardinals, draw_text_2d, CachedTextRenderer
+    draw_cardinals, draw_text_2d, draw_satellites, draw_minor_bodies, draw_catalog_stars,
+    CachedTextRenderer
 )
 from gui.render.ui import SearchBox, InfoDisplay, LookAtDisplay
 from gui.controls.object_detection import (
@@ -74,32 +77,160 @@ from server.server import Server
 # ============================================================
 # IMPORTAR SISTEMA DE TEXTURAS
 # ============================================================
-from gui.render.planet_textures import PlanetTextureManager, draw_celestial_objects_with_textures
+from gui.render.planet_textures import (
+    PlanetTextureManager, draw_celestial_objects_with_textures, star_style
+)
 from gui.render.custom_sphere_vbo import create_sphere_vertex_list
+from shared.sidereal_clock import sidereal_clock
+from shared.ephemeris_worker import ephemeris_worker
 
-import time
+import threading
+import numpy as np
 
 
 class CoordinateCache:
     """Cache de coordenadas celestiales para evitar recalcular proyecciones"""
     
-    def __init__(self):
+    def __init__(self, use_rotation=USE_ROTATION_PIPELINE, use_apparent=USE_APPARENT_PLACE,
+                 use_refraction=USE_REFRACTION, clock=sidereal_clock,
+                 precision=RENDER_PRECISION, use_table=USE_SIDEREAL_TABLE, minor_bodies=None):
         self.last_lst_h = None
-        self.stars_coords = []
-        self.galaxies_coords = []
-        self.planets_coords = []
+        self.dtype = precision_dtype(precision)
+        self.use_apparent = use_apparent
+        self.use_refraction = use_refraction
+        # La posición aparente y la refracción trabajan sobre vectores unitarios
+        self.use_rotation = use_rotation or use_apparent or use_refraction
+        self.clock = clock
         self.moon_coords = None
-        self.projection_func = None
+        self.projection_mode = None
         self.projection_kwargs = {}
         
         # Umbral de cambio para actualizar (en horas)
         self.update_threshold = 0.001  # ~3.6 segundos
+        
+        # Asteroides y cometas: vectores de la última propagación publicada
+        self.minor_bodies = minor_bodies
+        self.minor_epoch = None
+        self.minor_xyz = None
+        
+        # Catálogo completo en arrays contiguos (se rearma solo si cambia la versión)
+        self.catalog_version = None
+        self._build_catalog_arrays()
+        
+        # Tabla periódica en LST para estrellas y galaxias (opcional)
+        self.sidereal_table = None
+        if use_table:
+            self._build_sidereal_table()
+    
+    def _build_catalog_arrays(self):
+        """Concatena todas las categorías en arrays RA/DEC y guarda el rango de cada una"""
+        # Un solo estado publicado: nombres, coordenadas y vectores siempre coherentes
+        state = get_catalog_state()
+        self.state = state
+        self.catalog_version = state.version
+        self.stars_style = None  # estilo de dibujo de las estrellas del JSON (se arma al dibujar)
+        self.names = {}
+        self.slices = {}
+        start = 0
+        
+        for group in ('stars', 'galaxies', 'planets'):
+            names = state.arrays[group][0]
+            self.names[group] = names
+            self.slices[group] = slice(start, start + len(names))
+            start += len(names)
+        
+        # La Luna va al final
+        groups = [state.arrays[group] for group in ('stars', 'galaxies', 'planets', 'moon')]
+        self.ra_h = np.concatenate([ra for _, ra, _, _ in groups])
+        self.dec_deg = np.concatenate([dec for _, _, dec, _ in groups])
+        self.xyz = np.zeros((len(self.ra_h), 3), dtype=self.dtype)
+        
+        # Vectores unitarios precalculados por el loader (modo rotación)
+        self.unit_vectors = None
+        self.apparent_vectors = None
+        self.apparent_epoch = None
+        if self.use_rotation:
+            self.unit_vectors = np.concatenate(
+                [vectors for _, _, _, vectors in groups]
+            ).astype(self.dtype)
+            self.apparent_vectors = self.unit_vectors
+        
+        # Catálogo columnar: se proyecta aparte y se dibuja con arrays, sin listas
+        # de tuplas. Ordenado por tamaño de punto para un draw call por tamaño
+        self.catalog_vectors = None
+        self.catalog_xyz = None
+        self.catalog_colors_visible = None
+        self.catalog_batches = []
+        catalog_vectors = state.arrays['catalog'][3]
+        if state.catalog is not None and len(catalog_vectors):
+            order = np.argsort(state.catalog.size, kind='stable')
+            self.catalog_vectors = catalog_vectors[order].astype(self.dtype)
+            self.catalog_sizes = np.maximum(np.rint(state.catalog.size[order]), 1.0)
+            self.catalog_colors = state.catalog.color[order]
+    
+    def _build_sidereal_table(self):
+        """
+        Construye (o abre de disco) la tabla de posiciones de los objetos fijos
+        
+        Se llama también en cada cambio de versión del catálogo: si estrellas y
+        galaxias no cambiaron (p. ej. solo efemérides nuevas) la tabla actual se conserva.
+        """
+        state = self.state
+        fixed_vectors = np.concatenate([state.arrays['stars'][3], state.arrays['galaxies'][3]])
+        source_hash = catalog_hash(fixed_vectors)
+        if self.sidereal_table is not None and self.sidereal_table.matches(
+                LOCATION_LATITUDE, source_hash, self.use_apparent, state.epoch):
+            return
+        
+        if self.use_apparent:
+            fixed_vectors = apparent_place.transform(fixed_vectors, self.clock.utc_now().timestamp())
+        
+        self.sidereal_table = SiderealLookupTable.load_or_build(
+            fixed_vectors, steps=SIDEREAL_TABLE_STEPS, path=SIDEREAL_TABLE_FILE,
+            source_hash=source_hash, use_apparent=self.use_apparent, epoch=state.epoch
+        )
+    
+    def _update_from_table(self, lst_h, projection_mode, projection_kwargs):
+        """Lee los objetos fijos de la tabla y proyecta solo planetas y Luna"""
+        n_fixed = self.slices['galaxies'].stop
+        fixed = self.sidereal_table.lookup(
+            lst_h, dome_radius=1.0, interpolation=SIDEREAL_TABLE_INTERPOLATION
+        ).astype(self.dtype, copy=False)
+        
+        if self.use_rotation:
+            moving = project_unit_vectors(self.apparent_vectors[n_fixed:], lst_h, dome_radius=1.0)
+        else:
+            moving = project_many(
+                self.ra_h[n_fixed:], self.dec_deg[n_fixed:], lst_h, dome_radius=1.0, dtype=self.dtype
+            )
+        
+        xyz = np.concatenate([fixed, moving])
+        if self.use_refraction:
+            xyz = apply_refraction(xyz)
+        return scale_projection(xyz, projection_mode, **projection_kwargs)
+    
+    def _update_apparent_vectors(self):
+        """Recalcula los vectores aparentes solo cuando cambia la época de las matrices"""
+        now = self.clock.utc_now().timestamp()
+        epoch = apparent_place.epoch_key(now)
+        if epoch != self.apparent_epoch:
+            self.apparent_vectors = apparent_place.transform(self.unit_vectors, now)
+            self.apparent_epoch = epoch
     
     def should_update(self, lst_h):
         """Determina si necesita actualizar las coordenadas"""
         if self.last_lst_h is None:
             return True
         
+        # Efemérides nuevas publicadas por el hilo de recálculo
+        if get_catalog_version() != self.catalog_version:
+            return True
+        
+        # Nueva propagación de cuerpos menores
+        if self.minor_bodies is not None and self.minor_bodies.snapshot is not None:
+            if self.minor_bodies.snapshot[0] != self.minor_epoch:
+                return True
+        
         # Calcular diferencia considerando el wrap en 24h
         diff = abs(lst_h - self.last_lst_h)
         if diff > 12:  # Si la diferencia es mayor a 12h, tomamos el camino corto
@@ -107,31 +238,80 @@ class CoordinateCache:
         
         return diff >= self.update_threshold
     
-    def update(self, lst_h, projection_func, projection_kwargs):
+    def get_arrays(self, group):
+        """Retorna (nombres, array Nx3) de una categoría para detección vectorizada"""
+        return self.names[group], self.xyz[self.slices[group]]
+    
+    def update(self, lst_h, projection_mode, projection_kwargs):
         """Actualiza todas las coordenadas celestiales"""
         self.last_lst_h = lst_h
-        self.projection_func = projection_func
+        self.projection_mode = projection_mode
         self.projection_kwargs = projection_kwargs
         
-        # Proyectar todos los objetos
-        self.stars_coords = [
-            (name, *projection_func(ra, dec, lst_h, **projection_kwargs))
-            for name, ra, dec, size in REAL_STARS
-        ]
+        if get_catalog_version() != self.catalog_version:
+            self._build_catalog_arrays()
+            if self.sidereal_table is not None:
+                self._build_sidereal_table()
+        
+        # Proyectar todo el catálogo en una sola llamada
+        if self.use_apparent:
+            self._update_apparent_vectors()
+        
+        if self.sidereal_table is not None:
+            self.xyz = self._update_from_table(lst_h, projection_mode, projection_kwargs)
+        elif self.use_refraction:
+            # Refracción sobre direcciones unitarias, luego escalar a la escena
+            xyz = project_unit_vectors(self.apparent_vectors, lst_h, dome_radius=1.0)
+            self.xyz = scale_projection(apply_refraction(xyz), projection_mode, **projection_kwargs)
+        elif self.use_rotation:
+            self.xyz = project_unit_vectors(
+                self.apparent_vectors, lst_h, mode=projection_mode, **projection_kwargs
+            )
+        else:
+            self.xyz = project_many(
+                self.ra_h, self.dec_deg, lst_h, mode=projection_mode,
+                dtype=self.dtype, **projection_kwargs
+            )
         
-        self.galaxies_coords = [
-            (name, *projection_func(ra, dec, lst_h, **projection_kwargs))
-            for name, ra, dec, size in GALAXIES
-        ]
+        # El renderer y la detección leen bloques de self.xyz (get_arrays), sin listas de tuplas
+        self.moon_coords = tuple(self.xyz[-1].tolist())
         
-        self.planets_coords = [
-            (name, *projection_func(ra, dec, lst_h, **projection_kwargs))
-            for name, ra, dec, size in PLANETS
-        ]
+        if self.catalog_vectors is not None:
+            self._update_catalog_stars(lst_h, projection_mode, projection_kwargs)
         
-        self.moon_coords = projection_func(
-            MOON_RA_DEC[0], MOON_RA_DEC[1], lst_h, **projection_kwargs
-        )
+        if self.minor_bodies is not None:
+            self._update_minor_bodies(lst_h, projection_mode, projection_kwargs)
+    
+    def _update_catalog_stars(self, lst_h, projection_mode, projection_kwargs):
+        """Proyecta las estrellas del catálogo columnar sobre el horizonte (sin posición aparente)"""
+        xyz = project_unit_vectors(self.catalog_vectors, lst_h, dome_radius=1.0)
+        if self.use_refraction:
+            xyz = apply_refraction(xyz)
+        
+        visible = xyz[:, 1] > 0
+        sizes = self.catalog_sizes[visible]
+        self.catalog_xyz = scale_projection(xyz[visible], projection_mode, **projection_kwargs)
+        self.catalog_colors_visible = self.catalog_colors[visible]
+        
+        # Las filas siguen ordenadas por tamaño: cada tamaño es un rango contiguo
+        values, starts = np.unique(sizes, return_index=True)
+        stops = np.append(starts[1:], len(sizes))
+        self.catalog_batches = list(zip(values.tolist(), starts.tolist(), stops.tolist()))
+    
+    def _update_minor_bodies(self, lst_h, projection_mode, projection_kwargs):
+        """Proyecta los cuerpos menores sobre el horizonte (un solo array para el renderer)"""
+        snapshot = self.minor_bodies.snapshot
+        if snapshot is None:
+            # Sin snapshot todavía: la propagación (segundos con catálogos grandes) la
+            # hace el hilo de efemérides; should_update detecta el primero que publique
+            self.minor_xyz = None
+            return
+        self.minor_epoch = snapshot[0]
+        
+        xyz = project_unit_vectors(snapshot[3], lst_h, dome_radius=1.0)
+        xyz = xyz[xyz[:, 1] > 0].astype(self.dtype)
+        self.minor_xyz = scale_projection(xyz, projection_mode, **projection_kwargs)
+
 
 
 class SkyTrackerApp:
@@ -184,17 +364,37 @@ class SkyTrackerApp:
         # Renderizar Bloom
         self.bloom = BloomRenderer(self.window.width, self.window.height)
 
+        # Asteroides y cometas desde elementos orbitales del MPC
+        self.minor_bodies = (
+            MinorBodyCatalog.from_file(MINOR_BODIES_FILE) if USE_MINOR_BODIES else None
+        )
+
         # Cache de coordenadas celestiales
-        self.coord_cache = CoordinateCache()
+        self.coord_cache = CoordinateCache(minor_bodies=self.minor_bodies)
 
         # Componentes
         self.camera = Camera()
         self.vector = PointerVector(color=COLOR_VECTOR)
         self.sensor_vector = PointerVector(color=(0.0, 1.0, 0.0), yaw=90.0, pitch=90.0)
-        self.search_box = SearchBox()
-        self.tracker = ObjectTracker()
+        self.clock = sidereal_clock
+        
+        # Satélites desde TLE local (propagados en cada cuadro)
+        self.satellites = SatelliteCatalog.from_tle_file(SATELLITE_TLE_FILE) if USE_SATELLITES else None
+        self.tracker = ObjectTracker(
+            clock=self.clock, satellites=self.satellites, minor_bodies=self.minor_bodies
+        )
+        self.search_box = SearchBox(suggest=self.tracker.suggest)
         self.input_handler = InputHandler()
         
+        # Recálculo de efemérides en segundo plano (Luna y planetas)
+        self.ephemeris_worker = ephemeris_worker
+        self.ephemeris_worker.minor_bodies = self.minor_bodies
+        if USE_EPHEMERIS_WORKER:
+            self.ephemeris_worker.start()
+        elif self.minor_bodies is not None:
+            # Sin hilo de recálculo: una sola propagación, también fuera del render
+            threading.Thread(target=self.ephemeris_worker.refresh_minor_bodies, daemon=True).start()
+        
         # Generar estrellas de fondo según el modo (solo una vez)
         if USE_DOME_GEOMETRY:
             self.background_stars = self._generate_dome_stars()
@@ -213,12 +413,6 @@ class SkyTrackerApp:
         self.planet_sphere_vbo = create_sphere_vertex_list(radius=1.0, slices=32, stacks=32)
 
         
-        # Variables para cálculo de LST (evitar recalcular)
-        self.last_lst_calculation = 0
-        self.cached_lst_deg = 0
-        self.cached_lst_h = 0
-        self.lst_update_interval = 1.0  # Actualizar cada 1 segundo
-        
         # Iniciar bucle de actualización
         pyglet.clock.schedule(self.update)
 
@@ -280,13 +474,19 @@ class SkyTrackerApp:
         
         if self.search_box.active:
             if symbol == key.ENTER:
-                if self.tracker.start_tracking(self.search_box.get_text()):
+                if self.tracker.start_tracking(self.search_box.get_selection(), fuzzy=True):
                     self.search_box.deactivate()
                     self.window.set_exclusive_mouse(True)
                 else:
                     self.search_box.clear()
             elif symbol == key.BACKSPACE:
                 self.search_box.backspace()
+            elif symbol == key.TAB:
+                self.search_box.complete()
+            elif symbol == key.UP:
+                self.search_box.move_selection(-1)
+            elif symbol == key.DOWN:
+                self.search_box.move_selection(1)
             return
         
         if symbol == key.C:
@@ -312,17 +512,8 @@ class SkyTrackerApp:
             self.camera.rotate(dx, dy)
 
     def _calculate_lst_cached(self):
-        """Calcula LST con cache para evitar cálculos innecesarios"""
-        current_time = time.time()
-        
-        if current_time - self.last_lst_calculation > self.lst_update_interval:
-            now_utc = datetime.now(timezone.utc)
-            self.cached_lst_deg, self.cached_lst_h = calculate_lst(
-                now_utc, LOCATION_LONGITUDE
-            )
-            self.last_lst_calculation = current_time
-        
-        return self.cached_lst_deg, self.cached_lst_h
+        """Lee el LST del reloj sideral compartido (sin cálculo de calendario)"""
+        return self.clock.lst()
 
     def update(self, dt):
         """Actualiza el estado de la aplicación"""
@@ -387,27 +578,32 @@ class SkyTrackerApp:
         # Calcular LST con cache
         lst_deg, lst_h = self._calculate_lst_cached()
         
-        # Determinar función de proyección según el modo
-        projection_func = None
-        projection_kwargs = {}
-        
+        # Determinar modo de proyección según la geometría
         if USE_DOME_GEOMETRY:
-            from shared.calculations.astronomy import ra_dec_to_dome
-            projection_func = ra_dec_to_dome
+            projection_mode = 'dome'
             projection_kwargs = {'dome_radius': DOME_RADIUS}
         else:
-            from shared.calculations.astronomy import ra_dec_to_xyz
-            projection_func = ra_dec_to_xyz
+            projection_mode = 'xyz'
+            projection_kwargs = {}
 
         # Actualizar coordenadas solo si es necesario
         if self.coord_cache.should_update(lst_h):
-            self.coord_cache.update(lst_h, projection_func, projection_kwargs)
+            self.coord_cache.update(lst_h, projection_mode, projection_kwargs)
         
-        # Usar coordenadas cacheadas
-        stars_coords = self.coord_cache.stars_coords
-        galaxies_coords = self.coord_cache.galaxies_coords
-        planets_coords = self.coord_cache.planets_coords
+        # Usar coordenadas cacheadas (bloques del array de proyección)
+        stars_arrays = self.coord_cache.get_arrays('stars')
+        galaxies_arrays = self.coord_cache.get_arrays('galaxies')
+        planets_arrays = self.coord_cache.get_arrays('planets')
         moon_coords = self.coord_cache.moon_coords
+        if self.coord_cache.stars_style is None:
+            self.coord_cache.stars_style = star_style(stars_arrays[0], self.coord_cache.state.objects)
+        
+        # Satélites: sin cache, se mueven demasiado rápido
+        satellites_xyz = None
+        if self.satellites is not None:
+            _, satellites_xyz = self.satellites.positions(
+                self.clock.utc_now().timestamp(), projection_mode, **projection_kwargs
+            )
         
         # Variables para almacenar los datos de los vectores
         vector_data = [None]
@@ -430,14 +626,22 @@ class SkyTrackerApp:
             # OBJETOS CELESTIALES - CON ILUMINACIÓN REALISTA
             # ============================================================
             draw_celestial_objects_with_textures(
-                stars_coords, galaxies_coords, 
-                planets_coords, moon_coords, 
+                stars_arrays, galaxies_arrays, 
+                planets_arrays, moon_coords, 
                 self.planet_sphere_vbo,
                 self.texture_manager,
                 self.camera,
                 fov=self.camera.fov,
-                use_lighting=USE_LIGHTING  # ← ACTIVAR ILUMINACIÓN
+                use_lighting=USE_LIGHTING,  # ← ACTIVAR ILUMINACIÓN
+                celestial_objects=self.coord_cache.state.objects,
+                stars_style=self.coord_cache.stars_style
             )
+            
+            draw_catalog_stars(self.coord_cache.catalog_xyz,
+                               self.coord_cache.catalog_colors_visible,
+                               self.coord_cache.catalog_batches)
+            draw_minor_bodies(self.coord_cache.minor_xyz)
+            draw_satellites(satellites_xyz)
         
         # ============================================================
         # RENDERIZAR TODO CON BLOOM
@@ -483,17 +687,17 @@ class SkyTrackerApp:
         # Obtener los datos del vector
         end_x, end_y, end_z, hit_x, hit_y, hit_z = vector_data[0]
         
-        # Detectar objetos apuntados
+        # Detectar objetos apuntados (arrays del cache)
         pointed_obj = detect_pointed_object_by_vector(
             (hit_x, hit_y, hit_z),
-            stars_coords, galaxies_coords, 
-            planets_coords, moon_coords
+            stars_arrays, galaxies_arrays, 
+            planets_arrays, moon_coords
         )
         
         looked_obj = detect_looked_object_by_camera(
             self.camera,
-            stars_coords, galaxies_coords,
-            planets_coords, moon_coords
+            stars_arrays, galaxies_arrays,
+            planets_arrays, moon_coords
         )
 
         self.look_at_display.update(looked_obj)
@@ -527,6 +731,7 @@ class SkyTrackerApp:
         """Se ejecuta al cerrar la ventana"""
         self.serial_device.close()
         self.server.stop()
+        self.ephemeris_worker.stop()
         self.window.close()
 
 
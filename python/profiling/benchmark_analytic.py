@@ -0,0 +1,132 @@
+"""
+Benchmark y precisión de la teoría analítica (analytic_ephemeris)
+
+Compara contra posiciones de skyfield guardadas en profiling/fixtures, así la
+comparación corre sin skyfield ni kernels. Las fixtures se generan con los
+kernels recortados que trae skyfield en sus tests (de441 de 1969 y de430 de
+2015): Marte se toma de su baricentro, a menos de 20 km del planeta.
+
+Uso (desde la carpeta python/):
+    python -m profiling.benchmark_analytic             # precisión y tiempos
+    python -m profiling.benchmark_analytic --generate  # regenerar fixtures (requiere skyfield)
+"""
+import json
+import os
+import sys
+import time
+import numpy as np
+from datetime import datetime, timezone
+from shared.calculations.analytic_ephemeris import analytic_ephemeris_batch
+from shared.calculations.astronomy import equatorial_unit_vectors
+
+FIXTURE_FILE = os.path.join(os.path.dirname(__file__), 'fixtures', 'ephemeris_skyfield.json')
+
+# Kernel de los tests de skyfield, primer instante y días cubiertos
+FIXTURE_WINDOWS = [
+    ('de441-1969.bsp', datetime(1969, 7, 26, 12, tzinfo=timezone.utc), 6),
+    ('de430-2015-03-02.bsp', datetime(2015, 2, 27, 12, tzinfo=timezone.utc), 6),
+]
+FIXTURE_STEP = 7200.0  # segundos
+FIXTURE_SITE = (-32.4833, -58.229561)
+
+
+def generate_fixtures(path=FIXTURE_FILE):
+    """Calcula con skyfield las posiciones de referencia y las guarda en JSON"""
+    import skyfield
+    from shared.calculations.ephemeris_calculator import EPHEMERIS_BODIES, calculate_ephemeris_batch
+
+    kernel_dir = os.path.join(os.path.dirname(skyfield.__file__), 'tests', 'data')
+    bodies = dict(EPHEMERIS_BODIES, Marte='mars barycenter')
+
+    times, ra, dec, dist = [], [], [], []
+    for kernel, start, days in FIXTURE_WINDOWS:
+        window = start.timestamp() + np.arange(0, days * 86400, FIXTURE_STEP)
+        batch = calculate_ephemeris_batch(window, *FIXTURE_SITE, bodies=bodies,
+                                          kernel=os.path.join(kernel_dir, kernel))
+        if batch is None:
+            raise SystemExit(1)
+        times.append(window)
+        ra.append(batch['ra_hours'])
+        dec.append(batch['dec_degrees'])
+        dist.append(batch['distance_au'])
+
+    ra, dec, dist = np.hstack(ra), np.hstack(dec), np.hstack(dist)
+    fixtures = {
+        'source': f"skyfield {skyfield.__version__}: " + ', '.join(k for k, _, _ in FIXTURE_WINDOWS),
+        'site': list(FIXTURE_SITE),
+        'times': np.concatenate(times).tolist(),
+        'bodies': {
+            name: {
+                'ra_hours': np.round(ra[i], 9).tolist(),
+                'dec_degrees': np.round(dec[i], 8).tolist(),
+                'distance_au': np.round(dist[i], 9).tolist(),
+            }
+            for i, name in enumerate(bodies)
+        },
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(fixtures, f, indent=1)
+    print(f"Fixtures guardadas en '{path}' ({len(fixtures['times'])} instantes × {len(bodies)} cuerpos)")
+
+
+def compare_accuracy(path=FIXTURE_FILE):
+    """Error angular de la teoría analítica contra las fixtures de skyfield"""
+    with open(path, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+
+    times = np.array(fixtures['times'])
+    names = list(fixtures['bodies'])
+    result = analytic_ephemeris_batch(times, *fixtures['site'], bodies=names)
+
+    print(f"Referencia: {fixtures['source']}")
+    print(f"{'Cuerpo':<10} {'máx (′)':>9} {'media (′)':>10} {'Δdist (%)':>10}")
+    print("-"*42)
+    for i, name in enumerate(names):
+        ref = fixtures['bodies'][name]
+        v_ref = equatorial_unit_vectors(ref['ra_hours'], ref['dec_degrees'])
+        v_new = equatorial_unit_vectors(result['ra_hours'][i], result['dec_degrees'][i])
+        cross = np.linalg.norm(np.cross(v_ref, v_new), axis=-1)
+        error = np.degrees(np.arctan2(cross, np.sum(v_ref * v_new, axis=-1))) * 60
+        dist_error = np.abs(result['distance_au'][i] / np.array(ref['distance_au']) - 1) * 100
+        print(f"{name:<10} {error.max():>9.2f} {error.mean():>10.2f} {dist_error.max():>10.3f}")
+
+
+def benchmark_speed(repeats=2000):
+    """Tiempo por cuadro (un instante, siete cuerpos) y por lotes"""
+    now = time.time()
+    analytic_ephemeris_batch([now])
+
+    t0 = time.perf_counter()
+    for i in range(repeats):
+        analytic_ephemeris_batch([now + i])
+    frame_us = (time.perf_counter() - t0) / repeats * 1e6
+
+    day = now + np.arange(1440) * 60.0
+    t0 = time.perf_counter()
+    analytic_ephemeris_batch(day)
+    day_ms = (time.perf_counter() - t0) * 1000
+
+    print(f"Por cuadro (1 instante, 7 cuerpos): {frame_us:.0f} µs")
+    print(f"Un día cada minuto (1440 instantes): {day_ms:.1f} ms")
+
+
+def run_benchmark(path=FIXTURE_FILE):
+    """Precisión contra las fixtures y tiempos de evaluación"""
+    print("="*60)
+    print("TEORÍA ANALÍTICA DE BAJA PRECISIÓN")
+    print("="*60)
+    if os.path.exists(path):
+        compare_accuracy(path)
+    else:
+        print(f"Sin fixtures en '{path}' (generar con --generate)")
+    print("-"*60)
+    benchmark_speed()
+    print("="*60)
+
+
+if __name__ == "__main__":
+    if '--generate' in sys.argv:
+        generate_fixtures()
+    else:
+        run_benchmark()
@@ -0,0 +1,72 @@
+"""
+Benchmark de efemérides: cálculo por instante vs. calculate_ephemeris_batch
+
+Genera posiciones de todos los cuerpos cada minuto durante varios días.
+El camino por instante (un Time y un observe() por cuerpo y minuto) se mide
+sobre una muestra y se extrapola; el camino por lotes resuelve todo en una llamada.
+
+Uso (desde la carpeta python/):
+    python -m profiling.benchmark_ephemeris [DÍAS] [KERNEL] [INICIO_ISO]
+"""
+import sys
+import time
+import numpy as np
+from datetime import datetime, timezone
+from shared.calculations.ephemeris_calculator import (
+    EPHEMERIS_BODIES, calculate_ephemeris_batch, load_kernel
+)
+
+
+def _per_instant(times, bodies, kernel, location_lat=-32.4833, location_lon=-58.229561):
+    """Camino anterior: un Time escalar y un observe() por cuerpo e instante"""
+    from skyfield.api import wgs84
+    ts, eph = load_kernel(kernel)
+    observer = eph['earth'] + wgs84.latlon(location_lat, location_lon)
+    ra = np.empty((len(bodies), len(times)))
+    for j, unix_seconds in enumerate(times):
+        t = ts.utc(1970, 1, 1 + unix_seconds / 86400.0)
+        for i, key in enumerate(bodies.values()):
+            ra[i, j] = observer.at(t).observe(eph[key]).radec()[0].hours
+    return ra
+
+
+def run_benchmark(days=7, kernel='de421.bsp', start=None, sample=200, bodies=EPHEMERIS_BODIES):
+    """Compara el cálculo por instante con el cálculo por lotes"""
+    if start is None:
+        start = datetime.now(timezone.utc)
+    times = start.timestamp() + np.arange(int(days * 1440)) * 60.0
+
+    t0 = time.perf_counter()
+    load_kernel(kernel)
+    load_s = time.perf_counter() - t0
+
+    print("="*60)
+    print(f"BENCHMARK DE EFEMÉRIDES - {len(bodies)} cuerpos × {len(times)} instantes")
+    print("="*60)
+    print(f"Carga del kernel '{kernel}': {load_s*1000:.0f} ms")
+
+    t0 = time.perf_counter()
+    sample_ra = _per_instant(times[:sample], bodies, kernel)
+    per_instant_s = (time.perf_counter() - t0) / sample * len(times)
+
+    t0 = time.perf_counter()
+    batch = calculate_ephemeris_batch(times, bodies=bodies, kernel=kernel)
+    batch_s = time.perf_counter() - t0
+    if batch is None:
+        raise SystemExit(1)
+
+    diff = np.abs(batch['ra_hours'][:, :sample] - sample_ra)
+    diff = np.minimum(diff, 24 - diff).max() * 15 * 3600
+
+    print(f"Por instante ({len(bodies)*len(times)} observe()): {per_instant_s:8.1f} s (extrapolado de {sample})")
+    print(f"Por lotes ({len(bodies)} observe()):          {batch_s:8.2f} s")
+    print(f"Aceleración: {per_instant_s / batch_s:.0f}x")
+    print(f"Diferencia máxima en RA: {diff:.2e} arcsec")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    days = float(sys.argv[1]) if len(sys.argv) > 1 else 7
+    kernel = sys.argv[2] if len(sys.argv) > 2 else 'de421.bsp'
+    start = datetime.fromisoformat(sys.argv[3]) if len(sys.argv) > 3 else None
+    run_benchmark(days, kernel, start)
@@ -0,0 +1,83 @@
+"""
+Benchmark de arranque en frío: kernel SPK completo vs. recortado
+
+Cada kernel se mide en un proceso nuevo (sin caché de imports ni de skyfield):
+tiempo de carga del kernel, tiempo hasta la primera posición y memoria
+residente máxima del proceso.
+
+Uso (desde la carpeta python/):
+    python -m profiling.benchmark_kernel [KERNEL_COMPLETO] [KERNEL_RECORTADO] [FECHA_ISO]
+"""
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime, timezone
+from config import EPHEMERIS_KERNEL, EPHEMERIS_SLIM_KERNEL
+
+# Código del proceso hijo: imprime una línea JSON con las mediciones
+_CHILD = """
+import json, resource, sys, time
+t0 = time.perf_counter()
+from shared.calculations.ephemeris_calculator import load_kernel, calculate_ephemeris_batch
+t1 = time.perf_counter()
+load_kernel(sys.argv[1])
+t2 = time.perf_counter()
+result = calculate_ephemeris_batch([float(sys.argv[2])], kernel=sys.argv[1], bodies=json.loads(sys.argv[3]))
+t3 = time.perf_counter()
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'load_ms': (t2 - t1) * 1000,
+    'first_ms': (t3 - t2) * 1000,
+    'maxrss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    'ok': result is not None,
+}))
+"""
+
+
+def measure(kernel, unix_seconds, bodies, repeats=3):
+    """Mide el arranque en frío con un kernel (mejor de varias corridas)"""
+    best = None
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-c', _CHILD, kernel, str(unix_seconds), json.dumps(bodies)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        if best is None or sample['load_ms'] + sample['first_ms'] < best['load_ms'] + best['first_ms']:
+            best = sample
+    return best
+
+
+def run_benchmark(full=EPHEMERIS_KERNEL, slim=EPHEMERIS_SLIM_KERNEL, date=None, bodies=None):
+    """Compara el arranque con el kernel completo y con el recortado"""
+    from shared.calculations.ephemeris_calculator import EPHEMERIS_BODIES
+
+    if bodies is None:
+        bodies = EPHEMERIS_BODIES
+    if date is None:
+        date = datetime.now(timezone.utc)
+
+    print("="*60)
+    print("BENCHMARK DE ARRANQUE EN FRÍO - KERNEL SPK")
+    print("="*60)
+    print(f"{'Kernel':<24} {'KB':>8} {'carga ms':>9} {'1ª pos ms':>10} {'RSS MB':>8}")
+    print("-"*60)
+
+    for kernel in (full, slim):
+        if not os.path.exists(kernel):
+            print(f"{os.path.basename(kernel):<24} (no existe)")
+            continue
+        sample = measure(kernel, date.timestamp(), bodies)
+        status = '' if sample['ok'] else '  (fuera de rango)'
+        print(f"{os.path.basename(kernel):<24} {os.path.getsize(kernel)/1024:>8.0f} "
+              f"{sample['load_ms']:>9.1f} {sample['first_ms']:>10.1f} "
+              f"{sample['maxrss_mb']:>8.1f}{status}")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    full = sys.argv[1] if len(sys.argv) > 1 else EPHEMERIS_KERNEL
+    slim = sys.argv[2] if len(sys.argv) > 2 else EPHEMERIS_SLIM_KERNEL
+    date = datetime.fromisoformat(sys.argv[3]) if len(sys.argv) > 3 else None
+    run_benchmark(full, slim, date)
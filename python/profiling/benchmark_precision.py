@@ -0,0 +1,90 @@
+"""
+Benchmark de precisión float32 vs float64 del motor de proyección
+
+Mide el throughput de ambos caminos (trigonométrico y por rotación) y el
+error angular máximo de float32 respecto de float64 sobre todo el catálogo
+a lo largo de un día sideral completo.
+
+Uso (desde la carpeta python/):
+    python -m profiling.benchmark_precision [N_OBJETOS] [PASOS_LST]
+"""
+import sys
+import time
+import numpy as np
+from shared.calculations.astronomy import (
+    project_many, equatorial_unit_vectors, project_unit_vectors
+)
+
+
+def _best_of(func, repeats=5):
+    """Ejecuta func varias veces y retorna el mejor tiempo en ms"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def _max_angle_arcsec(a, b):
+    """Error angular máximo entre dos arrays (N, 3) de direcciones, en segundos de arco"""
+    a = a.astype(np.float64)
+    cross = np.linalg.norm(np.cross(a, b), axis=1)
+    dot = np.sum(a*b, axis=1)
+    return np.degrees(np.arctan2(cross, dot)).max() * 3600
+
+
+def run_benchmark(n_objects=1_000_000, lst_steps=96, dome_radius=30.0):
+    """Compara throughput y precisión de float32 frente a float64"""
+    rng = np.random.default_rng(7)
+    ra = rng.uniform(0, 24, n_objects)
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1, n_objects)))
+
+    vectors64 = equatorial_unit_vectors(ra, dec)
+    vectors32 = vectors64.astype(np.float32)
+    ra32, dec32 = ra.astype(np.float32), dec.astype(np.float32)
+
+    print("="*60)
+    print(f"BENCHMARK DE PRECISIÓN - {n_objects} objetos, {lst_steps} pasos de LST")
+    print("="*60)
+    print(f"{'Camino':<26} {'float64 (ms)':>13} {'float32 (ms)':>13} {'Mobj/s f32':>12}")
+    print("-"*60)
+
+    lst_h = 7.3
+    paths = {
+        'Trigonométrico': (
+            lambda: project_many(ra, dec, lst_h, dome_radius=dome_radius),
+            lambda: project_many(ra32, dec32, lst_h, dome_radius=dome_radius, dtype=np.float32),
+        ),
+        'Rotación': (
+            lambda: project_unit_vectors(vectors64, lst_h, dome_radius=dome_radius),
+            lambda: project_unit_vectors(vectors32, lst_h, dome_radius=dome_radius),
+        ),
+    }
+    for name, (f64, f32) in paths.items():
+        t64, t32 = _best_of(f64), _best_of(f32)
+        print(f"{name:<26} {t64:>13.2f} {t32:>13.2f} {n_objects/t32/1000:>12.1f}")
+
+    # Error angular máximo a lo largo de un día sideral
+    err_trig = 0.0
+    err_rot = 0.0
+    for lst_h in np.linspace(0, 24, lst_steps, endpoint=False):
+        ref = project_many(ra, dec, lst_h, dome_radius=dome_radius)
+        err_trig = max(err_trig, _max_angle_arcsec(
+            project_many(ra32, dec32, lst_h, dome_radius=dome_radius, dtype=np.float32), ref))
+        err_rot = max(err_rot, _max_angle_arcsec(
+            project_unit_vectors(vectors32, lst_h, dome_radius=dome_radius), ref))
+
+    mem64 = vectors64.nbytes / 1024 / 1024
+    mem32 = vectors32.nbytes / 1024 / 1024
+    print("-"*60)
+    print(f"Error máximo float32 (trigonométrico): {err_trig:.3f} arcsec")
+    print(f"Error máximo float32 (rotación):       {err_rot:.3f} arcsec")
+    print(f"Memoria de vectores: float64 {mem64:.1f} MB, float32 {mem32:.1f} MB")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    steps = int(sys.argv[2]) if len(sys.argv) > 2 else 96
+    run_benchmark(n, steps)
@@ -0,0 +1,69 @@
+"""
+Benchmark de proyección de catálogo: escalar vs vectorizado vs matriz de rotación
+
+Uso (desde la carpeta python/):
+    python -m profiling.benchmark_projection [N_OBJETOS]
+"""
+import sys
+import time
+import numpy as np
+from shared.calculations.astronomy import (
+    ra_dec_to_dome, project_many,
+    equatorial_unit_vectors, project_unit_vectors
+)
+
+
+def _best_of(func, repeats=5):
+    """Ejecuta func varias veces y retorna el mejor tiempo en ms"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def run_benchmark(n_objects=100_000, lst_h=7.3, dome_radius=30.0):
+    """Compara los tres caminos de proyección sobre un catálogo sintético"""
+    rng = np.random.default_rng(42)
+    ra = rng.uniform(0, 24, n_objects)
+    dec = np.degrees(np.arcsin(rng.uniform(-1, 1, n_objects)))
+
+    # Camino escalar: se mide sobre una muestra y se extrapola
+    sample = min(n_objects, 10_000)
+    ra_list, dec_list = ra[:sample].tolist(), dec[:sample].tolist()
+    scalar_ms = _best_of(
+        lambda: [ra_dec_to_dome(r, d, lst_h, dome_radius=dome_radius)
+                 for r, d in zip(ra_list, dec_list)],
+        repeats=2
+    ) * n_objects / sample
+
+    vector_ms = _best_of(lambda: project_many(ra, dec, lst_h, dome_radius=dome_radius))
+
+    precompute_ms = _best_of(lambda: equatorial_unit_vectors(ra, dec), repeats=1)
+    unit_vectors = equatorial_unit_vectors(ra, dec)
+    rotation_ms = _best_of(lambda: project_unit_vectors(unit_vectors, lst_h, dome_radius=dome_radius))
+
+    # Verificar que los tres caminos coinciden
+    reference = np.array([ra_dec_to_dome(r, d, lst_h, dome_radius=dome_radius)
+                          for r, d in zip(ra_list, dec_list)])
+    err_vector = np.abs(project_many(ra[:sample], dec[:sample], lst_h, dome_radius=dome_radius) - reference).max()
+    err_rotation = np.abs(project_unit_vectors(unit_vectors[:sample], lst_h, dome_radius=dome_radius) - reference).max()
+
+    print("="*60)
+    print(f"BENCHMARK DE PROYECCIÓN - {n_objects} objetos")
+    print("="*60)
+    print(f"{'Camino':<30} {'Tiempo (ms)':>12} {'Speedup':>10}")
+    print("-"*60)
+    print(f"{'Escalar (ra_dec_to_dome)':<30} {scalar_ms:>12.2f} {1.0:>9.1f}x")
+    print(f"{'Vectorizado (project_many)':<30} {vector_ms:>12.2f} {scalar_ms/vector_ms:>9.1f}x")
+    print(f"{'Rotación (por LST)':<30} {rotation_ms:>12.2f} {scalar_ms/rotation_ms:>9.1f}x")
+    print("-"*60)
+    print(f"Precálculo de vectores unitarios (una vez): {precompute_ms:.2f} ms")
+    print(f"Error máximo vs escalar: vectorizado {err_vector:.2e}, rotación {err_rotation:.2e}")
+    print("="*60)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    run_benchmark(n)
@@ -88,7 +88,9 @@ class SerialComm:
         """
         Parsea mensajes en formato:
         - 'SENS:yaw,pitch'
-        Devuelve un diccionario con tipo y datos.
+        Devuelve un diccionario con tipo y datos. Las lecturas SENS incluyen
+        'time' (segundos epoch de recepción) para convertirlas luego a RA/DEC
+        con yaw_pitch_to_ra_dec.
         """
         if not line:
             return None
@@ -98,7 +100,7 @@ class SerialComm:
                 vals = line[5:].split(",")
                 yaw = float(vals[0])
                 pitch = float(vals[1])
-                return {"type": "SENS", "yaw": yaw, "pitch": pitch}
+                return {"type": "SENS", "yaw": yaw, "pitch": pitch, "time": time.time()}
             except (ValueError, IndexError):
                 return {"type": "ERROR", "raw": line}
 
@@ -3,13 +3,14 @@
 Servidor TCP con soporte para tracking y datos en tiempo real.
 - Cliente envía: "objeto\n" → Servidor responde "OK\n" y empieza a enviar "DATA:yaw,pitch\n" y "SENSOR:yaw,pitch\n" cada 100ms.
 - Cliente envía: "stop\n" → Para tracking y cierra conexión.
+- Cliente envía: "ephem\n" → Servidor responde "EPHEM:nombre,ra_h,dec_deg;...\n" (cacheado por minuto).
 - Protocolo: Líneas terminadas en \n.
 """
 
 import socket
 import threading
 import time
-from shared.celestial_data import get_all_celestial_objects
+from shared.calculations.ephemeris_cache import get_ephemeris
 
 
 class Server:
@@ -22,7 +23,6 @@ class Server:
         self.server_socket = None
         self.running = False
         self.thread = None
-        self.valid_objects = get_all_celestial_objects()
         self.clients = []  # Lista de clients activos (socket, writer)
         self.server_ip = self._get_local_ip()
 
@@ -109,14 +109,23 @@ class Server:
                     writer.write("STOPPED\n")
                     break
 
+                if line.lower() == "ephem":
+                    writer.write(self._format_ephemeris(get_ephemeris()))
+                    continue
+
                 obj_name = line.lower()
                 print(f"[Server] {addr}: Tracking '{obj_name}'")
 
-                if obj_name not in self.valid_objects:
-                    writer.write(f"ERROR: Objeto '{obj_name}' no encontrado\n")
+                # Solo nombres o alias exactos: un error de tipeo no debe mover el telescopio
+                # a otro objeto, el cliente recibe las sugerencias en el ERROR
+                canonical = self.app.tracker.resolve(obj_name)
+                if canonical is None:
+                    suggestions = self.app.tracker.suggest(obj_name, limit=5)
+                    hint = f" (¿{', '.join(suggestions)}?)" if suggestions else ""
+                    writer.write(f"ERROR: Objeto '{obj_name}' no encontrado{hint}\n")
                     continue
 
-                success = self.app.tracker.start_tracking(obj_name.capitalize())
+                success = self.app.tracker.start_tracking(canonical)
                 if success:
                     writer.write("OK\n")
                     # Agregar a clients para updates
@@ -135,6 +144,13 @@ class Server:
             if client_socket in [c[0] for c in self.clients]:
                 self.clients = [c for c in self.clients if c[0] != client_socket]
 
+    def _format_ephemeris(self, ephemeris):
+        """Arma la respuesta EPHEM con las posiciones del sistema solar"""
+        if ephemeris is None:
+            return "ERROR: Efemérides no disponibles\n"
+        bodies = ";".join(f"{name},{ra:.6f},{dec:.6f}" for name, (ra, dec) in ephemeris.items())
+        return f"EPHEM:{bodies}\n"
+
     def _send_realtime_data(self, client_socket, addr):
         """Envía yaw/pitch del vector y del sensor cada update_interval"""
         while self.running and client_socket.fileno() != -1:
@@ -0,0 +1,455 @@
+# analytic_ephemeris.py
+"""
+Teoría analítica de baja precisión para Sol, Luna y planetas (sin skyfield)
+
+Planetas interiores y Marte: elementos keplerianos medios de Standish (JPL,
+válidos 1800-2050). Júpiter y Saturno: elementos de P. Schlyter con los
+términos principales de sus perturbaciones mutuas (la "gran desigualdad",
+de varios minutos de arco, que los elementos medios no representan).
+Luna: serie de Meeus (cap. 47) truncada a los términos mayores de 2".
+La posición del observador se resta en todos los cuerpos (paralaje
+topocéntrica, hasta ~1° en la Luna).
+
+Todo está vectorizado sobre los instantes y entrega RA/DEC astrométricas
+J2000 como calculate_ephemeris_batch, con errores del orden de 1' (ver
+profiling/benchmark_analytic.py). Evaluar los siete cuerpos cuesta cerca de
+un milisegundo, sin kernel ni red: se puede llamar en cada cuadro.
+"""
+import numpy as np
+from shared.calculations.astronomy import _to_unix_seconds, calculate_lst_many
+
+# Días UTC → Julian Date; TT - UTC (desde 2017)
+UNIX_EPOCH_JD = 2440587.5
+TT_MINUS_UTC = 69.184
+J2000_JD = 2451545.0
+
+# Oblicuidad de la eclíptica J2000
+OBLIQUITY_J2000 = np.radians(23.4392911)
+# Velocidad de la luz en UA/día; UA y radio ecuatorial terrestre en km
+LIGHT_AU_PER_DAY = 173.1446327
+AU_KM = 149597870.7
+EARTH_RADIUS_KM = 6378.137
+# Masa Tierra / masa Luna
+EARTH_MOON_MASS_RATIO = 81.30056
+
+# Elementos de Standish (1800-2050, eclíptica y equinoccio J2000):
+# a (UA), e, i, L, longitud del perihelio, nodo (grados) y sus tasas por siglo
+STANDISH_ELEMENTS = {
+    'Mercurio': ((0.38709927, 0.20563593, 7.00497902, 252.25032350, 77.45779628, 48.33076593),
+                 (0.00000037, 0.00001906, -0.00594749, 149472.67411175, 0.16047689, -0.12534081)),
+    'Venus': ((0.72333566, 0.00677672, 3.39467605, 181.97909950, 131.60246718, 76.67984255),
+              (0.00000390, -0.00004107, -0.00078890, 58517.81538729, 0.00268329, -0.27769418)),
+    'EMB': ((1.00000261, 0.01671123, -0.00001531, 100.46457166, 102.93768193, 0.0),
+            (0.00000562, -0.00004392, -0.01294668, 35999.37244981, 0.32327364, 0.0)),
+    'Marte': ((1.52371034, 0.09339410, 1.84969142, -4.55343205, -23.94362959, 49.55953891),
+              (0.00001847, 0.00007882, -0.00813131, 19140.30268499, 0.44441088, -0.29257343)),
+}
+
+# Elementos de Schlyter (eclíptica y equinoccio de la fecha): nodo, i, argumento
+# del perihelio, a (UA), e, anomalía media (grados) y sus tasas por día desde 1999-12-31
+SCHLYTER_ELEMENTS = {
+    'Jupiter': ((100.4542, 1.3030, 273.8777, 5.20256, 0.048498, 19.8950),
+                (2.76854e-5, -1.557e-7, 1.64505e-5, 0.0, 4.469e-9, 0.0830853001)),
+    'Saturno': ((113.6634, 2.4886, 339.3939, 9.55475, 0.055546, 316.9670),
+                (2.38980e-5, -1.081e-7, 2.97661e-5, 0.0, -9.499e-9, 0.0334442282)),
+}
+# Precesión general en longitud (grados por día)
+PRECESSION_DEG_PER_DAY = 3.82394e-5
+
+# Luna (Meeus, tabla 47.A): D, M, M', F, longitud (1e-6 °), distancia (1e-3 km)
+_MOON_LR = np.array([
+    (0, 0, 1, 0, 6288774, -20905355),
+    (2, 0, -1, 0, 1274027, -3699111),
+    (2, 0, 0, 0, 658314, -2955968),
+    (0, 0, 2, 0, 213618, -569925),
+    (0, 1, 0, 0, -185116, 48888),
+    (0, 0, 0, 2, -114332, -3149),
+    (2, 0, -2, 0, 58793, 246158),
+    (2, -1, -1, 0, 57066, -152138),
+    (2, 0, 1, 0, 53322, -170733),
+    (2, -1, 0, 0, 45758, -204586),
+    (0, 1, -1, 0, -40923, -129620),
+    (1, 0, 0, 0, -34720, 108743),
+    (0, 1, 1, 0, -30383, 104755),
+    (2, 0, 0, -2, 15327, 10321),
+    (0, 0, 1, 2, -12528, 0),
+    (0, 0, 1, -2, 10980, 79661),
+    (4, 0, -1, 0, 10675, -34782),
+    (0, 0, 3, 0, 10034, -23210),
+    (4, 0, -2, 0, 8548, -21636),
+    (2, 1, -1, 0, -7888, 24208),
+    (2, 1, 0, 0, -6766, 30824),
+    (1, 0, -1, 0, -5163, -8379),
+    (1, 1, 0, 0, 4987, -16675),
+    (2, -1, 1, 0, 4036, -12831),
+    (2, 0, 2, 0, 3994, -10445),
+    (4, 0, 0, 0, 3861, -11650),
+    (2, 0, -3, 0, 3665, 14403),
+    (0, 1, -2, 0, -2689, -7003),
+    (2, 0, -1, 2, -2602, 0),
+    (2, -1, -2, 0, 2390, 10056),
+    (1, 0, 1, 0, -2348, 6322),
+    (2, -2, 0, 0, 2236, -9884),
+], dtype=np.float64)
+
+# Luna (Meeus, tabla 47.B): D, M, M', F, latitud (1e-6 °)
+_MOON_B = np.array([
+    (0, 0, 0, 1, 5128122),
+    (0, 0, 1, 1, 280602),
+    (0, 0, 1, -1, 277693),
+    (2, 0, 0, -1, 173237),
+    (2, 0, -1, 1, 55413),
+    (2, 0, -1, -1, 46271),
+    (2, 0, 0, 1, 32573),
+    (0, 0, 2, 1, 17198),
+    (2, 0, 1, -1, 9266),
+    (0, 0, 2, -1, 8822),
+    (2, -1, 0, -1, 8216),
+    (2, 0, -2, -1, 4324),
+    (2, 0, 1, 1, 4200),
+    (2, 1, 0, -1, -3359),
+    (2, -1, -1, 1, 2463),
+    (2, -1, 0, 1, 2211),
+    (2, -1, -1, -1, 2065),
+    (0, 1, -1, -1, -1870),
+    (4, 0, -1, -1, 1828),
+    (0, 1, 0, 1, -1794),
+    (0, 0, 0, 3, -1749),
+    (0, 1, -1, 1, -1565),
+    (1, 0, 0, 1, -1491),
+    (0, 1, 1, 1, -1475),
+    (0, 1, 1, -1, -1410),
+    (0, 1, 0, -1, -1344),
+    (1, 0, 0, -1, -1335),
+    (0, 0, 3, 1, 1107),
+    (4, 0, 0, -1, 1021),
+    (4, 0, -1, 1, 833),
+], dtype=np.float64)
+
+# Cuerpos que resuelve la teoría (mismos nombres que EPHEMERIS_BODIES)
+ANALYTIC_BODIES = ('Luna', 'Sol', 'Mercurio', 'Venus', 'Marte', 'Jupiter', 'Saturno')
+
+
+def unix_to_jd_tt(unix_seconds):
+    """Instantes Unix (UTC) a Julian Date en TT"""
+    return UNIX_EPOCH_JD + (np.asarray(unix_seconds, dtype=np.float64) + TT_MINUS_UTC) / 86400.0
+
+
+def solve_kepler(mean_anomaly, e, tolerance=1e-12, max_iter=50):
+    """
+    Ecuación de Kepler E - e sin E = M (Newton vectorizado, arranque de Danby)
+
+    Args:
+        mean_anomaly: anomalía media en radianes (array)
+        e: excentricidad < 1 (array o escalar)
+
+    Returns:
+        np.ndarray: anomalía excéntrica en radianes, reducida a [-π, π)
+    """
+    m = np.remainder(mean_anomaly + np.pi, 2*np.pi) - np.pi
+    ecc = m + 0.85 * e * np.sign(np.sin(m))
+    for _ in range(max_iter):
+        step = (ecc - e*np.sin(ecc) - m) / (1 - e*np.cos(ecc))
+        ecc -= step
+        if np.max(np.abs(step), initial=0.0) < tolerance:
+            break
+    return ecc
+
+
+def orbit_to_equatorial(x, y, inc_deg, node_deg, peri_deg):
+    """
+    Rota posiciones del plano orbital (eclíptica J2000) a coordenadas ecuatoriales J2000
+
+    Args:
+        x, y: posición en el plano de la órbita, x hacia el perihelio (N,)
+        inc_deg, node_deg, peri_deg: inclinación, nodo y argumento del perihelio
+
+    Returns:
+        np.ndarray: array (N, 3)
+    """
+    i, node, peri = np.radians(inc_deg), np.radians(node_deg), np.radians(peri_deg)
+    cos_node, sin_node = np.cos(node), np.sin(node)
+    cos_peri, sin_peri = np.cos(peri), np.sin(peri)
+    cos_i, sin_i = np.cos(i), np.sin(i)
+
+    # Eclíptica J2000
+    px = cos_node*cos_peri - sin_node*sin_peri*cos_i
+    py = sin_node*cos_peri + cos_node*sin_peri*cos_i
+    pz = sin_peri*sin_i
+    qx = -cos_node*sin_peri - sin_node*cos_peri*cos_i
+    qy = -sin_node*sin_peri + cos_node*cos_peri*cos_i
+    qz = cos_peri*sin_i
+    return ecliptic_to_equatorial(np.stack((px*x + qx*y, py*x + qy*y, pz*x + qz*y), axis=-1))
+
+
+def ecliptic_to_equatorial(xyz, obliquity=OBLIQUITY_J2000):
+    """Rota vectores (N, 3) de la eclíptica al ecuador (oblicuidad escalar o (N,))"""
+    c, s = np.cos(obliquity), np.sin(obliquity)
+    x, y, z = xyz[..., 0], xyz[..., 1], xyz[..., 2]
+    return np.stack((x, c*y - s*z, s*y + c*z), axis=-1)
+
+
+def _mutual_perturbations(name, mj, ms):
+    """
+    Perturbaciones mutuas principales de Júpiter y Saturno (Schlyter)
+
+    Args:
+        name: 'Jupiter' o 'Saturno'
+        mj, ms: anomalías medias de Júpiter y Saturno en radianes
+
+    Returns:
+        tuple: (corrección en longitud, corrección en latitud) en grados
+    """
+    rad = np.radians
+    if name == 'Jupiter':
+        return (-0.332*np.sin(2*mj - 5*ms - rad(67.6)) - 0.056*np.sin(2*mj - 2*ms + rad(21))
+                + 0.042*np.sin(3*mj - 5*ms + rad(21)) - 0.036*np.sin(mj - 2*ms)
+                + 0.022*np.cos(mj - ms) + 0.023*np.sin(2*mj - 3*ms + rad(52))
+                - 0.016*np.sin(mj - 5*ms - rad(69))), 0.0
+    return ((0.812*np.sin(2*mj - 5*ms - rad(67.6)) - 0.229*np.cos(2*mj - 4*ms - rad(2))
+             + 0.119*np.sin(mj - 2*ms - rad(3)) + 0.046*np.sin(2*mj - 6*ms - rad(69))
+             + 0.014*np.sin(mj - 3*ms + rad(32))),
+            -0.020*np.cos(2*mj - 4*ms - rad(2)) + 0.018*np.sin(2*mj - 6*ms - rad(49)))
+
+
+def _element_rows(table, names, time):
+    """Evalúa elementos base + tasa × tiempo: tuplas de arrays (G, T), una por elemento"""
+    base = np.array([table[name][0] for name in names]).T[:, :, None]
+    rate = np.array([table[name][1] for name in names]).T[:, :, None]
+    return tuple(base + rate * time)
+
+
+def _standish_heliocentric(names, jd_tt):
+    """Planetas con los elementos de Standish; jd_tt (G, T) → (G, T, 3)"""
+    t = (jd_tt - J2000_JD) / 36525.0
+    a, e, inc, mean_lon, peri_lon, node = _element_rows(STANDISH_ELEMENTS, names, t)
+
+    ecc = solve_kepler(np.radians(mean_lon - peri_lon), e)
+    x = a * (np.cos(ecc) - e)
+    y = a * np.sqrt(1 - e*e) * np.sin(ecc)
+    return orbit_to_equatorial(x, y, inc, node, peri_lon - node)
+
+
+def _schlyter_heliocentric(names, jd_tt):
+    """Júpiter y Saturno con los elementos de Schlyter y sus perturbaciones; (G, T) → (G, T, 3)"""
+    d = jd_tt - 2451543.5
+    node, inc, peri, a, e, mean_anomaly = _element_rows(SCHLYTER_ELEMENTS, names, d)
+
+    ecc = solve_kepler(np.radians(mean_anomaly), e)
+    x = a * (np.cos(ecc) - e)
+    y = a * np.sqrt(1 - e*e) * np.sin(ecc)
+    r = np.hypot(x, y)
+
+    # Longitud y latitud heliocéntricas de la fecha
+    u = np.arctan2(y, x) + np.radians(peri)
+    i = np.radians(inc)
+    lon = np.arctan2(np.sin(u)*np.cos(i), np.cos(u)) + np.radians(node)
+    lat = np.arcsin(np.sin(u)*np.sin(i))
+
+    jupiter, saturn = SCHLYTER_ELEMENTS['Jupiter'], SCHLYTER_ELEMENTS['Saturno']
+    mj = np.radians(jupiter[0][5] + jupiter[1][5]*d)
+    ms = np.radians(saturn[0][5] + saturn[1][5]*d)
+    for k, name in enumerate(names):
+        d_lon, d_lat = _mutual_perturbations(name, mj[k], ms[k])
+        lon[k] += np.radians(d_lon)
+        lat[k] += np.radians(d_lat)
+
+    # Equinoccio de la fecha → J2000
+    lon -= np.radians(PRECESSION_DEG_PER_DAY*d)
+    ecliptic = r[..., None] * np.stack(
+        (np.cos(lat)*np.cos(lon), np.cos(lat)*np.sin(lon), np.sin(lat)), axis=-1
+    )
+    return ecliptic_to_equatorial(ecliptic)
+
+
+def planets_heliocentric(names, jd_tt):
+    """
+    Posiciones heliocéntricas de varios planetas ('EMB' = baricentro Tierra-Luna)
+
+    Los planetas de cada teoría se resuelven juntos: una sola ecuación de
+    Kepler vectorizada por grupo en lugar de una por planeta.
+
+    Args:
+        names: claves de STANDISH_ELEMENTS o SCHLYTER_ELEMENTS (P,)
+        jd_tt: Julian Dates en TT, (T,) común a todos o (P, T) por planeta
+
+    Returns:
+        np.ndarray: array (P, T, 3) ecuatorial J2000 en UA
+    """
+    jd_tt = np.asarray(jd_tt, dtype=np.float64)
+    jd_tt = np.broadcast_to(jd_tt, (len(names),) + jd_tt.shape[-1:])
+    result = np.empty(jd_tt.shape + (3,))
+
+    for table, solve in ((STANDISH_ELEMENTS, _standish_heliocentric),
+                         (SCHLYTER_ELEMENTS, _schlyter_heliocentric)):
+        rows = [k for k, name in enumerate(names) if name in table]
+        if rows:
+            result[rows] = solve([names[k] for k in rows], jd_tt[rows])
+    return result
+
+
+def planet_heliocentric(name, jd_tt):
+    """
+    Posición heliocéntrica de un planeta (o 'EMB', el baricentro Tierra-Luna)
+
+    Args:
+        name: clave de STANDISH_ELEMENTS o SCHLYTER_ELEMENTS
+        jd_tt: Julian Dates en TT (T,)
+
+    Returns:
+        np.ndarray: array (T, 3) ecuatorial J2000 en UA
+    """
+    return planets_heliocentric([name], np.atleast_1d(jd_tt))[0]
+
+
+def moon_geocentric(jd_tt):
+    """
+    Posición geocéntrica de la Luna (Meeus cap. 47, truncada)
+
+    Args:
+        jd_tt: Julian Dates en TT (T,)
+
+    Returns:
+        np.ndarray: array (T, 3) ecuatorial J2000 en UA
+    """
+    from shared.calculations.apparent_place import precession_matrix, mean_obliquity
+
+    jd_tt = np.atleast_1d(np.asarray(jd_tt, dtype=np.float64))
+    t = (jd_tt - J2000_JD) / 36525.0
+
+    mean_lon = 218.3164477 + 481267.88123421*t - 0.0015786*t**2 + t**3/538841
+    d = 297.8501921 + 445267.1114034*t - 0.0018819*t**2 + t**3/545868
+    m = 357.5291092 + 35999.0502909*t - 0.0001536*t**2
+    mp = 134.9633964 + 477198.8675055*t + 0.0087414*t**2 + t**3/69699
+    f = 93.2720950 + 483202.0175233*t - 0.0036539*t**2 - t**3/3526000
+    a1 = 119.75 + 131.849*t
+    a2 = 53.09 + 479264.290*t
+    a3 = 313.45 + 481266.484*t
+    e = 1 - 0.002516*t - 0.0000074*t**2
+
+    # Argumentos de todos los términos en una sola matriz (términos, T)
+    fundamental = np.radians(np.stack((d, m, mp, f)))
+    arg_lr = _MOON_LR[:, :4] @ fundamental
+    arg_b = _MOON_B[:, :4] @ fundamental
+    # Los términos con M dependen de la excentricidad de la órbita terrestre
+    e_lr = e[None, :] ** np.abs(_MOON_LR[:, 1:2])
+    e_b = e[None, :] ** np.abs(_MOON_B[:, 1:2])
+
+    sum_l = np.sum(_MOON_LR[:, 4:5] * e_lr * np.sin(arg_lr), axis=0)
+    sum_r = np.sum(_MOON_LR[:, 5:6] * e_lr * np.cos(arg_lr), axis=0)
+    sum_b = np.sum(_MOON_B[:, 4:5] * e_b * np.sin(arg_b), axis=0)
+
+    a1, a2, a3 = np.radians(a1), np.radians(a2), np.radians(a3)
+    lr, fr, mpr = np.radians(mean_lon), np.radians(f), np.radians(mp)
+    sum_l += 3958*np.sin(a1) + 1962*np.sin(lr - fr) + 318*np.sin(a2)
+    sum_b += (-2235*np.sin(lr) + 382*np.sin(a3) + 175*np.sin(a1 - fr) + 175*np.sin(a1 + fr)
+              + 127*np.sin(lr - mpr) - 115*np.sin(lr + mpr))
+
+    lon = np.radians(mean_lon + sum_l / 1e6)
+    lat = np.radians(sum_b / 1e6)
+    distance = (385000.56 + sum_r / 1000) / AU_KM
+    ecliptic = distance[:, None] * np.stack(
+        (np.cos(lat)*np.cos(lon), np.cos(lat)*np.sin(lon), np.sin(lat)), axis=-1
+    )
+
+    # Eclíptica y equinoccio medios de la fecha → J2000 (una matriz por día)
+    equatorial = ecliptic_to_equatorial(ecliptic, mean_obliquity(jd_tt))
+    days = np.floor(jd_tt)
+    for day in np.unique(days):
+        rows = days == day
+        equatorial[rows] = equatorial[rows] @ precession_matrix(day + 0.5)
+    return equatorial
+
+
+def observer_geocentric(unix_seconds, location_lat, location_lon):
+    """
+    Posición del observador respecto del centro de la Tierra (elipsoide WGS84)
+
+    Returns:
+        np.ndarray: array (T, 3) ecuatorial en UA
+    """
+    from shared.calculations.satellites import geodetic_to_ecef
+
+    ecef = geodetic_to_ecef(location_lat, location_lon)
+    _, lst_h = calculate_lst_many(unix_seconds, location_lon)
+    lst = np.radians(lst_h * 15)
+    # Distancia al eje y altura sobre el ecuador no cambian con la rotación
+    rho = np.hypot(ecef[0], ecef[1])
+    return np.stack((rho*np.cos(lst), rho*np.sin(lst), np.full_like(lst, ecef[2])), axis=-1) / AU_KM
+
+
+def analytic_ephemeris_batch(times, location_lat=-32.4833, location_lon=-58.229561, bodies=None):
+    """
+    RA/DEC/distancia de Sol, Luna y planetas con la teoría analítica
+
+    Misma interfaz y salida que calculate_ephemeris_batch, sin kernel ni red.
+
+    Args:
+        times: array de datetimes UTC, datetime64 o segundos Unix (T instantes)
+        location_lat, location_lon: ubicación del observador en grados
+        bodies: nombres de ANALYTIC_BODIES a calcular (None = todos; se aceptan
+                también dicts nombre → clave del kernel)
+
+    Returns:
+        dict: 'names', 'times' (T,) y 'ra_hours', 'dec_degrees', 'distance_au' (B, T)
+    """
+    names = list(ANALYTIC_BODIES if bodies is None else bodies)
+    unix_seconds = np.atleast_1d(_to_unix_seconds(times))
+    jd = unix_to_jd_tt(unix_seconds)
+
+    planets = [k for k, name in enumerate(names) if name not in ('Luna', 'Sol')]
+    planet_names = [names[k] for k in planets]
+
+    # El baricentro Tierra-Luna se resuelve junto con los planetas en el instante t
+    heliocentric = planets_heliocentric(planet_names + ['EMB'], jd)
+    moon = moon_geocentric(jd)
+    # Tierra = baricentro Tierra-Luna menos su parte de la posición lunar
+    earth = heliocentric[-1] - moon / (1 + EARTH_MOON_MASS_RATIO)
+    observer = observer_geocentric(unix_seconds, location_lat, location_lon)
+
+    r = np.empty((len(names), len(unix_seconds), 3))
+    for k, name in enumerate(names):
+        if name == 'Luna':
+            r[k] = moon - observer
+        elif name == 'Sol':
+            r[k] = -earth - observer
+
+    if planets:
+        # Una iteración de tiempo de luz: cada planeta donde estaba cuando emitió
+        geocentric = heliocentric[:-1] - earth - observer
+        light_days = np.sqrt(np.sum(geocentric**2, axis=-1)) / LIGHT_AU_PER_DAY
+        r[planets] = planets_heliocentric(planet_names, jd - light_days) - earth - observer
+
+    distance_au = np.sqrt(np.sum(r*r, axis=-1))
+    ra_hours = np.degrees(np.arctan2(r[..., 1], r[..., 0])) % 360 / 15
+    dec_degrees = np.degrees(np.arcsin(r[..., 2] / distance_au))
+
+    return {
+        'names': names,
+        'times': unix_seconds,
+        'ra_hours': ra_hours,
+        'dec_degrees': dec_degrees,
+        'distance_au': distance_au,
+    }
+
+
+def analytic_ephemeris(location_lat=-32.4833, location_lon=-58.229561, date=None):
+    """
+    Posiciones de un instante en el formato de calculate_ephemeris
+
+    Args:
+        location_lat, location_lon: ubicación del observador en grados
+        date: datetime UTC (None = ahora)
+
+    Returns:
+        dict: {'Luna': (ra_h, dec_deg), ...}
+    """
+    from datetime import datetime, timezone
+
+    if date is None:
+        date = datetime.now(timezone.utc)
+    batch = analytic_ephemeris_batch([date.timestamp()], location_lat, location_lon)
+    return {
+        name: (float(batch['ra_hours'][i, 0]), float(batch['dec_degrees'][i, 0]))
+        for i, name in enumerate(batch['names'])
+    }
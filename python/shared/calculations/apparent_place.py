@@ -0,0 +1,222 @@
+# apparent_place.py
+"""
+Posición aparente: catálogo J2000 → coordenadas de la fecha
+
+Aplica precesión (IAU 1976), nutación truncada (términos principales de
+IAU 1980), aberración anual y, opcionalmente, refracción atmosférica.
+Las matrices de época se calculan una vez por intervalo y se aplican a
+todo el catálogo con un único producto matricial.
+"""
+import math
+import threading
+import numpy as np
+from shared.calculations.astronomy import J2000_UNIX_SECONDS, J2000_JD
+from config import APPARENT_PLACE_INTERVAL
+
+ARCSEC = math.pi / (180 * 3600)
+
+# Constante de aberración (v/c de la Tierra) en radianes
+ABERRATION_CONSTANT = 20.49552 * ARCSEC
+
+
+def _rot_x(a):
+    """Rotación de ejes alrededor de X"""
+    c, s = math.cos(a), math.sin(a)
+    return np.array([[1.0, 0.0, 0.0], [0.0, c, s], [0.0, -s, c]])
+
+
+def _rot_y(a):
+    """Rotación de ejes alrededor de Y"""
+    c, s = math.cos(a), math.sin(a)
+    return np.array([[c, 0.0, -s], [0.0, 1.0, 0.0], [s, 0.0, c]])
+
+
+def _rot_z(a):
+    """Rotación de ejes alrededor de Z"""
+    c, s = math.cos(a), math.sin(a)
+    return np.array([[c, s, 0.0], [-s, c, 0.0], [0.0, 0.0, 1.0]])
+
+
+def _centuries(jd):
+    """Siglos julianos desde J2000.0"""
+    return (jd - J2000_JD) / 36525.0
+
+
+def mean_obliquity(jd):
+    """Oblicuidad media de la eclíptica en radianes"""
+    T = _centuries(jd)
+    return (84381.448 - 46.8150*T - 0.00059*T**2 + 0.001813*T**3) * ARCSEC
+
+
+def precession_matrix(jd):
+    """
+    Matriz de precesión J2000 → ecuador medio de la fecha (Lieske 1977)
+
+    Args:
+        jd: Julian Date
+
+    Returns:
+        np.ndarray: matriz (3, 3)
+    """
+    T = _centuries(jd)
+    zeta = (2306.2181*T + 0.30188*T**2 + 0.017998*T**3) * ARCSEC
+    z = (2306.2181*T + 1.09468*T**2 + 0.018203*T**3) * ARCSEC
+    theta = (2004.3109*T - 0.42665*T**2 - 0.041833*T**3) * ARCSEC
+    return _rot_z(-z) @ _rot_y(theta) @ _rot_z(-zeta)
+
+
+def nutation_angles(jd):
+    """
+    Nutación en longitud y oblicuidad con los cuatro términos principales
+
+    Returns:
+        tuple: (delta_psi, delta_eps) en radianes (precisión ~0.5")
+    """
+    T = _centuries(jd)
+    omega = math.radians(125.04452 - 1934.136261*T)
+    L_sun = math.radians(280.4665 + 36000.7698*T)
+    L_moon = math.radians(218.3165 + 481267.8813*T)
+
+    d_psi = (-17.20*math.sin(omega) - 1.32*math.sin(2*L_sun)
+             - 0.23*math.sin(2*L_moon) + 0.21*math.sin(2*omega))
+    d_eps = (9.20*math.cos(omega) + 0.57*math.cos(2*L_sun)
+             + 0.10*math.cos(2*L_moon) - 0.09*math.cos(2*omega))
+    return d_psi * ARCSEC, d_eps * ARCSEC
+
+
+def nutation_matrix(jd):
+    """Matriz de nutación: ecuador medio → ecuador verdadero de la fecha"""
+    eps0 = mean_obliquity(jd)
+    d_psi, d_eps = nutation_angles(jd)
+    return _rot_x(-(eps0 + d_eps)) @ _rot_z(-d_psi) @ _rot_x(eps0)
+
+
+def aberration_vector(jd):
+    """
+    Velocidad de la Tierra sobre c (órbita circular) en el ecuador verdadero de la fecha
+
+    Returns:
+        np.ndarray: vector (3,) a sumar a los vectores unitarios de dirección
+    """
+    T = _centuries(jd)
+    M = math.radians(357.52911 + 35999.05029*T)
+    C = ((1.914602 - 0.004817*T)*math.sin(M) + 0.019993*math.sin(2*M)
+         + 0.000289*math.sin(3*M))
+    sun_lon = math.radians(280.46646 + 36000.76983*T + C)
+
+    # El ápex del movimiento terrestre está 90° detrás del Sol en la eclíptica
+    beta_ecl = ABERRATION_CONSTANT * np.array([math.sin(sun_lon), -math.cos(sun_lon), 0.0])
+
+    d_psi, d_eps = nutation_angles(jd)
+    eps = mean_obliquity(jd) + d_eps
+    return _rot_x(-eps) @ beta_ecl
+
+
+def apply_refraction(xyz):
+    """
+    Eleva cada posición proyectada según la refracción atmosférica (Saemundsson)
+
+    Args:
+        xyz: array (N, 3) en ejes de escena (y = cenit)
+
+    Returns:
+        np.ndarray: array (N, 3) con la misma distancia y acimut, altura aparente
+    """
+    xyz = np.asarray(xyz)
+    if not np.issubdtype(xyz.dtype, np.floating):
+        xyz = xyz.astype(np.float64)
+    r = np.sqrt(np.sum(xyz*xyz, axis=-1))
+    horizontal = np.hypot(xyz[..., 0], xyz[..., 2])
+    alt = np.degrees(np.arctan2(xyz[..., 1], horizontal))
+
+    # R en minutos de arco; despreciable bajo -1° (objeto oculto de todas formas)
+    refraction = 1.02 / np.tan(np.radians(alt + 10.3/(alt + 5.11))) / 60
+    refraction = np.where(alt > -1.0, refraction, 0.0)
+    alt_app = np.radians(alt + refraction)
+
+    scale = np.divide(r*np.cos(alt_app), horizontal,
+                      out=np.zeros_like(r), where=horizontal > 0)
+    out = np.empty_like(xyz)
+    out[..., 0] = xyz[..., 0] * scale
+    out[..., 2] = xyz[..., 2] * scale
+    out[..., 1] = r * np.sin(alt_app)
+    return out
+
+
+class ApparentPlace:
+    """
+    Cache de matrices de época para convertir vectores J2000 a posición aparente
+
+    Las matrices se recalculan una vez por intervalo (por defecto cada hora);
+    entre recálculos cada conversión es un producto matricial y una suma.
+    """
+
+    def __init__(self, interval=APPARENT_PLACE_INTERVAL):
+        """
+        Args:
+            interval: segundos de validez de cada juego de matrices de época
+        """
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._epoch = None  # (bucket, matriz, vector de aberración)
+
+    def epoch_key(self, unix_seconds):
+        """Identificador del intervalo al que pertenece un instante"""
+        return int(unix_seconds // self.interval)
+
+    def matrices(self, unix_seconds):
+        """
+        Retorna (bucket, matriz P·N combinada, vector de aberración) para un instante
+
+        Args:
+            unix_seconds: instante en segundos Unix (UTC)
+        """
+        bucket = self.epoch_key(unix_seconds)
+        epoch = self._epoch
+        if epoch is not None and epoch[0] == bucket:
+            return epoch
+
+        with self._lock:
+            if self._epoch is None or self._epoch[0] != bucket:
+                # Centro del intervalo para repartir el error a ambos lados
+                center = (bucket + 0.5) * self.interval
+                jd = (center - J2000_UNIX_SECONDS) / 86400.0 + J2000_JD
+                matrix = nutation_matrix(jd) @ precession_matrix(jd)
+                self._epoch = (bucket, matrix, aberration_vector(jd))
+            return self._epoch
+
+    def transform(self, unit_vectors, unix_seconds):
+        """
+        Convierte vectores unitarios J2000 a vectores aparentes de la fecha
+
+        Args:
+            unit_vectors: array (N, 3) de equatorial_unit_vectors
+            unix_seconds: instante en segundos Unix (UTC)
+
+        Returns:
+            np.ndarray: array (N, 3) unitario en el ecuador verdadero de la fecha,
+                        en la misma precisión que unit_vectors
+        """
+        _, matrix, beta = self.matrices(unix_seconds)
+        unit_vectors = np.asarray(unit_vectors)
+        dtype = unit_vectors.dtype
+        apparent = unit_vectors @ matrix.T.astype(dtype) + beta.astype(dtype)
+        apparent /= np.sqrt(np.sum(apparent*apparent, axis=-1, keepdims=True))
+        return apparent
+
+
+# Instancia global compartida por el cache de coordenadas y el tracker
+apparent_place = ApparentPlace()
+
+
+def unit_vectors_to_ra_dec(unit_vectors):
+    """
+    Convierte vectores unitarios ecuatoriales a RA/DEC
+
+    Returns:
+        tuple: (array RA en horas, array DEC en grados)
+    """
+    v = np.asarray(unit_vectors, dtype=np.float64)
+    ra_h = (np.degrees(np.arctan2(v[..., 1], v[..., 0])) / 15) % 24
+    dec_deg = np.degrees(np.arcsin(np.clip(v[..., 2], -1.0, 1.0)))
+    return ra_h, dec_deg
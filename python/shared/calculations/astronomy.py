@@ -3,6 +3,7 @@
 Funciones astronómicas para cálculos de coordenadas
 """
 import math
+import numpy as np
 from datetime import datetime, timezone
 from config import LOCATION_LONGITUDE, WORLD_SCALE, LOCATION_LATITUDE
 
@@ -44,6 +45,77 @@ def calculate_lst(now_utc, longitude_deg):
     return LST_deg, LST_h
 
 
+# Precisiones soportadas por el motor de proyección
+PRECISIONS = {'float32': np.float32, 'float64': np.float64}
+
+
+def precision_dtype(precision):
+    """Convierte un nombre de precisión ('float32'/'float64') a tipo NumPy"""
+    try:
+        return PRECISIONS[precision]
+    except KeyError:
+        raise ValueError(f"Precisión desconocida: {precision}") from None
+
+
+# Época J2000.0 (2000-01-01 12:00 UTC) en segundos Unix y en Julian Date
+J2000_UNIX_SECONDS = 946728000.0
+J2000_JD = 2451545.0
+
+
+def _to_unix_seconds(times):
+    """
+    Convierte un array de instantes a segundos Unix float64
+    
+    Acepta datetime64 (interpretado como UTC), números (segundos epoch)
+    o secuencias de datetime con zona horaria.
+    """
+    times = np.asarray(times)
+
+    if np.issubdtype(times.dtype, np.datetime64):
+        ns = times.astype('datetime64[ns]').astype(np.int64)
+        return ns / 1e9
+    if times.dtype == object:
+        return np.array([t.timestamp() for t in times.ravel()], dtype=np.float64).reshape(times.shape)
+    return times.astype(np.float64)
+
+
+def julian_date_many(times):
+    """
+    Calcula la Julian Date UTC para un array de instantes
+    
+    Args:
+        times: array de datetime64, segundos epoch o datetimes con zona horaria
+    
+    Returns:
+        np.ndarray: Julian Dates (float64) con la misma forma que times
+    """
+    return (_to_unix_seconds(times) - J2000_UNIX_SECONDS) / 86400.0 + J2000_JD
+
+
+def calculate_lst_many(times, longitude_deg=LOCATION_LONGITUDE):
+    """
+    Calcula Local Sidereal Time para un array de instantes en una sola llamada
+    
+    Misma fórmula que calculate_lst, pero trabajando con días desde J2000
+    directamente para no perder precisión en float64.
+    
+    Args:
+        times: array de datetime64, segundos epoch o datetimes con zona horaria
+        longitude_deg: longitud del observador en grados
+    
+    Returns:
+        tuple: (array LST en grados, array LST en horas)
+    """
+    d = (_to_unix_seconds(times) - J2000_UNIX_SECONDS) / 86400.0  # días desde J2000.0
+    T = d / 36525.0
+
+    # Greenwich Mean Sidereal Time en grados
+    GMST = 280.46061837 + 360.98564736629*d + 0.000387933*T**2 - T**3/38710000
+
+    LST_deg = (GMST + longitude_deg) % 360
+    return LST_deg, LST_deg / 15
+
+
 def ra_dec_to_xyz(ra_h, dec_deg, lst_h, lat_deg=LOCATION_LATITUDE):
     """
     Convierte coordenadas RA/DEC a coordenadas 3D cartesianas
@@ -130,6 +202,258 @@ def ra_dec_to_dome(ra_h, dec_deg, lst_h, lat_deg=LOCATION_LATITUDE, dome_radius=
     return x, y, z
 
 
+def scale_projection(xyz, mode='dome', dome_radius=30.0):
+    """
+    Escala direcciones horizontales unitarias (N, 3) a la geometría de la escena (en el lugar)
+    
+    Args:
+        xyz: array (N, 3) de direcciones unitarias (x este, y cenit, z sur)
+        mode: 'dome' para la superficie del domo, 'xyz' para la caja del mundo
+        dome_radius: Radio del domo (solo para mode='dome')
+    
+    Returns:
+        np.ndarray: el mismo array escalado
+    """
+    if mode == 'dome':
+        xyz *= dome_radius
+    elif mode == 'xyz':
+        # Escalar para que llegue a ±WORLD_SCALE
+        xyz *= WORLD_SCALE / np.max(np.abs(xyz), axis=-1, keepdims=True)
+    else:
+        raise ValueError(f"Modo de proyección desconocido: {mode}")
+
+    return xyz
+
+
+def project_many(ra_h, dec_deg, lst_h, lat_deg=LOCATION_LATITUDE, mode='dome', dome_radius=30.0,
+                 dtype=np.float64):
+    """
+    Proyecta un catálogo completo de coordenadas RA/DEC en una sola llamada vectorizada
+    
+    Equivalente a aplicar ra_dec_to_dome (mode='dome') o ra_dec_to_xyz (mode='xyz')
+    objeto por objeto, pero calculando el acimut con componentes este/norte en lugar
+    de acos, sin bucles de Python.
+    
+    Args:
+        ra_h: array (N,) de Ascensiones Rectas en horas
+        dec_deg: array (N,) de Declinaciones en grados
+        lst_h: Local Sidereal Time en horas
+        lat_deg: Latitud del observador en grados
+        mode: 'dome' para la superficie del domo, 'xyz' para la caja del mundo
+        dome_radius: Radio del domo (solo para mode='dome')
+        dtype: precisión de cálculo y salida (np.float64 para apuntar la
+               montura, np.float32 alcanza para renderizar)
+    
+    Returns:
+        np.ndarray: array (N, 3) de tipo dtype con las coordenadas (x, y, z)
+    """
+    ra_h = np.asarray(ra_h, dtype=dtype)
+    dec_rad = np.radians(np.asarray(dec_deg, dtype=dtype))
+    ha_rad = np.radians((lst_h - ra_h) * 15)
+    lat_rad = math.radians(lat_deg)
+    sin_lat, cos_lat = math.sin(lat_rad), math.cos(lat_rad)
+
+    sin_dec, cos_dec = np.sin(dec_rad), np.cos(dec_rad)
+    cos_ha = np.cos(ha_rad)
+
+    # Componentes horizontales: este, cenit y norte
+    xyz = np.empty(ra_h.shape + (3,), dtype=dtype)
+    xyz[..., 0] = -cos_dec * np.sin(ha_rad)
+    xyz[..., 1] = sin_dec*sin_lat + cos_dec*cos_lat*cos_ha
+    xyz[..., 2] = -(sin_dec*cos_lat - cos_dec*sin_lat*cos_ha)  # Norte (negativo)
+
+    return scale_projection(xyz, mode, dome_radius)
+
+
+def equatorial_unit_vectors(ra_h, dec_deg, dtype=np.float64):
+    """
+    Calcula los vectores unitarios ecuatoriales de un catálogo
+    
+    Para objetos fijos se calculan una sola vez: el movimiento diurno se
+    aplica después como una rotación (ver equatorial_to_horizontal_matrix).
+    
+    Args:
+        ra_h: array (N,) de Ascensiones Rectas en horas
+        dec_deg: array (N,) de Declinaciones en grados
+        dtype: tipo de almacenamiento (se calcula siempre en float64)
+    
+    Returns:
+        np.ndarray: array (N, 3) con (x hacia RA=0h, y hacia RA=6h, z hacia el polo norte)
+    """
+    ra_rad = np.radians(np.asarray(ra_h, dtype=np.float64) * 15)
+    dec_rad = np.radians(np.asarray(dec_deg, dtype=np.float64))
+    cos_dec = np.cos(dec_rad)
+
+    return np.stack(
+        (cos_dec*np.cos(ra_rad), cos_dec*np.sin(ra_rad), np.sin(dec_rad)), axis=-1
+    ).astype(dtype, copy=False)
+
+
+def julian_epoch(unix_seconds):
+    """Época juliana (2000.0 = J2000, años de 365.25 días) de un instante Unix"""
+    return 2000.0 + (np.asarray(unix_seconds, dtype=np.float64) - J2000_UNIX_SECONDS) / (365.25 * 86400)
+
+
+def propagate_proper_motion(ra_h, dec_deg, pm_ra_mas, pm_dec_mas, dt_years,
+                            parallax_mas=None, radial_velocity_kms=None):
+    """
+    Propaga posiciones de catálogo por movimiento propio en una sola pasada
+    
+    Cada estrella se mueve en línea recta en el espacio: a la dirección de
+    catálogo se le suma su velocidad tangencial (y radial, si hay paralaje y
+    velocidad radial) por el intervalo, y se renormaliza.
+    
+    Args:
+        ra_h, dec_deg: posición en la época del catálogo (N,)
+        pm_ra_mas: movimiento propio en RA × cos(DEC) en mas/año (N,)
+        pm_dec_mas: movimiento propio en DEC en mas/año (N,)
+        dt_years: años julianos desde la época del catálogo (escalar o (N,))
+        parallax_mas, radial_velocity_kms: opcionales (N,); solo importan en
+            estrellas cercanas con velocidad radial grande
+    
+    Returns:
+        tuple: (RA en horas (N,), DEC en grados (N,), vectores unitarios (N, 3))
+    """
+    ra = np.radians(np.asarray(ra_h, dtype=np.float64) * 15)
+    dec = np.radians(np.asarray(dec_deg, dtype=np.float64))
+    sin_ra, cos_ra = np.sin(ra), np.cos(ra)
+    sin_dec, cos_dec = np.sin(dec), np.cos(dec)
+    
+    # Dirección y ejes locales hacia el este (RA creciente) y el norte
+    p = np.stack((cos_dec*cos_ra, cos_dec*sin_ra, sin_dec), axis=-1)
+    east = np.stack((-sin_ra, cos_ra, np.zeros_like(ra)), axis=-1)
+    north = np.stack((-sin_dec*cos_ra, -sin_dec*sin_ra, cos_dec), axis=-1)
+    
+    mas = np.radians(1 / 3.6e6)
+    dt = np.asarray(dt_years, dtype=np.float64)[..., None]
+    velocity = (np.asarray(pm_ra_mas, dtype=np.float64)[:, None] * east
+                + np.asarray(pm_dec_mas, dtype=np.float64)[:, None] * north) * mas
+    if parallax_mas is not None and radial_velocity_kms is not None:
+        # Movimiento radial en mas/año (4.740470 km/s = 1 UA/año)
+        pm_radial = np.nan_to_num(np.asarray(radial_velocity_kms, dtype=np.float64)
+                                  * np.asarray(parallax_mas, dtype=np.float64) / 4.740470)
+        velocity += pm_radial[:, None] * mas * p
+    
+    u = p + velocity * dt
+    u /= np.linalg.norm(u, axis=-1, keepdims=True)
+    ra_out = np.degrees(np.arctan2(u[:, 1], u[:, 0])) % 360 / 15
+    dec_out = np.degrees(np.arcsin(np.clip(u[:, 2], -1.0, 1.0)))
+    return ra_out, dec_out, u
+
+
+def equatorial_to_horizontal_matrix(lst_h, lat_deg=LOCATION_LATITUDE):
+    """
+    Construye la matriz 3x3 que lleva vectores ecuatoriales a la escena local
+    
+    Compone la rotación de LST alrededor del polo con la inclinación por latitud.
+    Los ejes de salida son los de ra_dec_to_dome: x al este, y al cenit, z al sur.
+    
+    Args:
+        lst_h: Local Sidereal Time en horas
+        lat_deg: Latitud del observador en grados
+    
+    Returns:
+        np.ndarray: matriz (3, 3)
+    """
+    lst_rad = math.radians(lst_h * 15)
+    lat_rad = math.radians(lat_deg)
+    cos_lst, sin_lst = math.cos(lst_rad), math.sin(lst_rad)
+    cos_lat, sin_lat = math.cos(lat_rad), math.sin(lat_rad)
+
+    # Rotación de -LST alrededor del polo: ecuatorial → ángulo horario
+    rot_lst = np.array([
+        [ cos_lst, sin_lst, 0.0],
+        [-sin_lst, cos_lst, 0.0],
+        [     0.0,     0.0, 1.0],
+    ])
+
+    # Inclinación por latitud: ángulo horario → (este, cenit, -norte)
+    tilt = np.array([
+        [    0.0, 1.0,      0.0],
+        [cos_lat, 0.0,  sin_lat],
+        [sin_lat, 0.0, -cos_lat],
+    ])
+
+    return tilt @ rot_lst
+
+
+def project_unit_vectors(vectors, lst_h, lat_deg=LOCATION_LATITUDE, mode='dome', dome_radius=30.0):
+    """
+    Proyecta vectores unitarios ecuatoriales precalculados con una única rotación
+    
+    Args:
+        vectors: array (N, 3) de equatorial_unit_vectors
+        lst_h: Local Sidereal Time en horas
+        lat_deg: Latitud del observador en grados
+        mode: 'dome' para la superficie del domo, 'xyz' para la caja del mundo
+        dome_radius: Radio del domo (solo para mode='dome')
+    
+    Returns:
+        np.ndarray: array (N, 3) con las mismas coordenadas que project_many,
+                    en la precisión de vectors (float32 o float64)
+    """
+    matrix = equatorial_to_horizontal_matrix(lst_h, lat_deg).astype(vectors.dtype, copy=False)
+    xyz = vectors @ matrix.T
+    return scale_projection(xyz, mode, dome_radius)
+
+
+def horizontal_to_equatorial_many(az_deg, alt_deg, lst_h, lat_deg=LOCATION_LATITUDE):
+    """
+    Inversa vectorizada de la proyección: acimut/altura → RA/DEC
+    
+    Args:
+        az_deg: array (N,) de acimuts en grados (desde el norte hacia el este)
+        alt_deg: array (N,) de alturas en grados
+        lst_h: LST en horas (escalar o array (N,), uno por muestra)
+        lat_deg: Latitud del observador en grados
+    
+    Returns:
+        tuple: (array RA en horas, array DEC en grados)
+    """
+    az_rad = np.radians(np.asarray(az_deg, dtype=np.float64))
+    alt_rad = np.radians(np.asarray(alt_deg, dtype=np.float64))
+    lat_rad = math.radians(lat_deg)
+    sin_lat, cos_lat = math.sin(lat_rad), math.cos(lat_rad)
+
+    # Componentes horizontales: este, cenit y norte
+    cos_alt = np.cos(alt_rad)
+    east = cos_alt * np.sin(az_rad)
+    up = np.sin(alt_rad)
+    north = cos_alt * np.cos(az_rad)
+
+    # Inversa de la inclinación por latitud: horizontal → ángulo horario
+    x = cos_lat*up - sin_lat*north  # cos(dec)·cos(HA)
+    y = -east                       # cos(dec)·sin(HA)
+    z = sin_lat*up + cos_lat*north  # sin(dec)
+
+    ha_h = np.degrees(np.arctan2(y, x)) / 15
+    ra_h = (np.asarray(lst_h, dtype=np.float64) - ha_h) % 24
+    dec_deg = np.degrees(np.arcsin(np.clip(z, -1.0, 1.0)))
+    return ra_h, dec_deg
+
+
+def yaw_pitch_to_ra_dec(yaw_deg, pitch_deg, times, lat_deg=LOCATION_LATITUDE,
+                        longitude_deg=LOCATION_LONGITUDE):
+    """
+    Convierte muestras de feedback de la montura (SENS:yaw,pitch) a RA/DEC
+    
+    Inversa de calculate_vector_angles + ra_dec_to_dome para una base en el
+    origen: yaw es el acimut y pitch la altura del objeto apuntado.
+    
+    Args:
+        yaw_deg: array (N,) de yaw en grados
+        pitch_deg: array (N,) de pitch en grados
+        times: array (N,) de instantes (datetime64, segundos epoch o datetimes UTC)
+        lat_deg: Latitud del observador en grados
+        longitude_deg: Longitud del observador en grados
+    
+    Returns:
+        tuple: (array RA en horas, array DEC en grados)
+    """
+    _, lst_h = calculate_lst_many(times, longitude_deg)
+    return horizontal_to_equatorial_many(yaw_deg, pitch_deg, lst_h, lat_deg)
+
+
 def calculate_vector_angles(target_x, target_y, target_z, base_x, base_y, base_z):
     """
     Calcula los ángulos yaw y pitch necesarios para apuntar desde la base hacia el objetivo
@@ -152,4 +476,35 @@ def calculate_vector_angles(target_x, target_y, target_z, base_x, base_y, base_z
     # Calcular yaw (azimut)
     yaw = math.degrees(math.atan2(dx, -dz)) % 360
     
-    return yaw, pitch
\ No newline at end of file
+    return yaw, pitch
+
+
+def calculate_vector_angles_many(targets, bases):
+    """
+    Calcula yaw/pitch desde M bases hacia N objetivos en una sola llamada
+    
+    Versión vectorizada de calculate_vector_angles para varias monturas. La
+    GUI mueve una sola montura (ObjectTracker.update_vector_to_target); con
+    varias, proyectar el objetivo una vez y pasar todas las bases:
+    
+        yaw, pitch = calculate_vector_angles_many([target_xyz], bases)
+        # yaw[i, 0], pitch[i, 0] son los ángulos de la montura i
+    
+    Args:
+        targets: array (N, 3) de coordenadas de los objetivos
+        bases: array (M, 3) de coordenadas de las bases de los vectores
+    
+    Returns:
+        tuple: (yaw, pitch) como arrays (M, N) en grados
+    """
+    targets = np.asarray(targets, dtype=np.float64).reshape(-1, 3)
+    bases = np.asarray(bases, dtype=np.float64).reshape(-1, 3)
+
+    # Diferencias (M, N, 3) por broadcasting
+    d = targets[np.newaxis, :, :] - bases[:, np.newaxis, :]
+    dx, dy, dz = d[..., 0], d[..., 1], d[..., 2]
+
+    pitch = np.degrees(np.arctan2(dy, np.hypot(dx, dz)))
+    yaw = np.degrees(np.arctan2(dx, -dz)) % 360
+
+    return yaw, pitch
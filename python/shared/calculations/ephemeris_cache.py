@@ -0,0 +1,176 @@
+# ephemeris_cache.py
+"""
+Cache de resultados de efemérides por (latitud, longitud, intervalo de tiempo)
+
+Consultas cercanas en tiempo y lugar (inicio de la GUI y la consola, clientes
+TCP, herramientas) comparten un único cálculo. Cada intervalo se calcula en
+su instante central, así todas las consultas del intervalo reciben el mismo
+resultado con un error máximo de velocidad × intervalo / 2 (la Luna, ~16" con
+60 s). Los resultados pueden persistirse en disco entre ejecuciones.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from shared.ephemeris_state import write_json_atomic
+from config import (
+    EPHEMERIS_TABLE_FILE, EPHEMERIS_CACHE_BUCKET,
+    EPHEMERIS_CACHE_SIZE, EPHEMERIS_CACHE_FILE, EPHEMERIS_ANALYTIC_FALLBACK
+)
+
+
+class EphemerisCache:
+    """LRU en memoria de resultados {'Luna': (ra_h, dec_deg), ...} con persistencia opcional"""
+
+    def __init__(self, max_entries=EPHEMERIS_CACHE_SIZE, time_bucket=EPHEMERIS_CACHE_BUCKET,
+                 path=EPHEMERIS_CACHE_FILE):
+        """
+        Args:
+            max_entries: cantidad máxima de resultados en memoria
+            time_bucket: segundos de cada intervalo de tiempo
+            path: archivo JSON para persistir entre ejecuciones (None = solo memoria)
+        """
+        self.max_entries = max_entries
+        self.time_bucket = time_bucket
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # dos fallos a la vez no comparten el temporal
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def key(self, location_lat, location_lon, unix_seconds):
+        """Clave (lat, lon, intervalo); la ubicación se redondea a ~10 m"""
+        return (round(location_lat, 4), round(location_lon, 4),
+                int(unix_seconds // self.time_bucket))
+
+    def bucket_time(self, bucket):
+        """Instante central de un intervalo como datetime UTC"""
+        return datetime.fromtimestamp((bucket + 0.5) * self.time_bucket, timezone.utc)
+
+    def get(self, location_lat, location_lon, date, compute):
+        """
+        Retorna el resultado cacheado o lo calcula con compute
+
+        Args:
+            location_lat, location_lon: ubicación en grados
+            date: datetime UTC de la consulta
+            compute: función (lat, lon, datetime) → dict o None; se llama fuera del lock
+
+        Returns:
+            dict {'Luna': (ra_h, dec_deg), ...} o None si compute falla (no se cachea)
+        """
+        key = self.key(location_lat, location_lon, date.timestamp())
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = compute(location_lat, location_lon, self.bucket_time(key[2]))
+        if result is None:
+            return None
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self._save()
+        return result
+
+    def stats(self):
+        """Contadores de uso del cache"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'entries': len(self._entries),
+            'hit_rate': self.hits / total if total else 0.0,
+        }
+
+    def clear(self):
+        """Vacía el cache en memoria (el archivo se reescribe en el próximo cálculo)"""
+        with self._lock:
+            self._entries.clear()
+
+    def _load(self):
+        """Carga los resultados persistidos (ignora un archivo ausente o inválido)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('time_bucket') != self.time_bucket:
+                return
+            for lat, lon, bucket, result in stored['entries'][-self.max_entries:]:
+                self._entries[(lat, lon, bucket)] = {
+                    name: tuple(radec) for name, radec in result.items()
+                }
+        except Exception as e:
+            print(f"WARNING: no se pudo leer el cache de efemérides {self.path}: {e}")
+
+    def _save(self):
+        """Persiste el cache (temporal + fsync + rename: nunca queda a medio escribir)"""
+        if not self.path:
+            return
+        with self._lock:
+            entries = [[lat, lon, bucket, result]
+                       for (lat, lon, bucket), result in self._entries.items()]
+        try:
+            with self._save_lock:
+                write_json_atomic(self.path, {'time_bucket': self.time_bucket, 'entries': entries})
+        except Exception as e:
+            print(f"WARNING: no se pudo guardar el cache de efemérides {self.path}: {e}")
+
+
+# Instancia global compartida por la GUI, la consola y el servidor
+ephemeris_cache = EphemerisCache()
+
+
+def compute_ephemeris(location_lat, location_lon, date, verbose=False):
+    """Tablas precalculadas primero (sin skyfield ni red), luego skyfield y por último la teoría analítica"""
+    from shared.calculations.ephemeris_tables import ephemeris_from_table
+    from shared.calculations.ephemeris_calculator import calculate_ephemeris, print_coordinates
+
+    ephemeris = ephemeris_from_table(EPHEMERIS_TABLE_FILE, location_lat, location_lon, date)
+    if ephemeris is not None:
+        if verbose:
+            print("Posiciones interpoladas desde las tablas precalculadas")
+        return ephemeris
+
+    ephemeris = calculate_ephemeris(location_lat, location_lon, date, verbose=verbose)
+    if ephemeris is not None or not EPHEMERIS_ANALYTIC_FALLBACK:
+        return ephemeris
+
+    from shared.calculations.analytic_ephemeris import analytic_ephemeris
+    ephemeris = analytic_ephemeris(location_lat, location_lon, date)
+    if verbose:
+        print("Posiciones de la teoría analítica de baja precisión (~1')")
+        print_coordinates(ephemeris)
+    return ephemeris
+
+
+def get_ephemeris(location_lat=-32.4833, location_lon=-58.229561, date=None,
+                  cache=ephemeris_cache, verbose=False):
+    """
+    Efemérides memoizadas por (ubicación, intervalo de tiempo)
+
+    Args:
+        location_lat, location_lon: ubicación del observador en grados
+        date: datetime UTC (None = ahora)
+        cache: EphemerisCache a usar
+        verbose: si True, imprime el origen y las coordenadas al calcular
+
+    Returns:
+        dict {'Luna': (ra_h, dec_deg), ...} o None si no se pudo calcular
+    """
+    if date is None:
+        date = datetime.now(timezone.utc)
+    return cache.get(
+        location_lat, location_lon, date,
+        lambda lat, lon, when: compute_ephemeris(lat, lon, when, verbose)
+    )
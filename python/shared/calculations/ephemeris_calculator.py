@@ -2,7 +2,8 @@
 # ephemeris_calculator.py
 """
 Calcula posiciones actualizadas de planetas, Luna y Sol usando efemerides
-Actualiza directamente el archivo celestial_data.json
+Las guarda en el estado de efemérides (shared/ephemeris_state.json), que el
+catálogo aplica encima de celestial_data.json al cargar
 Requiere: pip install skyfield
 """
 
@@ -10,109 +11,179 @@ from datetime import datetime, timezone
 import sys
 import os
 import json
+import numpy as np
+from config import EPHEMERIS_KERNEL, EPHEMERIS_SLIM_KERNEL
+from shared.ephemeris_state import write_json_atomic
 
+# Cuerpos del sistema solar: nombre en el catálogo → clave en el kernel SPK
+EPHEMERIS_BODIES = {
+    'Luna': 'moon',
+    'Sol': 'sun',
+    'Mercurio': 'mercury',
+    'Venus': 'venus',
+    'Marte': 'mars',
+    'Jupiter': 'jupiter barycenter',
+    'Saturno': 'saturn barycenter',
+}
 
-def calculate_ephemeris(location_lat=-32.4833, location_lon=-58.229561, date=None):
+
+# Timescale y kernels ya abiertos (cargar de421.bsp cuesta más que evaluarlo)
+_kernel_cache = {}
+
+
+def load_kernel(kernel=EPHEMERIS_KERNEL):
     """
-    Calcula las coordenadas RA/DEC de planetas, Luna y Sol para una fecha y ubicacion
+    Carga una sola vez la escala de tiempo y el kernel SPK de skyfield
+    
+    Los archivos locales se abren con load_file (jplephem los mapea en memoria
+    y solo lee las páginas de los segmentos evaluados); un nombre que no
+    existe en disco se descarga con load().
+    
+    Args:
+        kernel: nombre o ruta del archivo .bsp
+    
+    Returns:
+        tuple: (timescale, kernel)
+    """
+    if kernel not in _kernel_cache:
+        from skyfield.api import load, load_file
+        eph = load_file(kernel) if os.path.exists(kernel) else load(kernel)
+        _kernel_cache[kernel] = (load.timescale(), eph)
+    return _kernel_cache[kernel]
+
+
+def select_kernel(unix_seconds):
+    """
+    Elige el kernel para un rango de instantes
+    
+    Returns:
+        str: el kernel recortado si existe y cubre todos los instantes,
+             si no el kernel completo
+    """
+    if EPHEMERIS_SLIM_KERNEL and os.path.exists(EPHEMERIS_SLIM_KERNEL):
+        from shared.calculations.kernel_excerpt import kernel_coverage
+        _, eph = load_kernel(EPHEMERIS_SLIM_KERNEL)
+        start, end = kernel_coverage(eph)
+        if start <= np.min(unix_seconds) and np.max(unix_seconds) <= end:
+            return EPHEMERIS_SLIM_KERNEL
+    return EPHEMERIS_KERNEL
+
+
+def calculate_ephemeris_batch(times, location_lat=-32.4833, location_lon=-58.229561,
+                              bodies=None, kernel=None):
+    """
+    Calcula RA/DEC/distancia de varios cuerpos en varios instantes en una sola pasada
+    
+    La posición del observador se evalúa una vez para todo el array de tiempos
+    y cada cuerpo se resuelve con un único observe() vectorizado.
     
     Args:
+        times: array de datetimes UTC, datetime64 o segundos Unix (T instantes)
         location_lat: Latitud del observador en grados
         location_lon: Longitud del observador en grados
-        date: datetime object (si es None, usa fecha actual)
+        bodies: dict nombre → clave del kernel (por defecto EPHEMERIS_BODIES)
+        kernel: archivo .bsp a usar (None = select_kernel)
     
     Returns:
-        dict: Diccionario con objetos y sus coordenadas (ra_hours, dec_degrees)
-        None: Si falla (sin internet o error)
+        dict: 'names' (lista de B nombres), 'times' (array (T,) en segundos Unix) y
+              'ra_hours', 'dec_degrees', 'distance_au' (arrays (B, T))
+        None: Si falla (sin skyfield, sin internet o fuera del rango del kernel)
     """
     try:
-        from skyfield.api import load, wgs84
+        from skyfield.api import wgs84
     except ImportError:
         print("WARNING: skyfield no esta instalado. Usando valores predeterminados.")
         print("Instala con: pip install skyfield")
         return None
     
+    from shared.calculations.astronomy import _to_unix_seconds
+    
+    if bodies is None:
+        bodies = EPHEMERIS_BODIES
+    
     try:
-        print("Cargando efemerides...")
-        
-        # Cargar efemerides (descarga automaticamente si no existen)
-        ts = load.timescale()
-        eph = load('de421.bsp')
+        unix_seconds = np.atleast_1d(_to_unix_seconds(times))
+        if kernel is None:
+            kernel = select_kernel(unix_seconds)
+        ts, eph = load_kernel(kernel)
         
-        # Si no se especifica fecha, usar actual
-        if date is None:
-            date = datetime.now(timezone.utc)
+        # Días desde la época Unix en la escala UTC de skyfield (respeta segundos intercalares)
+        t = ts.utc(1970, 1, 1 + unix_seconds / 86400.0)
         
-        # Crear tiempo Skyfield
-        t = ts.from_datetime(date)
+        observer = (eph['earth'] + wgs84.latlon(location_lat, location_lon)).at(t)
         
-        # Ubicacion del observador
-        observer = wgs84.latlon(location_lat, location_lon)
+        names = list(bodies)
+        shape = (len(names), len(unix_seconds))
+        ra_hours = np.empty(shape)
+        dec_degrees = np.empty(shape)
+        distance_au = np.empty(shape)
         
-        # Objetos celestes
-        earth = eph['earth']
-        moon = eph['moon']
-        sun = eph['sun']  # Agregamos el Sol
+        for i, name in enumerate(names):
+            ra, dec, distance = observer.observe(eph[bodies[name]]).radec()
+            ra_hours[i] = ra.hours
+            dec_degrees[i] = dec.degrees
+            distance_au[i] = distance.au
         
-        planets_data = {
-            'Mercurio': eph['mercury'],
-            'Venus': eph['venus'],
-            'Marte': eph['mars'],
-            'Jupiter': eph['jupiter barycenter'],
-            'Saturno': eph['saturn barycenter'],
-            'Sol': eph['sun']  # Agregamos Sol a los planetas_data
+        return {
+            'names': names,
+            'times': unix_seconds,
+            'ra_hours': ra_hours,
+            'dec_degrees': dec_degrees,
+            'distance_au': distance_au,
         }
-        
-        results = {}
-        
-        print(f"\nFecha: {date.strftime('%Y-%m-%d %H:%M:%S UTC')}")
-        print(f"Ubicacion: {location_lat}, {location_lon}")
-        print("\n" + "="*60)
-        
-        # Calcular Luna
-        print("\nLUNA:")
-        astrometric = (earth + observer).at(t).observe(moon)
-        ra, dec, distance = astrometric.radec()
-        ra_hours = ra.hours
-        dec_degrees = dec.degrees
-        results['Luna'] = (ra_hours, dec_degrees)
-        print(f"  RA:  {ra_hours:.6f} horas")
-        print(f"  DEC: {dec_degrees:.6f} grados")
-        
-        # Calcular Sol
-        print("\nSOL:")
-        astrometric = (earth + observer).at(t).observe(sun)
-        ra, dec, distance = astrometric.radec()
-        ra_hours = ra.hours
-        dec_degrees = dec.degrees
-        results['Sol'] = (ra_hours, dec_degrees)
-        print(f"  RA:  {ra_hours:.6f} horas")
-        print(f"  DEC: {dec_degrees:.6f} grados")
-        
-        # Calcular planetas
-        print("\nPLANETAS:")
-        for name, body in planets_data.items():
-            astrometric = (earth + observer).at(t).observe(body)
-            ra, dec, distance = astrometric.radec()
-            ra_hours = ra.hours
-            dec_degrees = dec.degrees
-            results[name] = (ra_hours, dec_degrees)
-            print(f"\n  {name}:")
-            print(f"    RA:  {ra_hours:.6f} horas")
-            print(f"    DEC: {dec_degrees:.6f} grados")
-        
-        return results
     
     except Exception as e:
         print(f"ERROR al calcular efemerides: {e}")
+        return None
+
+
+def calculate_ephemeris(location_lat=-32.4833, location_lon=-58.229561, date=None, verbose=False):
+    """
+    Calcula las coordenadas RA/DEC de planetas, Luna y Sol para una fecha y ubicacion
+    
+    Args:
+        location_lat: Latitud del observador en grados
+        location_lon: Longitud del observador en grados
+        date: datetime object (si es None, usa fecha actual)
+        verbose: si True, imprime las coordenadas calculadas
+    
+    Returns:
+        dict: Diccionario con objetos y sus coordenadas (ra_hours, dec_degrees)
+        None: Si falla (sin internet o error)
+    """
+    # Si no se especifica fecha, usar actual
+    if date is None:
+        date = datetime.now(timezone.utc)
+    
+    if verbose:
+        print("Cargando efemerides...")
+    
+    batch = calculate_ephemeris_batch([date], location_lat, location_lon)
+    if batch is None:
         print("Usando valores predeterminados de celestial_data.json")
         return None
+    
+    results = {
+        name: (float(batch['ra_hours'][i, 0]), float(batch['dec_degrees'][i, 0]))
+        for i, name in enumerate(batch['names'])
+    }
+    
+    if verbose:
+        print(f"\nFecha: {date.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+        print(f"Ubicacion: {location_lat}, {location_lon}")
+        print_coordinates(results)
+    
+    return results
 
 
 def update_json_file(ephemeris_data, filename='../celestial_data.json'):
     """
     Actualiza el archivo JSON con las nuevas coordenadas
     
+    Reescribe todo el catálogo (temporal + rename, nunca queda a medio escribir).
+    Para las actualizaciones frecuentes usar save_ephemeris_state o
+    publish_ephemeris(persist=True), que no tocan el catálogo.
+    
     Args:
         ephemeris_data: dict con coordenadas calculadas
         filename: nombre del archivo JSON
@@ -167,8 +238,7 @@ def update_json_file(ephemeris_data, filename='../celestial_data.json'):
         data['metadata']['last_full_update'] = now
         
         # Guardar JSON actualizado
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        write_json_atomic(filename, data, indent=2)
         
         print(f"\nArchivo '{filename}' actualizado correctamente")
         return True
@@ -200,8 +270,9 @@ def main():
     lat = -32.4833
     lon = -58.229561
     
-    # Calcular efemerides
-    ephemeris = calculate_ephemeris(lat, lon)
+    # Calcular efemerides (memoizado por ubicación y minuto)
+    from shared.calculations.ephemeris_cache import get_ephemeris
+    ephemeris = get_ephemeris(lat, lon)
     
     if ephemeris is None:
         print("\nNo se pudieron calcular efemerides.")
@@ -213,13 +284,15 @@ def main():
     # Mostrar coordenadas
     print_coordinates(ephemeris)
     
-    # Preguntar si actualizar archivo
+    # Preguntar si guardar las posiciones
+    from config import EPHEMERIS_STATE_FILE
+    from shared.celestial_data import save_ephemeris_state
     print("\n" + "="*60)
-    print("Deseas actualizar celestial_data.json? (s/n): ", end='')
+    print(f"Deseas guardar las posiciones en {EPHEMERIS_STATE_FILE}? (s/n): ", end='')
     response = input().strip().lower()
     
     if response in ['s', 'si', 'y', 'yes']:
-        success = update_json_file(ephemeris)
+        success = save_ephemeris_state(ephemeris)
         if success:
             print("\nListo! Reinicia la aplicacion para ver los cambios.")
     else:
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# ephemeris_tables.py
+"""
+Tablas de efemérides precalculadas con polinomios de Chebyshev
+
+El comando de precálculo evalúa Sol, Luna y planetas con skyfield una sola
+vez sobre un período configurable y guarda segmentos de Chebyshev en un
+archivo .npz pequeño. En ejecución, EphemerisTable interpola RA/DEC para
+cualquier instante con NumPy solamente: sin importar skyfield y sin red.
+
+Uso (desde la carpeta python/):
+    python -m shared.calculations.ephemeris_tables --days 90
+"""
+import argparse
+import json
+import os
+import time
+import numpy as np
+from datetime import datetime, timezone
+
+# Versión del formato de archivo
+TABLE_FORMAT_VERSION = 1
+
+# (días por segmento, grado del polinomio) por cuerpo. La Luna topocéntrica
+# se mueve rápido y tiene paralaje diurna grande: segmentos más cortos.
+DEFAULT_SEGMENTS = {
+    'Luna': (0.25, 10),
+    'Sol': (1.0, 10),
+    'Mercurio': (1.0, 10),
+    'Venus': (1.0, 10),
+    'Marte': (1.0, 10),
+    'Jupiter': (1.0, 10),
+    'Saturno': (1.0, 10),
+}
+
+
+def fit_chebyshev_segments(position_func, start_s, span_s, segment_s, degree):
+    """
+    Ajusta segmentos de Chebyshev a una función de posición vectorizada
+
+    Args:
+        position_func: función (array de segundos Unix) → array (N, 3) de posiciones
+        start_s: inicio en segundos Unix
+        span_s: duración total en segundos
+        segment_s: duración de cada segmento en segundos
+        degree: grado del polinomio por componente
+
+    Returns:
+        tuple: (coeficientes (segmentos, grado+1, 3), error máximo relativo entre nodos)
+    """
+    n_segments = int(np.ceil(span_s / segment_s))
+    n_nodes = 2 * (degree + 1)
+    nodes = np.cos(np.pi * (np.arange(n_nodes) + 0.5) / n_nodes)[::-1]
+
+    # Evaluar todos los nodos de todos los segmentos en una sola llamada
+    seg_starts = start_s + np.arange(n_segments) * segment_s
+    times = seg_starts[:, None] + (nodes[None, :] + 1) * segment_s / 2
+    positions = position_func(times.ravel()).reshape(n_segments, n_nodes, 3)
+
+    coeffs = np.empty((n_segments, degree + 1, 3))
+    for i in range(n_segments):
+        coeffs[i] = np.polynomial.chebyshev.chebfit(nodes, positions[i], degree)
+
+    # Control de calidad en puntos intermedios
+    mid = start_s + (np.arange(n_segments) + 0.37) * segment_s
+    expected = position_func(mid)
+    fitted = _evaluate(coeffs, start_s, segment_s, mid)
+    error = np.linalg.norm(fitted - expected, axis=1) / np.linalg.norm(expected, axis=1)
+
+    return coeffs, float(error.max())
+
+
+def _evaluate(coeffs, start_s, segment_s, times):
+    """Evalúa segmentos de Chebyshev (Clenshaw vectorizado) para un array de instantes"""
+    times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+    seg = np.clip(((times - start_s) // segment_s).astype(np.int64), 0, len(coeffs) - 1)
+    x = 2 * (times - (start_s + seg * segment_s)) / segment_s - 1
+    c = coeffs[seg]  # (M, grado+1, 3)
+
+    x2 = (2 * x)[:, None]
+    b1 = np.zeros((len(times), 3))
+    b2 = np.zeros((len(times), 3))
+    for k in range(c.shape[1] - 1, 0, -1):
+        b1, b2 = c[:, k] + x2 * b1 - b2, b1
+    return c[:, 0] + x[:, None] * b1 - b2
+
+
+def build_ephemeris_tables(path, location_lat=-32.4833, location_lon=-58.229561,
+                           start=None, days=90, segments=DEFAULT_SEGMENTS):
+    """
+    Evalúa los cuerpos con skyfield y guarda las tablas de Chebyshev
+
+    Args:
+        path: archivo .npz de salida
+        location_lat, location_lon: ubicación del observador en grados
+        start: datetime UTC de inicio (None = ahora)
+        days: días cubiertos por la tabla
+        segments: dict nombre → (días por segmento, grado)
+
+    Returns:
+        bool: True si se guardó correctamente
+    """
+    try:
+        from skyfield.api import wgs84
+    except ImportError:
+        print("ERROR: skyfield no esta instalado (pip install skyfield)")
+        return False
+
+    from shared.calculations.ephemeris_calculator import EPHEMERIS_BODIES, load_kernel
+
+    ts, eph = load_kernel()
+    observer = eph['earth'] + wgs84.latlon(location_lat, location_lon)
+
+    if start is None:
+        start = datetime.now(timezone.utc)
+    start_s = start.timestamp()
+    span_s = days * 86400.0
+
+    arrays = {}
+    meta = {
+        'version': TABLE_FORMAT_VERSION,
+        'location_lat': location_lat,
+        'location_lon': location_lon,
+        'start': start_s,
+        'end': start_s + span_s,
+        'bodies': {},
+    }
+
+    for name, key in EPHEMERIS_BODIES.items():
+        body = eph[key]
+        segment_days, degree = segments[name]
+
+        def position_au(unix_seconds, body=body):
+            t = ts.utc(1970, 1, 1 + unix_seconds / 86400.0)
+            return observer.at(t).observe(body).position.au.T
+
+        t0 = time.perf_counter()
+        coeffs, error = fit_chebyshev_segments(
+            position_au, start_s, span_s, segment_days * 86400.0, degree
+        )
+        arrays[name] = coeffs
+        meta['bodies'][name] = {'segment_s': segment_days * 86400.0}
+        print(f"  {name:10s} {len(coeffs):5d} segmentos, error máx "
+              f"{np.degrees(error) * 3600:.3f}\" ({time.perf_counter() - t0:.2f} s)")
+
+    np.savez(path, meta=np.array(json.dumps(meta)), **arrays)
+    size_kb = os.path.getsize(path) / 1024
+    print(f"\nTablas guardadas en '{path}' ({size_kb:.0f} KB, {days} días)")
+    return True
+
+
+class EphemerisTable:
+    """Evaluador liviano de las tablas de Chebyshev (solo NumPy)"""
+
+    def __init__(self, meta, coeffs):
+        self.meta = meta
+        self.coeffs = coeffs
+        self.start = meta['start']
+        self.end = meta['end']
+
+    @classmethod
+    def load(cls, path):
+        """
+        Abre un archivo de tablas
+
+        Returns:
+            EphemerisTable o None si no existe o no es válido
+        """
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data['meta']))
+                if meta.get('version') != TABLE_FORMAT_VERSION:
+                    return None
+                coeffs = {name: data[name] for name in meta['bodies']}
+        except Exception as e:
+            print(f"WARNING: no se pudieron leer las tablas de efemérides {path}: {e}")
+            return None
+        return cls(meta, coeffs)
+
+    def covers(self, unix_seconds):
+        """Indica si un instante está dentro del período de la tabla"""
+        return self.start <= unix_seconds <= self.end
+
+    def matches_site(self, location_lat, location_lon, tolerance_deg=0.01):
+        """Indica si la tabla se calculó para esta ubicación"""
+        return (abs(self.meta['location_lat'] - location_lat) <= tolerance_deg and
+                abs(self.meta['location_lon'] - location_lon) <= tolerance_deg)
+
+    def position(self, name, unix_seconds):
+        """
+        Vector de posición topocéntrico (UA) interpolado
+
+        Args:
+            name: nombre del cuerpo ('Luna', 'Marte', ...)
+            unix_seconds: instante o array de instantes en segundos Unix
+
+        Returns:
+            np.ndarray: array (M, 3) en UA, ICRS
+        """
+        segment_s = self.meta['bodies'][name]['segment_s']
+        return _evaluate(self.coeffs[name], self.start, segment_s, unix_seconds)
+
+    def radec(self, name, unix_seconds):
+        """
+        RA/DEC/distancia interpoladas
+
+        Returns:
+            tuple: (array RA en horas, array DEC en grados, array distancia en UA)
+        """
+        p = self.position(name, unix_seconds)
+        dist = np.linalg.norm(p, axis=1)
+        ra_h = (np.degrees(np.arctan2(p[:, 1], p[:, 0])) / 15) % 24
+        dec_deg = np.degrees(np.arcsin(p[:, 2] / dist))
+        return ra_h, dec_deg, dist
+
+    def ephemeris(self, date=None):
+        """
+        Posiciones de todos los cuerpos, con el formato de calculate_ephemeris
+
+        Returns:
+            dict: {'Luna': (ra_h, dec_deg), ...}
+        """
+        if date is None:
+            date = datetime.now(timezone.utc)
+        t = date.timestamp()
+
+        results = {}
+        for name in self.coeffs:
+            ra_h, dec_deg, _ = self.radec(name, t)
+            results[name] = (float(ra_h[0]), float(dec_deg[0]))
+        return results
+
+
+def ephemeris_from_table(path, location_lat=-32.4833, location_lon=-58.229561, date=None):
+    """
+    Intenta obtener las efemérides desde las tablas precalculadas
+
+    Returns:
+        dict: como calculate_ephemeris, o None si no hay tabla válida para
+              esa ubicación y fecha (en ese caso usar skyfield)
+    """
+    table = EphemerisTable.load(path)
+    if table is None:
+        return None
+
+    if date is None:
+        date = datetime.now(timezone.utc)
+    if not table.covers(date.timestamp()):
+        print(f"Tablas de efemérides vencidas o fuera de rango: {path}")
+        return None
+    if not table.matches_site(location_lat, location_lon):
+        print(f"Tablas de efemérides calculadas para otra ubicación: {path}")
+        return None
+
+    return table.ephemeris(date)
+
+
+def main():
+    """Comando de precálculo"""
+    from config import EPHEMERIS_TABLE_FILE
+
+    parser = argparse.ArgumentParser(description="Precalcula tablas de efemérides (Chebyshev)")
+    parser.add_argument('--days', type=float, default=90, help="días a cubrir desde ahora")
+    parser.add_argument('--lat', type=float, default=-32.4833, help="latitud del observador")
+    parser.add_argument('--lon', type=float, default=-58.229561, help="longitud del observador")
+    parser.add_argument('--output', default=EPHEMERIS_TABLE_FILE, help="archivo .npz de salida")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("PRECÁLCULO DE TABLAS DE EFEMÉRIDES")
+    print("="*60)
+    if not build_ephemeris_tables(args.output, args.lat, args.lon, days=args.days):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
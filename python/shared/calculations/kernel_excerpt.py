@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# kernel_excerpt.py
+"""
+Recorte de kernels SPK: solo los segmentos y el período que usa SkyTracker
+
+de421.bsp (~17 MB, 1900-2050) trae segmentos que la aplicación no necesita
+para los siete cuerpos de EPHEMERIS_BODIES. El recorte conserva únicamente las
+cadenas de segmentos de esos cuerpos (y de la Tierra) dentro de un rango de
+fechas; el resultado pesa decenas de KB y skyfield lo abre con mmap.
+
+Uso (desde la carpeta python/):
+    python -m shared.calculations.kernel_excerpt --days 365
+"""
+import argparse
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+# Días UTC → Julian Date
+UNIX_EPOCH_JD = 2440587.5
+
+
+def required_segments(kernel, bodies):
+    """
+    Pares (centro, objetivo) necesarios para observar los cuerpos desde la Tierra
+
+    Args:
+        kernel: SpiceKernel de skyfield
+        bodies: dict nombre → clave del kernel
+
+    Returns:
+        set: pares (centro, objetivo) de los segmentos a conservar
+    """
+    pairs = set()
+    for key in ['earth'] + list(bodies.values()):
+        vector = kernel[key]
+        # Un cuerpo puede ser una suma de segmentos o un segmento directo
+        for function in getattr(vector, 'vector_functions', [vector]):
+            pairs.add((function.center, function.target))
+    return pairs
+
+
+def kernel_coverage(kernel):
+    """
+    Período cubierto por todos los segmentos del kernel
+
+    Returns:
+        tuple: (inicio, fin) en segundos Unix
+    """
+    start_jd = max(segment.start_jd for segment in kernel.spk.segments)
+    end_jd = min(segment.end_jd for segment in kernel.spk.segments)
+    return (start_jd - UNIX_EPOCH_JD) * 86400.0, (end_jd - UNIX_EPOCH_JD) * 86400.0
+
+
+def extract_kernel(source, output, start=None, days=365, bodies=None):
+    """
+    Escribe un kernel SPK reducido a los cuerpos y fechas indicados
+
+    Args:
+        source: kernel completo (p. ej. 'de421.bsp')
+        output: archivo .bsp de salida
+        start: datetime UTC de inicio (None = ayer, para cubrir husos horarios)
+        days: días cubiertos desde start
+        bodies: dict nombre → clave del kernel (por defecto EPHEMERIS_BODIES)
+
+    Returns:
+        bool: True si se escribió correctamente
+    """
+    try:
+        from jplephem.excerpter import write_excerpt
+    except ImportError:
+        print("ERROR: skyfield/jplephem no estan instalados (pip install skyfield)")
+        return False
+
+    from shared.calculations.ephemeris_calculator import EPHEMERIS_BODIES, load_kernel
+
+    if bodies is None:
+        bodies = EPHEMERIS_BODIES
+    if start is None:
+        start = datetime.now(timezone.utc) - timedelta(days=1)
+
+    start_jd = start.timestamp() / 86400.0 + UNIX_EPOCH_JD
+    end_jd = start_jd + days
+
+    _, kernel = load_kernel(source)
+    pairs = required_segments(kernel, bodies)
+    spk = kernel.spk
+    summaries = [
+        summary for summary, segment in zip(spk.daf.summaries(), spk.segments)
+        if (segment.center, segment.target) in pairs
+    ]
+
+    with open(output, 'w+b') as f:
+        write_excerpt(spk, f, start_jd, end_jd, summaries)
+
+    size_in = os.path.getsize(source) / 1024
+    size_out = os.path.getsize(output) / 1024
+    print(f"{len(summaries)} de {len(spk.segments)} segmentos seleccionados, {days} días desde "
+          f"{start.strftime('%Y-%m-%d')}")
+    print(f"'{source}' ({size_in:.0f} KB) → '{output}' ({size_out:.0f} KB)")
+    return True
+
+
+def main():
+    """Comando de recorte"""
+    from config import EPHEMERIS_KERNEL, EPHEMERIS_SLIM_KERNEL
+
+    parser = argparse.ArgumentParser(description="Recorta un kernel SPK a los cuerpos y fechas usados")
+    parser.add_argument('--source', default=EPHEMERIS_KERNEL, help="kernel completo de entrada")
+    parser.add_argument('--output', default=EPHEMERIS_SLIM_KERNEL, help="kernel reducido de salida")
+    parser.add_argument('--days', type=float, default=365, help="días a cubrir desde ayer")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("RECORTE DE KERNEL SPK")
+    print("="*60)
+    t0 = time.perf_counter()
+    if not extract_kernel(args.source, args.output, days=args.days):
+        raise SystemExit(1)
+    print(f"Listo en {time.perf_counter() - t0:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+# minor_bodies.py
+"""
+Asteroides y cometas desde archivos de elementos orbitales del MPC
+
+Lee MPCORB.DAT (asteroides) y CometEls.txt (cometas) en formato de columnas
+fijas y propaga todo el catálogo con un solver de Kepler vectorizado: órbitas
+elípticas, parabólicas e hiperbólicas en la misma pasada, sin una llamada a
+skyfield por objeto. La lectura y la propagación trabajan por bloques, así la
+memoria temporal queda acotada aunque el archivo tenga cientos de miles de
+órbitas.
+
+La posición de la Tierra usa los elementos keplerianos aproximados de Standish
+(JPL) para el baricentro Tierra-Luna (analytic_ephemeris), con un error de
+segundos de arco: más que suficiente para apuntar y dibujar cuerpos menores. No se modelan perturbaciones
+planetarias; los elementos deben ser recientes (el MPC los publica cada mes).
+"""
+import os
+import numpy as np
+from shared.calculations.astronomy import equatorial_unit_vectors
+from shared.calculations.analytic_ephemeris import (
+    LIGHT_AU_PER_DAY, solve_kepler, orbit_to_equatorial, planet_heliocentric, unix_to_jd_tt
+)
+from config import MINOR_BODIES_MAX_H, MINOR_BODIES_CHUNK
+
+# Constante gravitacional de Gauss (radianes/día, UA, masa solar)
+GAUSS_K = 0.01720209895
+# Órbitas con |e - 1| menor que esto se resuelven como parábolas
+PARABOLIC_TOLERANCE = 1e-8
+
+# Letras de siglo y de día/mes en las fechas empaquetadas del MPC
+_PACKED_CENTURY = {'I': 1800, 'J': 1900, 'K': 2000, 'L': 2100}
+_PACKED_DIGITS = '0123456789ABCDEFGHIJKLMNOPQRSTUV'
+
+
+def unpack_epoch(packed):
+    """
+    Fecha empaquetada del MPC ('K239D' = 2023-09-13) a Julian Date (TT)
+
+    Returns:
+        float: Julian Date a las 0 h del día indicado
+    """
+    year = _PACKED_CENTURY[packed[0]] + int(packed[1:3])
+    month = _PACKED_DIGITS.index(packed[3])
+    day = _PACKED_DIGITS.index(packed[4])
+    return calendar_to_jd(year, month, day)
+
+
+def calendar_to_jd(year, month, day):
+    """Julian Date de una fecha gregoriana (day puede tener fracción)"""
+    if month <= 2:
+        year -= 1
+        month += 12
+    a = year // 100
+    b = 2 - a + a // 4
+    return int(365.25*(year + 4716)) + int(30.6001*(month + 1)) + day + b - 1524.5
+
+
+def _parse_asteroid(line):
+    """
+    Una línea de MPCORB.DAT (columnas fijas)
+
+    Returns:
+        tuple: (nombre, H, G, q, e, t_perihelio_jd, i, nodo, arg_perihelio)
+    """
+    epoch = unpack_epoch(line[20:25])
+    mean_anomaly = float(line[26:35])
+    e = float(line[70:79])
+    n = float(line[80:91])              # grados/día
+    a = float(line[92:103])
+    h = float(line[8:13]) if line[8:13].strip() else np.nan
+    g = float(line[14:19]) if line[14:19].strip() else 0.15
+    name = line[166:194].strip() or line[0:7].strip()
+    return (name, h, g, a * (1 - e), e, epoch - mean_anomaly / n,
+            float(line[59:68]), float(line[48:57]), float(line[37:46]))
+
+
+def _parse_comet(line):
+    """
+    Una línea de CometEls.txt (columnas fijas)
+
+    Returns:
+        tuple: (nombre, H, G, q, e, t_perihelio_jd, i, nodo, arg_perihelio)
+    """
+    tp = calendar_to_jd(int(line[14:18]), int(line[19:21]), float(line[22:29]))
+    h = float(line[91:95]) if line[91:95].strip() else np.nan
+    g = float(line[96:100]) if line[96:100].strip() else 4.0
+    return (line[102:158].strip(), h, g, float(line[30:39]), float(line[41:49]), tp,
+            float(line[71:79]), float(line[61:69]), float(line[51:59]))
+
+
+def iter_element_chunks(path, chunk_size=MINOR_BODIES_CHUNK, max_h=MINOR_BODIES_MAX_H,
+                        max_objects=None):
+    """
+    Lee un archivo de elementos del MPC en bloques
+
+    Reconoce por línea el formato de asteroides (MPCORB.DAT, con o sin
+    encabezado) y el de cometas (CometEls.txt); ignora las líneas que no se
+    pueden interpretar.
+
+    Args:
+        path: archivo de elementos
+        chunk_size: órbitas por bloque
+        max_h: magnitud absoluta máxima (None = sin filtro; los cometas sin H se conservan)
+        max_objects: cantidad máxima de órbitas a leer (None = todas)
+
+    Yields:
+        tuple: (nombres, array (N, 8) con q, e, t_perihelio_jd, i, nodo, arg_perihelio, H, G)
+    """
+    names, rows = [], []
+    total = 0
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            if len(line) < 100 or line.startswith('-----'):
+                continue
+            try:
+                # Los cometas llevan el año del perihelio en las columnas 15-18
+                parsed = _parse_comet(line) if line[14:18].isdigit() else _parse_asteroid(line)
+            except (ValueError, KeyError, ZeroDivisionError, IndexError):
+                continue
+
+            name, h, g, q, e, tp, inc, node, peri = parsed
+            if max_h is not None and h > max_h:
+                continue
+            names.append(name)
+            rows.append((q, e, tp, inc, node, peri, h, g))
+            total += 1
+
+            if len(rows) >= chunk_size:
+                yield names, np.array(rows, dtype=np.float64)
+                names, rows = [], []
+            if max_objects is not None and total >= max_objects:
+                break
+    if rows:
+        yield names, np.array(rows, dtype=np.float64)
+
+
+def _solve_hyperbolic(mean_anomaly, e, tolerance=1e-12, max_iter=100):
+    """Ecuación hiperbólica e sinh H - H = M (Newton vectorizado)"""
+    h = np.sign(mean_anomaly) * np.log(2*np.abs(mean_anomaly)/e + 1.8)
+    for _ in range(max_iter):
+        step = (e*np.sinh(h) - h - mean_anomaly) / (e*np.cosh(h) - 1)
+        h -= step
+        if np.max(np.abs(step), initial=0.0) < tolerance:
+            break
+    return h
+
+
+def orbital_plane_positions(q, e, dt_days):
+    """
+    Posición en el plano de la órbita para cualquier excentricidad
+
+    Args:
+        q: distancia del perihelio en UA (N,)
+        e: excentricidad (N,)
+        dt_days: días desde el perihelio (N,)
+
+    Returns:
+        tuple: (x hacia el perihelio, y) en UA, arrays (N,)
+    """
+    x = np.empty_like(q)
+    y = np.empty_like(q)
+
+    elliptic = e < 1 - PARABOLIC_TOLERANCE
+    hyperbolic = e > 1 + PARABOLIC_TOLERANCE
+    parabolic = ~(elliptic | hyperbolic)
+
+    if elliptic.any():
+        ee = e[elliptic]
+        a = q[elliptic] / (1 - ee)
+        ecc = solve_kepler(GAUSS_K * dt_days[elliptic] / a**1.5, ee)
+        x[elliptic] = a * (np.cos(ecc) - ee)
+        y[elliptic] = a * np.sqrt(1 - ee*ee) * np.sin(ecc)
+
+    if hyperbolic.any():
+        eh = e[hyperbolic]
+        a = q[hyperbolic] / (eh - 1)
+        h = _solve_hyperbolic(GAUSS_K * dt_days[hyperbolic] / a**1.5, eh)
+        x[hyperbolic] = a * (eh - np.cosh(h))
+        y[hyperbolic] = a * np.sqrt(eh*eh - 1) * np.sinh(h)
+
+    if parabolic.any():
+        # Ecuación de Barker: s + s³/3 = k Δt / sqrt(2 q³), con s = tan(ν/2)
+        qp = q[parabolic]
+        w = 1.5 * GAUSS_K * dt_days[parabolic] / np.sqrt(2 * qp**3)
+        u = np.cbrt(w + np.sqrt(w*w + 1))
+        s = u - 1/u
+        x[parabolic] = qp * (1 - s*s)
+        y[parabolic] = 2 * qp * s
+
+    return x, y
+
+
+def propagate(elements, unix_seconds, light_time=True):
+    """
+    RA/DEC astrométricas geocéntricas de un bloque de órbitas
+
+    Args:
+        elements: array (N, 8) de iter_element_chunks
+        unix_seconds: instante en segundos Unix (UTC)
+        light_time: si True, corrige por el tiempo de luz (una iteración)
+
+    Returns:
+        tuple: (RA en horas (N,), DEC en grados (N,), distancia a la Tierra en UA (N,))
+    """
+    q, e, tp, inc, node, peri = elements[:, :6].T
+    jd = unix_to_jd_tt(unix_seconds)
+    earth = planet_heliocentric('EMB', jd)[0]
+
+    def geocentric(dt_days):
+        x, y = orbital_plane_positions(q, e, dt_days)
+        return orbit_to_equatorial(x, y, inc, node, peri) - earth
+
+    r = geocentric(jd - tp)
+    distance = np.sqrt(np.sum(r*r, axis=-1))
+    if light_time:
+        r = geocentric(jd - tp - distance / LIGHT_AU_PER_DAY)
+        distance = np.sqrt(np.sum(r*r, axis=-1))
+
+    ra_h = np.degrees(np.arctan2(r[:, 1], r[:, 0])) % 360 / 15
+    dec_deg = np.degrees(np.arcsin(np.clip(r[:, 2] / distance, -1.0, 1.0)))
+    return ra_h, dec_deg, distance
+
+
+class MinorBodyCatalog:
+    """Catálogo de asteroides y cometas propagado por bloques"""
+
+    def __init__(self, names, elements, chunk_size=MINOR_BODIES_CHUNK):
+        """
+        Args:
+            names: lista de nombres en el orden de elements
+            elements: array (N, 8) con q, e, t_perihelio_jd, i, nodo, arg_perihelio, H, G
+            chunk_size: órbitas por bloque al propagar (acota la memoria temporal)
+        """
+        self.names = names
+        self.elements = elements
+        self.chunk_size = chunk_size
+        self._index = {}
+        for i, name in enumerate(names):
+            key = name.lower()
+            self._index.setdefault(key, i)
+            # "(1) Ceres" también se encuentra como "ceres"
+            if key.startswith('(') and ')' in key:
+                self._index.setdefault(key.split(')', 1)[1].strip(), i)
+
+        # Última propagación publicada: (instante Unix, RA, DEC, vectores unitarios)
+        self._snapshot = None
+
+    @classmethod
+    def from_file(cls, path, max_h=MINOR_BODIES_MAX_H, max_objects=None,
+                  chunk_size=MINOR_BODIES_CHUNK):
+        """
+        Carga un archivo de elementos del MPC
+
+        Returns:
+            MinorBodyCatalog o None si el archivo no existe o no tiene órbitas válidas
+        """
+        if not path or not os.path.exists(path):
+            return None
+        names, blocks = [], []
+        try:
+            for chunk_names, block in iter_element_chunks(path, chunk_size, max_h, max_objects):
+                names.extend(chunk_names)
+                blocks.append(block)
+        except Exception as e:
+            print(f"ERROR cargando elementos orbitales de {path}: {e}")
+            return None
+        if not names:
+            return None
+        catalog = cls(names, np.concatenate(blocks), chunk_size)
+        print(f"Cuerpos menores cargados: {len(catalog)} desde {path}")
+        return catalog
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name.lower().strip() in self._index
+
+    def get_name(self, name):
+        """Nombre tal como figura en el archivo (o None)"""
+        i = self._index.get(name.lower().strip())
+        return None if i is None else self.names[i]
+
+    def radec(self, unix_seconds, chunk_size=None):
+        """
+        Propaga todo el catálogo a un instante, bloque por bloque
+
+        Args:
+            unix_seconds: instante en segundos Unix (UTC)
+            chunk_size: órbitas por bloque (None = el del catálogo)
+
+        Returns:
+            tuple: (RA en horas (N,), DEC en grados (N,), distancia en UA (N,))
+        """
+        chunk_size = chunk_size or self.chunk_size
+        n = len(self.names)
+        ra_h, dec_deg, distance = np.empty(n), np.empty(n), np.empty(n)
+        for start in range(0, n, chunk_size):
+            block = slice(start, start + chunk_size)
+            ra_h[block], dec_deg[block], distance[block] = propagate(
+                self.elements[block], unix_seconds
+            )
+        return ra_h, dec_deg, distance
+
+    def radec_one(self, name, unix_seconds):
+        """
+        RA/DEC de un solo cuerpo (para el tracker)
+
+        Returns:
+            tuple: (ra_h, dec_deg) o None si no existe
+        """
+        i = self._index.get(name.lower().strip())
+        if i is None:
+            return None
+        ra_h, dec_deg, _ = propagate(self.elements[i:i+1], unix_seconds)
+        return float(ra_h[0]), float(dec_deg[0])
+
+    def refresh(self, unix_seconds):
+        """
+        Propaga el catálogo y publica el resultado con un único reemplazo
+
+        Returns:
+            tuple: (instante, RA, DEC, vectores unitarios) publicado
+        """
+        ra_h, dec_deg, _ = self.radec(unix_seconds)
+        snapshot = (unix_seconds, ra_h, dec_deg, equatorial_unit_vectors(ra_h, dec_deg))
+        self._snapshot = snapshot
+        return snapshot
+
+    @property
+    def snapshot(self):
+        """Última propagación publicada (o None si todavía no se propagó)"""
+        return self._snapshot
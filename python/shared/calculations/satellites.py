@@ -0,0 +1,220 @@
+# satellites.py
+"""
+Satélites artificiales desde archivos TLE locales (SGP4 vectorizado)
+
+Todo el catálogo se propaga con una sola llamada a SatrecArray (la extensión
+C de sgp4 si está disponible) y se lleva de TEME a coordenadas horizontales
+del observador con operaciones NumPy. No usa la red: solo el archivo TLE.
+
+Un satélite en órbita baja cruza el cielo a varios grados por segundo, por eso
+el renderer y el tracker lo evalúan en cada cuadro en lugar de usar el cache
+por LST de los objetos del catálogo.
+"""
+import os
+import numpy as np
+from shared.calculations.astronomy import calculate_lst_many, scale_projection
+from config import LOCATION_LATITUDE, LOCATION_LONGITUDE, LOCATION_ELEVATION, UT1_UTC_OFFSET
+
+# Elipsoide WGS84
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+
+# Julian Date de la época Unix
+UNIX_EPOCH_JD = 2440587.5
+
+
+def load_tle_file(path):
+    """
+    Lee un archivo TLE de 2 o 3 líneas por satélite
+
+    Returns:
+        list: tuplas (nombre, línea 1, línea 2); sin línea de nombre se usa el número NORAD
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        lines = [line.rstrip() for line in f if line.strip()]
+
+    satellites = []
+    name = None
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith('1 ') and i + 1 < len(lines) and lines[i + 1].startswith('2 '):
+            satellites.append((name or line[2:7].strip(), line, lines[i + 1]))
+            name = None
+            i += 2
+        else:
+            # Línea de nombre (formato 3LE: puede empezar con "0 ")
+            name = line[2:].strip() if line.startswith('0 ') else line.strip()
+            i += 1
+    return satellites
+
+
+def geodetic_to_ecef(lat_deg, lon_deg, elevation_m=0.0):
+    """Posición ECEF (km) de un punto sobre el elipsoide WGS84"""
+    lat = np.radians(lat_deg)
+    lon = np.radians(lon_deg)
+    e2 = WGS84_F * (2 - WGS84_F)
+    n = WGS84_A_KM / np.sqrt(1 - e2 * np.sin(lat)**2)
+    h = elevation_m / 1000.0
+    return np.array([
+        (n + h) * np.cos(lat) * np.cos(lon),
+        (n + h) * np.cos(lat) * np.sin(lon),
+        (n * (1 - e2) + h) * np.sin(lat),
+    ])
+
+
+def _jd_split(unix_seconds):
+    """Separa instantes Unix en (día juliano entero + 0.5, fracción) como espera sgp4"""
+    unix_seconds = np.atleast_1d(np.asarray(unix_seconds, dtype=np.float64))
+    days = np.floor(unix_seconds / 86400.0)
+    return UNIX_EPOCH_JD + days, (unix_seconds - days * 86400.0) / 86400.0
+
+
+class SatelliteCatalog:
+    """Catálogo de satélites propagado en bloque para una ubicación"""
+
+    def __init__(self, satellites, lat_deg=LOCATION_LATITUDE, lon_deg=LOCATION_LONGITUDE,
+                 elevation_m=LOCATION_ELEVATION, dut1=UT1_UTC_OFFSET):
+        """
+        Args:
+            satellites: lista de tuplas (nombre, línea 1, línea 2)
+            lat_deg, lon_deg: ubicación del observador en grados
+            elevation_m: altura del observador sobre el elipsoide en metros
+            dut1: UT1 − UTC en segundos (el GMST de la rotación TEME → ECEF va en UT1)
+        """
+        from sgp4.api import Satrec, SatrecArray
+
+        self.names = [name for name, _, _ in satellites]
+        self._satrecs = [Satrec.twoline2rv(line1, line2) for _, line1, line2 in satellites]
+        self._array = SatrecArray(self._satrecs)
+        self._index = {name.lower(): i for i, name in enumerate(self.names)}
+
+        self.lon_deg = lon_deg
+        self.dut1 = dut1
+        self.observer_ecef = geodetic_to_ecef(lat_deg, lon_deg, elevation_m)
+
+        # Filas: este, norte y cenit locales expresados en ECEF
+        lat, lon = np.radians(lat_deg), np.radians(lon_deg)
+        self._enu = np.array([
+            [-np.sin(lon), np.cos(lon), 0.0],
+            [-np.sin(lat)*np.cos(lon), -np.sin(lat)*np.sin(lon), np.cos(lat)],
+            [np.cos(lat)*np.cos(lon), np.cos(lat)*np.sin(lon), np.sin(lat)],
+        ])
+
+    @classmethod
+    def from_tle_file(cls, path, **kwargs):
+        """
+        Carga un archivo TLE
+
+        Returns:
+            SatelliteCatalog o None si el archivo no existe, está vacío o falta sgp4
+        """
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            satellites = load_tle_file(path)
+            if not satellites:
+                return None
+            catalog = cls(satellites, **kwargs)
+        except ImportError:
+            print("WARNING: sgp4 no esta instalado (pip install sgp4)")
+            return None
+        except Exception as e:
+            print(f"ERROR cargando satélites de {path}: {e}")
+            return None
+        print(f"Satélites cargados: {len(catalog)} desde {path}")
+        return catalog
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name.lower().strip() in self._index
+
+    def get_name(self, name):
+        """Nombre tal como figura en el archivo TLE (o None)"""
+        i = self._index.get(name.lower().strip())
+        return None if i is None else self.names[i]
+
+    def _teme_positions(self, unix_seconds, index=None):
+        """
+        Propaga con SGP4
+
+        Returns:
+            tuple: (posiciones TEME en km (N, 3), máscara de propagación válida (N,))
+        """
+        jd, fr = _jd_split(unix_seconds)
+        if index is None:
+            errors, r, _ = self._array.sgp4(jd, fr)
+            return r[:, 0], errors[:, 0] == 0
+        error, r, _ = self._satrecs[index].sgp4(jd[0], fr[0])
+        return np.array([r]), np.array([error == 0])
+
+    def horizontal(self, unix_seconds, index=None):
+        """
+        Direcciones topocéntricas en ejes de escena
+
+        Args:
+            unix_seconds: instante en segundos Unix (UTC)
+            index: un único satélite (None = todo el catálogo)
+
+        Returns:
+            tuple: (vectores unitarios (N, 3) con x este, y cenit, z sur;
+                    distancia en km (N,); máscara de propagación válida (N,))
+        """
+        r_teme, valid = self._teme_positions(unix_seconds, index)
+
+        # TEME → ECEF rotando por el tiempo sidéreo de Greenwich (en UT1: en
+        # órbita baja, 0.1 s de DUT1 ignorado son ~15" de error en la dirección)
+        gmst_deg, _ = calculate_lst_many(np.atleast_1d(unix_seconds) + self.dut1, 0.0)
+        theta = np.radians(gmst_deg[0])
+        c, s = np.cos(theta), np.sin(theta)
+        r_ecef = np.stack((c*r_teme[:, 0] + s*r_teme[:, 1],
+                           -s*r_teme[:, 0] + c*r_teme[:, 1],
+                           r_teme[:, 2]), axis=-1)
+
+        enu = (r_ecef - self.observer_ecef) @ self._enu.T
+        distance = np.sqrt(np.sum(enu*enu, axis=-1))
+        scene = np.stack((enu[:, 0], enu[:, 2], -enu[:, 1]), axis=-1)
+        scene /= np.where(distance > 0, distance, 1.0)[:, None]
+        return scene, distance, valid
+
+    def alt_az(self, unix_seconds, index=None):
+        """
+        Altura y acimut topocéntricos
+
+        Returns:
+            tuple: (altura en grados (N,), acimut en grados desde el norte hacia el este (N,))
+        """
+        scene, _, _ = self.horizontal(unix_seconds, index)
+        alt = np.degrees(np.arcsin(np.clip(scene[:, 1], -1.0, 1.0)))
+        az = np.degrees(np.arctan2(scene[:, 0], -scene[:, 2])) % 360
+        return alt, az
+
+    def positions(self, unix_seconds, mode='dome', dome_radius=30.0, min_alt_deg=0.0,
+                  dtype=np.float32):
+        """
+        Posiciones en la escena de los satélites sobre el horizonte
+
+        Returns:
+            tuple: (índices de los satélites visibles, array (M, 3) en la geometría de la escena)
+        """
+        scene, _, valid = self.horizontal(unix_seconds)
+        visible = np.flatnonzero(valid & (scene[:, 1] > np.sin(np.radians(min_alt_deg))))
+        xyz = scene[visible].astype(dtype)
+        return visible, scale_projection(xyz, mode, dome_radius)
+
+    def position(self, name, unix_seconds, mode='xyz', dome_radius=30.0):
+        """
+        Posición en la escena de un satélite (para el tracker)
+
+        Returns:
+            tuple: (x, y, z) o None si no existe o la propagación falló
+        """
+        index = self._index.get(name.lower().strip())
+        if index is None:
+            return None
+        scene, _, valid = self.horizontal(unix_seconds, index)
+        if not valid[0]:
+            return None
+        return tuple(scale_projection(scene, mode, dome_radius)[0].tolist())
@@ -0,0 +1,205 @@
+# sidereal_table.py
+"""
+Tabla de posiciones periódica en LST para objetos fijos
+
+Para estrellas y galaxias la posición en el domo depende solo del LST,
+que es periódico en un día sideral. La tabla guarda las direcciones
+horizontales de N objetos en pasos fijos de LST y cualquier LST se
+resuelve indexando dos filas e interpolando.
+
+Tamaño: pasos × N × 3 × 4 bytes en float32 (1440 × 10k objetos ≈ 165 MB),
+por eso puede guardarse en disco y abrirse con memmap: solo se leen las
+dos filas que toca cada consulta.
+
+La tabla guarda además de qué catálogo salió (hash de los vectores, posición
+aparente y época de los movimientos propios); una tabla que no coincide se
+descarta y se vuelve a construir.
+"""
+import hashlib
+import json
+import os
+import numpy as np
+from shared.calculations.astronomy import project_unit_vectors, scale_projection
+from config import LOCATION_LATITUDE, PROPER_MOTION_EPOCH_THRESHOLD
+
+
+def catalog_hash(unit_vectors):
+    """Hash de los vectores unitarios de catálogo (cambia si se mueve o agrega un objeto)"""
+    vectors = np.ascontiguousarray(unit_vectors, dtype=np.float64)
+    return hashlib.sha1(vectors.tobytes()).hexdigest()
+
+
+class SiderealLookupTable:
+    """Tabla (pasos, N, 3) de direcciones horizontales unitarias indexada por LST"""
+
+    def __init__(self, table, lat_deg, source_hash=None, use_apparent=False, epoch=None):
+        """
+        Args:
+            table: array (pasos, N, 3) ya calculado (en memoria o memmap)
+            lat_deg: latitud para la que se construyó la tabla
+            source_hash: catalog_hash de los vectores de catálogo usados
+            use_apparent: si los vectores se pasaron a posición aparente
+            epoch: época juliana de los movimientos propios del catálogo
+        """
+        self.table = table
+        self.lat_deg = lat_deg
+        self.steps = table.shape[0]
+        self.n_objects = table.shape[1]
+        self.source_hash = source_hash
+        self.use_apparent = use_apparent
+        self.epoch = epoch
+
+    def matches(self, lat_deg, source_hash, use_apparent=False, epoch=None,
+                epoch_tolerance=PROPER_MOTION_EPOCH_THRESHOLD):
+        """
+        Indica si la tabla corresponde a este sitio y catálogo
+
+        Args:
+            lat_deg: latitud del observador
+            source_hash: catalog_hash de los vectores de catálogo actuales
+            use_apparent: configuración de posición aparente actual
+            epoch: época actual de los movimientos propios (None = no comparar)
+            epoch_tolerance: deriva en años que se acepta
+        """
+        if self.lat_deg != lat_deg or self.source_hash != source_hash:
+            return False
+        if bool(self.use_apparent) != bool(use_apparent):
+            return False
+        if epoch is not None and (self.epoch is None or abs(self.epoch - epoch) > epoch_tolerance):
+            return False
+        return True
+
+    @classmethod
+    def build(cls, unit_vectors, lat_deg=LOCATION_LATITUDE, steps=1440,
+              dtype=np.float32, path=None, source_hash=None, use_apparent=False, epoch=None):
+        """
+        Construye la tabla a partir de vectores unitarios ecuatoriales
+
+        Args:
+            unit_vectors: array (N, 3) de equatorial_unit_vectors
+            lat_deg: latitud del observador en grados
+            steps: cantidad de pasos de LST por día sideral
+            dtype: tipo de almacenamiento (float32 por defecto)
+            path: archivo .npy donde guardar la tabla (None = solo en memoria)
+            source_hash: catalog_hash del catálogo (None = hash de unit_vectors)
+            use_apparent: si unit_vectors ya están en posición aparente
+            epoch: época juliana de los movimientos propios del catálogo
+
+        Returns:
+            SiderealLookupTable
+        """
+        if source_hash is None:
+            source_hash = catalog_hash(unit_vectors)
+        unit_vectors = np.asarray(unit_vectors, dtype=np.float64)
+        shape = (steps, len(unit_vectors), 3)
+
+        if path is None:
+            table = np.empty(shape, dtype=dtype)
+        else:
+            table = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+
+        for i in range(steps):
+            lst_h = 24.0 * i / steps
+            table[i] = project_unit_vectors(unit_vectors, lst_h, lat_deg, dome_radius=1.0)
+
+        if path is not None:
+            table.flush()
+            with open(path + '.json', 'w', encoding='utf-8') as f:
+                json.dump({'lat_deg': lat_deg, 'steps': steps, 'n_objects': len(unit_vectors),
+                           'source_hash': source_hash, 'use_apparent': bool(use_apparent),
+                           'epoch': epoch}, f)
+
+        return cls(table, lat_deg, source_hash, use_apparent, epoch)
+
+    @classmethod
+    def load(cls, path, lat_deg=LOCATION_LATITUDE, n_objects=None, source_hash=None,
+             use_apparent=False, epoch=None):
+        """
+        Abre una tabla guardada con memmap (solo lectura)
+
+        Args:
+            path: archivo .npy de la tabla
+            lat_deg, n_objects: sitio y cantidad de objetos esperados
+            source_hash, use_apparent, epoch: catálogo esperado (ver matches);
+                con source_hash None no se comparan
+
+        Returns:
+            SiderealLookupTable o None si no existe o no corresponde al sitio/catálogo
+        """
+        meta_path = path + '.json'
+        if not (os.path.exists(path) and os.path.exists(meta_path)):
+            return None
+
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta['lat_deg'] != lat_deg:
+                return None
+            if n_objects is not None and meta['n_objects'] != n_objects:
+                return None
+            table = cls(np.load(path, mmap_mode='r'), lat_deg, meta.get('source_hash'),
+                        meta.get('use_apparent', False), meta.get('epoch'))
+        except Exception as e:
+            print(f"WARNING: no se pudo abrir la tabla sideral {path}: {e}")
+            return None
+
+        if source_hash is not None and not table.matches(lat_deg, source_hash, use_apparent, epoch):
+            print(f"WARNING: la tabla sideral {path} no corresponde al catálogo actual, se reconstruye")
+            return None
+        return table
+
+    @classmethod
+    def load_or_build(cls, unit_vectors, lat_deg=LOCATION_LATITUDE, steps=1440, path=None,
+                      source_hash=None, use_apparent=False, epoch=None):
+        """
+        Abre la tabla de disco si es compatible; si no, la construye (y guarda si hay path)
+
+        Args:
+            unit_vectors: vectores a tabular (ya en posición aparente si use_apparent)
+            source_hash: catalog_hash de los vectores de catálogo (None = de unit_vectors)
+            use_apparent, epoch: ver matches
+        """
+        if source_hash is None:
+            source_hash = catalog_hash(unit_vectors)
+        if path is not None:
+            table = cls.load(path, lat_deg, len(unit_vectors), source_hash, use_apparent, epoch)
+            if table is not None and table.steps == steps:
+                return table
+        return cls.build(unit_vectors, lat_deg, steps, path=path, source_hash=source_hash,
+                         use_apparent=use_apparent, epoch=epoch)
+
+    def lookup(self, lst_h, mode='dome', dome_radius=30.0, interpolation='linear'):
+        """
+        Retorna las posiciones de todos los objetos para un LST
+
+        Args:
+            lst_h: Local Sidereal Time en horas
+            mode: 'dome' o 'xyz' (igual que project_many)
+            dome_radius: Radio del domo (solo para mode='dome')
+            interpolation: 'linear' (rápida) o 'slerp' (exacta sobre la esfera)
+
+        Returns:
+            np.ndarray: array (N, 3) en la precisión de la tabla
+        """
+        pos = (lst_h % 24) / 24 * self.steps
+        i0 = int(pos) % self.steps
+        i1 = (i0 + 1) % self.steps
+        t = pos - int(pos)
+
+        a = self.table[i0]
+        b = self.table[i1]
+
+        if interpolation == 'linear':
+            xyz = a + (b - a) * t
+        elif interpolation == 'slerp':
+            dot = np.clip(np.sum(a*b, axis=1, keepdims=True), -1.0, 1.0)
+            omega = np.arccos(dot)
+            sin_omega = np.sin(omega)
+            small = sin_omega < 1e-6
+            w0 = np.where(small, 1 - t, np.sin((1 - t)*omega) / np.where(small, 1, sin_omega))
+            w1 = np.where(small, t, np.sin(t*omega) / np.where(small, 1, sin_omega))
+            xyz = (a*w0 + b*w1).astype(self.table.dtype, copy=False)
+        else:
+            raise ValueError(f"Interpolación desconocida: {interpolation}")
+
+        return scale_projection(xyz, mode, dome_radius)
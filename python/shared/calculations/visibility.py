@@ -0,0 +1,165 @@
+# visibility.py
+"""
+Salida, tránsito, puesta y visibilidad nocturna de todo el catálogo en una pasada
+"""
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from shared.calculations.astronomy import calculate_lst_many
+from config import LOCATION_LATITUDE, LOCATION_LONGITUDE, LOCATION_UTC_OFFSET
+
+# Horas solares por día sideral
+SIDEREAL_DAY_HOURS = 24 / 1.00273790935
+
+
+def _hours_to_datetime64(start_utc, hours):
+    """Convierte desplazamientos en horas desde start_utc a datetime64 (NaN → NaT)"""
+    start64 = np.datetime64(start_utc.astimezone(timezone.utc).replace(tzinfo=None), 'ns')
+    result = np.full(hours.shape, np.datetime64('NaT'), dtype='datetime64[ns]')
+    valid = np.isfinite(hours)
+    result[valid] = start64 + (hours[valid] * 3.6e12).astype('timedelta64[ns]')
+    return result
+
+
+def _altitude_deg(ra_h, dec_rad, lst_h, lat_rad):
+    """Altura en grados para un LST dado"""
+    ha_rad = np.radians((lst_h - ra_h) * 15)
+    sin_alt = np.sin(dec_rad)*np.sin(lat_rad) + np.cos(dec_rad)*np.cos(lat_rad)*np.cos(ha_rad)
+    return np.degrees(np.arcsin(np.clip(sin_alt, -1.0, 1.0)))
+
+
+def solve_visibility(ra_h, dec_deg, start_utc, end_utc,
+                     lat_deg=LOCATION_LATITUDE, lon_deg=LOCATION_LONGITUDE, min_alt_deg=0.0):
+    """
+    Resuelve la visibilidad de N objetos fijos dentro de una ventana de tiempo
+
+    Todo es analítico: el ángulo horario de salida sale de la altura mínima y los
+    tránsitos se repiten cada día sideral, así que no hay muestreo por minuto.
+
+    Args:
+        ra_h: array (N,) de Ascensiones Rectas en horas
+        dec_deg: array (N,) de Declinaciones en grados
+        start_utc, end_utc: datetimes UTC de la ventana (máximo 24 h)
+        lat_deg, lon_deg: ubicación del observador en grados
+        min_alt_deg: altura mínima considerada "visible" en grados
+
+    Returns:
+        dict: arrays (N,) con 'rise', 'transit', 'set' (datetime64, NaT si no aplica),
+              'transit_alt', 'max_alt' (grados dentro de la ventana),
+              'hours_above' (horas sobre min_alt_deg dentro de la ventana) y 'visible'
+    """
+    ra_h = np.asarray(ra_h, dtype=np.float64)
+    dec_rad = np.radians(np.asarray(dec_deg, dtype=np.float64))
+    lat_rad = np.radians(lat_deg)
+    window_h = (end_utc - start_utc).total_seconds() / 3600
+    if not 0 < window_h <= 24:
+        raise ValueError("La ventana debe durar entre 0 y 24 horas")
+
+    _, (lst_start, lst_end) = calculate_lst_many([start_utc, end_utc], lon_deg)
+
+    # Semi-arco diurno sobre min_alt (en horas solares)
+    cos_h0 = ((np.sin(np.radians(min_alt_deg)) - np.sin(lat_rad)*np.sin(dec_rad))
+              / (np.cos(lat_rad)*np.cos(dec_rad)))
+    never_rises = cos_h0 > 1
+    circumpolar = cos_h0 < -1
+    half_arc = np.degrees(np.arccos(np.clip(cos_h0, -1.0, 1.0))) / 15 * SIDEREAL_DAY_HOURS / 24
+
+    # Primer tránsito superior desde el inicio de la ventana
+    first_transit = ((ra_h - lst_start) % 24) * SIDEREAL_DAY_HOURS / 24
+
+    # Tiempo sobre el horizonte: intersección de la ventana con los arcos k = -1, 0, 1
+    hours_above = np.zeros_like(ra_h)
+    for k in (-1, 0, 1):
+        center = first_transit + k*SIDEREAL_DAY_HOURS
+        overlap = np.minimum(window_h, center + half_arc) - np.maximum(0.0, center - half_arc)
+        hours_above += np.maximum(overlap, 0.0)
+    hours_above[never_rises] = 0.0
+
+    # Altura máxima: en el tránsito si cae dentro de la ventana, si no en un extremo
+    transit_alt = 90 - np.abs(lat_deg - np.degrees(dec_rad))
+    edge_alt = np.maximum(
+        _altitude_deg(ra_h, dec_rad, lst_start, lat_rad),
+        _altitude_deg(ra_h, dec_rad, lst_end, lat_rad)
+    )
+    max_alt = np.where(first_transit <= window_h, transit_alt, edge_alt)
+
+    # Tránsito más cercano al centro de la ventana, con su salida y puesta
+    k_near = np.round((window_h/2 - first_transit) / SIDEREAL_DAY_HOURS)
+    transit = first_transit + k_near*SIDEREAL_DAY_HOURS
+    no_events = never_rises | circumpolar
+    rise = np.where(no_events, np.nan, transit - half_arc)
+    set_ = np.where(no_events, np.nan, transit + half_arc)
+
+    return {
+        'rise': _hours_to_datetime64(start_utc, rise),
+        'transit': _hours_to_datetime64(start_utc, transit),
+        'set': _hours_to_datetime64(start_utc, set_),
+        'transit_alt': transit_alt,
+        'max_alt': max_alt,
+        'hours_above': hours_above,
+        'visible': hours_above > 0,
+    }
+
+
+class VisibilityPlanner:
+    """Planificador nocturno sobre el catálogo completo con cache por (sitio, fecha)"""
+
+    def __init__(self, lat_deg=LOCATION_LATITUDE, lon_deg=LOCATION_LONGITUDE,
+                 utc_offset_h=LOCATION_UTC_OFFSET):
+        self.lat_deg = lat_deg
+        self.lon_deg = lon_deg
+        self.utc_offset_h = utc_offset_h
+        self._cache = {}
+
+    def night(self, date, start_hour=21, end_hour=3, min_alt_deg=0.0, catalog=None):
+        """
+        Calcula la visibilidad de todo el catálogo para una noche local
+
+        Args:
+            date: fecha local (date) en que empieza la noche
+            start_hour, end_hour: horas locales de inicio y fin (fin al día siguiente si es menor)
+            min_alt_deg: altura mínima en grados
+            catalog: tupla (nombres, ra_h, dec_deg); por defecto get_catalog_arrays()
+
+        Returns:
+            dict: resultado de solve_visibility más 'names', 'start_utc' y 'end_utc'
+        """
+        if catalog is None:
+            from shared.celestial_data import get_catalog_arrays, get_catalog_version
+            # La versión entra en la clave: efemérides nuevas o una recarga invalidan el cache
+            version = get_catalog_version()
+            key = (self.lat_deg, self.lon_deg, date, start_hour, end_hour, min_alt_deg, version)
+            if key in self._cache:
+                return self._cache[key]
+            # Los resultados de versiones anteriores ya no se van a pedir
+            for old_key in [k for k in self._cache if k[-1] != version]:
+                del self._cache[old_key]
+            names, ra_h, dec_deg = get_catalog_arrays()
+        else:
+            names, ra_h, dec_deg = catalog
+
+        local_tz = timezone(timedelta(hours=self.utc_offset_h))
+        start = datetime(date.year, date.month, date.day, start_hour, tzinfo=local_tz)
+        end = datetime(date.year, date.month, date.day, end_hour, tzinfo=local_tz)
+        if end <= start:
+            end += timedelta(days=1)
+        start_utc, end_utc = start.astimezone(timezone.utc), end.astimezone(timezone.utc)
+
+        result = solve_visibility(
+            ra_h, dec_deg, start_utc, end_utc,
+            self.lat_deg, self.lon_deg, min_alt_deg
+        )
+        result.update(names=names, start_utc=start_utc, end_utc=end_utc)
+
+        if catalog is None:
+            self._cache[key] = result
+        return result
+
+    def visible_names(self, date, min_hours=0.0, **kwargs):
+        """Retorna los nombres visibles esa noche, ordenados por altura máxima"""
+        result = self.night(date, **kwargs)
+        order = np.argsort(-result['max_alt'])
+        return [result['names'][i] for i in order if result['hours_above'][i] > min_hours]
+
+    def clear_cache(self):
+        """Vacía el cache (los cambios de versión del catálogo ya lo invalidan solos)"""
+        self._cache.clear()
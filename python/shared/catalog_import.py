@@ -0,0 +1,436 @@
+# catalog_import.py
+"""
+Importador de catálogos de estrellas (CSV o ancho fijo) al formato columnar
+
+Lee el archivo por bloques de bytes sin cargarlo entero, filtra por
+magnitud, deriva el tamaño de punto de la magnitud y el color del índice
+B–V, y escribe la carpeta de columnas .npy que abre ColumnarCatalog.
+
+Uso (desde la carpeta python/):
+    python -m shared.catalog_import hip_main.dat --preset hipparcos --output shared/catalogs/hipparcos
+    python -m shared.catalog_import tyc2.dat --preset tycho2 --mag-limit 10 --output shared/catalogs/tycho2
+    python -m shared.catalog_import estrellas.csv --header \
+        --columns name=Nombre,ra=RA,dec=Dec,mag=Vmag,bv=BV --ra-unit hours
+"""
+import argparse
+import csv
+import os
+import time
+import numpy as np
+from shared.columnar_catalog import ColumnarCatalogWriter
+from config import COLOR_STAR
+
+# Tamaño de punto por magnitud, ajustado a los tamaños del JSON
+# (Sirius -1.5 → 9, Betelgeuse 0.5 → 7, Adhara 1.5 → 6)
+SIZE_AT_MAG_ZERO = 7.5
+SIZE_PER_MAG = 1.0
+SIZE_MIN = 1.0
+SIZE_MAX = 9.0
+
+# Campos que entiende el importador
+FIELDS = ('name', 'ra', 'dec', 'mag', 'bv', 'bt', 'vt', 'pm_ra', 'pm_dec', 'parallax', 'rv')
+
+# Campo del importador → columna de movimiento propio del catálogo
+MOTION_FIELDS = {
+    'pm_ra': 'pm_ra_mas',
+    'pm_dec': 'pm_dec_mas',
+    'parallax': 'parallax_mas',
+    'rv': 'radial_velocity_kms',
+}
+
+
+def _tycho_name(values):
+    """'0001 00008 1' → 'TYC 1-8-1'"""
+    return ['TYC ' + '-'.join(str(int(part)) for part in value.split()) for value in values]
+
+
+# Catálogos conocidos (índices de campo base 0 en los archivos '|' del CDS)
+PRESETS = {
+    # I/239 hip_main.dat: posiciones ICRS en la época J1991.25
+    'hipparcos': {
+        'format': 'csv', 'delimiter': '|', 'ra_unit': 'degrees', 'epoch': 1991.25,
+        'name_prefix': 'HIP ',
+        'columns': {'name': 1, 'mag': 5, 'ra': 8, 'dec': 9, 'parallax': 11,
+                    'pm_ra': 12, 'pm_dec': 13, 'bv': 37},
+    },
+    # I/259 tyc2.dat: posición media en J2000; V y B–V salen de BT y VT
+    'tycho2': {
+        'format': 'csv', 'delimiter': '|', 'ra_unit': 'degrees', 'epoch': 2000.0,
+        'name_format': _tycho_name,
+        'columns': {'name': 0, 'ra': 2, 'dec': 3, 'pm_ra': 4, 'pm_dec': 5, 'bt': 17, 'vt': 19},
+    },
+}
+
+
+def magnitude_to_size(mag):
+    """Tamaño de punto (float32) a partir de la magnitud visual"""
+    mag = np.asarray(mag, dtype=np.float64)
+    size = np.clip(SIZE_AT_MAG_ZERO - SIZE_PER_MAG * mag, SIZE_MIN, SIZE_MAX)
+    return np.where(np.isnan(size), SIZE_MIN, size).astype(np.float32)
+
+
+def bv_to_rgb(bv, default=COLOR_STAR):
+    """
+    Color RGB 0-1 de una estrella a partir del índice B–V
+
+    B–V → temperatura con la fórmula de Ballesteros (2012), y temperatura →
+    RGB con el ajuste de cuerpo negro de Tanner Helland. Sin B–V se usa default.
+
+    Args:
+        bv: array (N,) de índices B–V (NaN si falta)
+
+    Returns:
+        np.ndarray: array (N, 3) float32
+    """
+    bv = np.clip(np.asarray(bv, dtype=np.float64), -0.4, 2.0)
+    temp = 4600 * (1 / (0.92 * bv + 1.7) + 1 / (0.92 * bv + 0.62)) / 100
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        hot = np.maximum(temp - 60, 1e-9)
+        red = np.where(temp <= 66, 255.0, 329.698727446 * hot**-0.1332047592)
+        green = np.where(temp <= 66, 99.4708025861 * np.log(temp) - 161.1195681661,
+                         288.1221695283 * hot**-0.0755148492)
+        blue = np.where(temp >= 66, 255.0,
+                        np.where(temp <= 19, 0.0,
+                                 138.5177312231 * np.log(np.maximum(temp - 10, 1e-9)) - 305.0447927307))
+
+    rgb = np.clip(np.stack((red, green, blue), axis=-1) / 255, 0, 1)
+    rgb[np.isnan(bv)] = default[:3]
+    return rgb.astype(np.float32)
+
+
+def parse_floats(values):
+    """Lista de strings → array float64 (vacíos y espacios → NaN)"""
+    values = np.asarray(values, dtype=str)
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        # Hay campos vacíos: solo entonces vale la pena recortar espacios
+        values = np.char.strip(values)
+        values[values == ''] = 'nan'
+        return values.astype(np.float64)
+
+
+def parse_columns(spec):
+    """
+    'name=1,ra=RAdeg' → {'name': 1, 'ra': 'RAdeg'}
+
+    En CSV el valor es un índice base 0 o el nombre de la cabecera; en ancho
+    fijo, 'inicio-fin' en bytes base 1 inclusivos (como los ReadMe del CDS).
+    """
+    columns = {}
+    for item in spec.split(','):
+        field, _, value = item.partition('=')
+        field = field.strip()
+        if field not in FIELDS:
+            raise ValueError(f"campo desconocido '{field}' (válidos: {', '.join(FIELDS)})")
+        value = value.strip()
+        columns[field] = int(value) if value.isdigit() else value
+    return columns
+
+
+def _gather_fields(buf, starts, stops):
+    """
+    Copia campos de un buffer de bytes a un array 'S' de ancho fijo
+
+    Args:
+        buf: array uint8 con el bloque
+        starts, stops: posición de inicio y fin (exclusivo) de cada campo (N,)
+
+    Returns:
+        np.ndarray: array (N,) de dtype 'S<ancho>' (relleno con espacios)
+    """
+    lengths = np.maximum(stops - starts, 0)
+    width = int(lengths.max()) if len(lengths) else 0
+    if width == 0:
+        return np.full(len(starts), b'', dtype='S1')
+    offsets = np.arange(width)
+    index = np.minimum(starts[:, None] + offsets, len(buf) - 1)
+    matrix = np.where(offsets < lengths[:, None], buf[index], ord(' ')).astype(np.uint8)
+    return matrix.view(f'S{width}').ravel()
+
+
+class CatalogImporter:
+    """Convierte un archivo de texto de estrellas al formato columnar por bloques"""
+
+    def __init__(self, columns, file_format='csv', delimiter=',', header=False, skip_rows=0,
+                 ra_unit='degrees', mag_limit=None, epoch=2000.0, name_prefix='',
+                 name_format=None, block_size=16 * 2**20):
+        """
+        Args:
+            columns: dict campo → índice/cabecera (csv) o 'inicio-fin' (ancho fijo)
+            file_format: 'csv' o 'fixed'
+            delimiter: separador de campos en CSV (un carácter)
+            header: si True, la primera línea (tras skip_rows) tiene los nombres de columna
+            skip_rows: líneas a saltear al principio
+            ra_unit: 'degrees' o 'hours'
+            mag_limit: magnitud máxima a importar (None = todas)
+            epoch: época juliana de las posiciones
+            name_prefix: prefijo de los nombres ('HIP ')
+            name_format: función opcional lista de strings → lista de nombres
+            block_size: bytes leídos por bloque (se corta en el último fin de línea)
+        """
+        missing = {'ra', 'dec'} - set(columns)
+        if missing:
+            raise ValueError(f"faltan columnas obligatorias: {', '.join(sorted(missing))}")
+        if 'mag' not in columns and 'vt' not in columns:
+            raise ValueError("falta la columna de magnitud (mag o vt)")
+        if file_format == 'csv' and not header:
+            # Sin cabecera no hay con qué traducir un nombre a índice
+            named = [f"{field}={column}" for field, column in columns.items()
+                     if isinstance(column, str)]
+            if named:
+                raise ValueError(f"columnas por nombre sin cabecera ({', '.join(named)}): "
+                                 "usar --header o índices numéricos")
+
+        self.columns = columns
+        self.file_format = file_format
+        self.delimiter = delimiter
+        self.header = header
+        self.skip_rows = skip_rows
+        self.ra_scale = 1 / 15 if ra_unit == 'degrees' else 1.0
+        self.mag_limit = mag_limit
+        self.epoch = epoch
+        self.name_prefix = name_prefix
+        self.name_format = name_format
+        self.block_size = block_size
+        self.motion = any(field in columns for field in MOTION_FIELDS)
+
+    def _resolve_header(self, line):
+        """Reemplaza los nombres de cabecera por índices"""
+        names = [name.strip() for name in next(csv.reader([line], delimiter=self.delimiter))]
+        resolved = {}
+        for field, column in self.columns.items():
+            if isinstance(column, str):
+                if column not in names:
+                    raise ValueError(f"columna '{column}' no está en la cabecera")
+                column = names.index(column)
+            resolved[field] = column
+        self.columns = resolved
+
+    def _split(self, block):
+        """
+        Separa un bloque de líneas completas en campos
+
+        Los límites de cada campo se calculan con NumPy sobre los bytes del
+        bloque: no se crea un string por campo. Un bloque irregular (comillas,
+        líneas vacías o con distinta cantidad de separadores) se separa con csv.
+
+        Returns:
+            tuple: (dict campo → array 'S' o lista de strings, cantidad de filas)
+        """
+        buf = np.frombuffer(block, dtype=np.uint8)
+        ends = np.flatnonzero(buf == ord('\n'))
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        # Sin el '\r' de los finales de línea de Windows
+        stops = ends - (buf[np.maximum(ends - 1, 0)] == ord('\r'))
+
+        if self.file_format == 'fixed':
+            if np.any(stops <= starts):
+                return self._split_text(block)
+            fields = {}
+            for field, span in self.columns.items():
+                first, _, last = str(span).partition('-')
+                fields[field] = _gather_fields(buf, starts + int(first) - 1,
+                                               np.minimum(starts + int(last or first), stops))
+            return fields, len(ends)
+
+        delimiters = np.flatnonzero(buf == ord(self.delimiter))
+        counts = np.diff(np.searchsorted(delimiters, np.concatenate(([-1], ends))))
+        if np.any(buf == ord('"')) or len(counts) == 0 or np.any(counts != counts[0]):
+            return self._split_text(block)
+
+        per_line = int(counts[0])
+        matrix = delimiters.reshape(len(ends), per_line)
+        fields = {}
+        for field, index in self.columns.items():
+            if index > per_line:
+                fields[field] = np.full(len(ends), b'', dtype='S1')
+                continue
+            first = starts if index == 0 else matrix[:, index - 1] + 1
+            last = stops if index == per_line else matrix[:, index]
+            fields[field] = _gather_fields(buf, first, last)
+        return fields, len(ends)
+
+    def _split_text(self, block):
+        """Separación línea por línea con csv (o por posición en ancho fijo)"""
+        lines = [line for line in block.decode('utf-8', errors='replace').splitlines()
+                 if line.strip()]
+        if self.file_format == 'fixed':
+            fields = {}
+            for field, span in self.columns.items():
+                first, _, last = str(span).partition('-')
+                first, last = int(first) - 1, int(last or first)
+                fields[field] = [line[first:last] for line in lines]
+            return fields, len(lines)
+
+        width = max(self.columns.values()) + 1
+        rows = [row + [''] * (width - len(row))
+                for row in csv.reader(lines, delimiter=self.delimiter)]
+        return {
+            field: [row[index] for row in rows] for field, index in self.columns.items()
+        }, len(lines)
+
+    def _convert(self, fields, count, first_row):
+        """
+        Convierte un bloque a arrays y aplica el filtro de magnitud
+
+        Returns:
+            tuple: (nombres, ra_h, dec_deg, mag, color, size, motion) de las filas que pasan
+        """
+        ra = parse_floats(fields['ra']) * self.ra_scale
+        dec = parse_floats(fields['dec'])
+
+        if 'mag' in fields:
+            mag = parse_floats(fields['mag'])
+            bv = parse_floats(fields['bv']) if 'bv' in fields else np.full(count, np.nan)
+        else:
+            # Tycho: V = VT − 0.090 (BT − VT), B–V = 0.850 (BT − VT)
+            vt = parse_floats(fields['vt'])
+            bt = parse_floats(fields['bt']) if 'bt' in fields else np.full(count, np.nan)
+            mag = np.where(np.isnan(bt), vt, vt - 0.090 * (bt - vt))
+            bv = 0.850 * (bt - vt)
+
+        keep = ~(np.isnan(ra) | np.isnan(dec))
+        if self.mag_limit is not None:
+            keep &= mag <= self.mag_limit
+        index = np.flatnonzero(keep)
+
+        if 'name' in fields:
+            raw = [value.decode('utf-8', errors='replace').strip()
+                   if isinstance(value, bytes) else value.strip()
+                   for value in np.asarray(fields['name'], dtype=object)[index].tolist()]
+            if self.name_format is not None:
+                raw = self.name_format(raw)
+            names = [self.name_prefix + name for name in raw]
+        else:
+            names = [f"{self.name_prefix}{first_row + i + 1}" for i in index.tolist()]
+
+        motion = {
+            column: np.nan_to_num(parse_floats(fields[field])[index])
+            for field, column in MOTION_FIELDS.items() if field in fields
+        }
+        return (names, ra[index], dec[index], mag[index], bv_to_rgb(bv[index]),
+                magnitude_to_size(mag[index]), motion)
+
+    def _blocks(self, f):
+        """Bloques de ~block_size bytes que terminan en un fin de línea"""
+        rest = b''
+        while True:
+            data = f.read(self.block_size)
+            if not data:
+                if rest:
+                    yield rest if rest.endswith(b'\n') else rest + b'\n'
+                return
+            data = rest + data
+            cut = data.rfind(b'\n') + 1
+            if cut == 0:
+                rest = data
+                continue
+            rest = data[cut:]
+            yield data[:cut]
+
+    def run(self, input_path, output_path, source='', report=print):
+        """
+        Importa el archivo
+
+        Args:
+            input_path: archivo de entrada (CSV o ancho fijo)
+            output_path: carpeta del catálogo columnar
+            source: descripción del origen (por defecto, el nombre del archivo)
+            report: función para los mensajes de progreso (None = silencio)
+
+        Returns:
+            dict: filas leídas, filas escritas, segundos y filas/s
+        """
+        total_bytes = os.path.getsize(input_path)
+        writer = ColumnarCatalogWriter(output_path, motion=self.motion, epoch=self.epoch,
+                                       source=source or os.path.basename(input_path))
+        t0 = time.perf_counter()
+        rows_read = 0
+
+        try:
+            with open(input_path, 'rb') as f:
+                for _ in range(self.skip_rows):
+                    f.readline()
+                if self.header:
+                    self._resolve_header(f.readline().decode('utf-8', errors='replace'))
+
+                for block in self._blocks(f):
+                    fields, count = self._split(block)
+                    if count:
+                        writer.append(*self._convert(fields, count, rows_read))
+                    rows_read += count
+
+                    if report is not None:
+                        elapsed = time.perf_counter() - t0
+                        report(f"  {100 * f.tell() / max(total_bytes, 1):5.1f}%  "
+                               f"{rows_read:,} filas leídas, {writer.rows:,} guardadas  "
+                               f"({rows_read / elapsed:,.0f} filas/s)")
+            writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+
+        elapsed = time.perf_counter() - t0
+        stats = {
+            'rows_read': rows_read,
+            'rows_written': writer.rows,
+            'seconds': elapsed,
+            'rows_per_second': rows_read / elapsed if elapsed else 0.0,
+        }
+        if report is not None:
+            report(f"{stats['rows_written']:,} de {rows_read:,} filas en {elapsed:.1f} s "
+                   f"({stats['rows_per_second']:,.0f} filas/s, "
+                   f"{total_bytes / 1e6 / max(elapsed, 1e-9):.1f} MB/s) → '{output_path}'")
+        return stats
+
+
+def main():
+    """Comando de importación"""
+    from config import STAR_CATALOG_DIR
+
+    parser = argparse.ArgumentParser(description="Importa un catálogo de estrellas al formato columnar")
+    parser.add_argument('input', help="archivo CSV o de ancho fijo")
+    parser.add_argument('--output', default=STAR_CATALOG_DIR or 'shared/catalogs/stars',
+                        help="carpeta del catálogo columnar")
+    parser.add_argument('--preset', choices=sorted(PRESETS), help="formato de un catálogo conocido")
+    parser.add_argument('--format', choices=('csv', 'fixed'), help="CSV o ancho fijo")
+    parser.add_argument('--columns', help="campo=columna separados por comas "
+                        "(csv: índice base 0 o cabecera; fijo: bytes inicio-fin base 1)")
+    parser.add_argument('--delimiter', help="separador de CSV (por defecto ',')")
+    parser.add_argument('--header', action='store_true', help="la primera línea es la cabecera")
+    parser.add_argument('--skip-rows', type=int, default=0, help="líneas a saltear al principio")
+    parser.add_argument('--ra-unit', choices=('degrees', 'hours'), help="unidad de RA (por defecto grados)")
+    parser.add_argument('--mag-limit', type=float, help="magnitud máxima a importar")
+    parser.add_argument('--epoch', type=float, help="época juliana de las posiciones (por defecto 2000.0)")
+    parser.add_argument('--name-prefix', help="prefijo de los nombres")
+    parser.add_argument('--block-mb', type=float, default=16, help="MB leídos por bloque")
+    args = parser.parse_args()
+
+    options = dict(PRESETS.get(args.preset, {}))
+    for option, value in (('format', args.format), ('delimiter', args.delimiter),
+                          ('ra_unit', args.ra_unit), ('epoch', args.epoch),
+                          ('name_prefix', args.name_prefix)):
+        if value is not None:
+            options[option] = value
+    if args.columns:
+        options['columns'] = parse_columns(args.columns)
+    if 'columns' not in options:
+        parser.error("indicar --columns o --preset")
+
+    print("="*60)
+    print("IMPORTACIÓN DE CATÁLOGO COLUMNAR")
+    print("="*60)
+    importer = CatalogImporter(
+        options['columns'], file_format=options.get('format', 'csv'),
+        delimiter=options.get('delimiter', ','), header=args.header, skip_rows=args.skip_rows,
+        ra_unit=options.get('ra_unit', 'degrees'), mag_limit=args.mag_limit,
+        epoch=options.get('epoch', 2000.0), name_prefix=options.get('name_prefix', ''),
+        name_format=options.get('name_format'), block_size=int(args.block_mb * 2**20),
+    )
+    importer.run(args.input, args.output, source=args.preset or '')
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,178 @@
 """
-Cargador de datos de objetos celestes desde JSON
+Cargador de datos de objetos celestes desde JSON (y un catálogo columnar opcional)
 """
 import json
 import os
+import threading
+import time
+import numpy as np
+from collections import namedtuple
 from datetime import datetime, timezone
+from shared.calculations.astronomy import (
+    equatorial_unit_vectors, julian_epoch, propagate_proper_motion, J2000_UNIX_SECONDS
+)
+from shared.columnar_catalog import ColumnarCatalog
+from shared.name_index import NameIndex, ALIASES
+from shared.ephemeris_state import EphemerisStateStore
+from config import (
+    PROPER_MOTION_EPOCH_THRESHOLD, STAR_CATALOG_DIR, STAR_CATALOG_MAG_LIMIT,
+    EPHEMERIS_STATE_FILE, EPHEMERIS_STATE_INTERVAL
+)
+
+CATEGORIES = ('stars', 'galaxies', 'planets', 'moon')
+
+# Estado publicado del catálogo. Nunca se modifica: cada actualización arma
+# uno nuevo y reemplaza la referencia, así los lectores no necesitan lock.
+#   version: contador que aumenta en cada publicación
+#   data: diccionario con el formato del JSON
+#   arrays: categoría → (nombres, ra_h, dec_deg, vectores unitarios (N, 3))
+#   objects: nombre en minúsculas → diccionario del objeto
+#   epoch: época juliana a la que se propagaron los movimientos propios
+#   catalog: CatalogStars del catálogo columnar (None si no hay)
+#   index: NameIndex de nombres y alias del JSON (se rearma solo al recargar)
+# En arrays y objects las estrellas están en epoch; data conserva la época del catálogo.
+# arrays['catalog'] tiene las estrellas del catálogo columnar hasta el límite de
+# magnitud; no entran en objects (pueden ser millones) sino en find_object.
+CatalogState = namedtuple('CatalogState', 'version data arrays objects epoch catalog index')
+
+# Filas del catálogo columnar publicadas y su estilo, alineados con arrays['catalog']
+#   rows: índices de fila en el catálogo (N,)
+#   size: tamaño de punto (N,) float32
+#   color: RGB 0-1 (N, 3) float32
+CatalogStars = namedtuple('CatalogStars', 'rows size color')
+
 
 class CelestialDataLoader:
     """Carga y gestiona datos de objetos celestes desde JSON"""
     
-    def __init__(self, json_file='shared/celestial_data.json'):
+    def __init__(self, json_file='shared/celestial_data.json',
+                 epoch_threshold=PROPER_MOTION_EPOCH_THRESHOLD,
+                 catalog_dir=STAR_CATALOG_DIR, mag_limit=STAR_CATALOG_MAG_LIMIT,
+                 state_file=EPHEMERIS_STATE_FILE, state_interval=EPHEMERIS_STATE_INTERVAL):
+        """
+        Args:
+            json_file: catálogo JSON (objetos editables)
+            epoch_threshold: deriva en años antes de re-propagar movimientos propios
+            catalog_dir: carpeta de un catálogo columnar (None = solo JSON)
+            mag_limit: magnitud máxima del catálogo columnar que se publica en arrays
+            state_file: archivo del estado de efemérides (None = no persistir)
+            state_interval: segundos mínimos entre escrituras del estado
+        """
         self.json_file = json_file
-        self.data = self._load_json()
+        self.epoch_threshold = epoch_threshold
+        self.mag_limit = mag_limit
+        self._write_lock = threading.Lock()
+        
+        self.ephemeris_state = EphemerisStateStore(state_file, state_interval)
+        self.columnar = ColumnarCatalog.open(catalog_dir)
+        self._state = self._build_state(self._load_data(), version=0)
+    
+    def _load_data(self):
+        """JSON del catálogo con el estado de efemérides persistido aplicado encima"""
+        data = self._load_json()
+        stored = self.ephemeris_state.load()
+        if not stored:
+            return data
+        
+        # Solo posiciones más nuevas que las del JSON (el JSON pudo editarse a mano)
+        last_update = {obj['name']: obj.get('last_update', '')
+                       for category in ('stars', 'galaxies', 'planets')
+                       for obj in data.get(category, [])}
+        if 'moon' in data:
+            last_update['Luna'] = data['moon'].get('last_update', '')
+        updates = {name: fields for name, fields in stored.items()
+                   if name in last_update and fields.get('last_update', '') >= last_update[name]}
+        data, _ = self._apply_updates(data, updates)
+        return data
+    
+    def _build_state(self, data, version):
+        """Arma un CatalogState completo desde el diccionario del JSON"""
+        epoch = float(julian_epoch(time.time()))
+        catalog = self._select_catalog_rows(data, self.mag_limit)
+        arrays = {category: self._category_arrays(data, category, epoch) for category in CATEGORIES}
+        arrays['catalog'] = self._columnar_arrays(catalog, epoch)
+        # Los nombres solo cambian al recargar el JSON: las demás versiones comparten el índice
+        return CatalogState(version, data, arrays, self._build_objects_dict(data, arrays),
+                            epoch, catalog, self._build_name_index(data))
+    
+    def reload(self):
+        """
+        Vuelve a leer el JSON y publica el resultado como una versión nueva
+        
+        Se reemplaza el estado del mismo cargador (no se crea otro): la versión
+        sigue aumentando y los lectores que comparan versiones ven el cambio.
+        La lectura también va dentro del lock: un publish_updates que llegara
+        entre la lectura y el reemplazo se perdería.
+        
+        Returns:
+            int: versión publicada
+        """
+        with self._write_lock:
+            self._state = self._build_state(self._load_data(), self._state.version + 1)
+            return self._state.version
+    
+    @property
+    def data(self):
+        """Diccionario del catálogo publicado (solo lectura)"""
+        return self._state.data
+    
+    @property
+    def name_index(self):
+        """NameIndex de nombres y alias del JSON publicado"""
+        return self._state.index
+    
+    @property
+    def version(self):
+        """Versión del catálogo publicado (cambia también al re-propagar movimientos propios)"""
+        self.ensure_epoch()
+        return self._state.version
+    
+    def get_state(self):
+        """
+        Retorna el CatalogState actual (lectura atómica, sin lock)
+        
+        Un lector que toma el estado una vez por cuadro o por consulta ve nombres,
+        arrays y objetos de una misma versión aunque otro hilo publique en el medio.
+        """
+        self.ensure_epoch()
+        return self._state
+    
+    def ensure_epoch(self, unix_seconds=None):
+        """
+        Vuelve a propagar los movimientos propios si la época publicada quedó vieja
+        
+        La comprobación es una resta: se puede llamar en cada cuadro. Solo cuando
+        la deriva supera epoch_threshold se recalculan las estrellas (una pasada
+        vectorizada) y se publica una versión nueva.
+        
+        Args:
+            unix_seconds: instante de referencia (None = ahora)
+        
+        Returns:
+            bool: True si se publicó una versión nueva
+        """
+        # Aritmética de floats (sin numpy): esta comprobación corre en cada lectura
+        now = time.time() if unix_seconds is None else float(unix_seconds)
+        epoch = 2000.0 + (now - J2000_UNIX_SECONDS) / (365.25 * 86400)
+        if abs(epoch - self._state.epoch) <= self.epoch_threshold:
+            return False
+        
+        with self._write_lock:
+            state = self._state
+            if abs(epoch - state.epoch) <= self.epoch_threshold:
+                return False
+            columnar_motion = self.columnar is not None and self.columnar.has_proper_motion
+            if not self._has_proper_motion(state.data) and not columnar_motion:
+                # Sin movimientos propios no hay nada que recalcular
+                self._state = state._replace(epoch=epoch)
+                return False
+            arrays = dict(state.arrays, stars=self._category_arrays(state.data, 'stars', epoch))
+            if columnar_motion:
+                arrays['catalog'] = self._columnar_arrays(state.catalog, epoch)
+            self._state = state._replace(version=state.version + 1, arrays=arrays,
+                                         objects=self._build_objects_dict(state.data, arrays),
+                                         epoch=epoch)
+        return True
     
     def _load_json(self):
         """Carga el archivo JSON"""
@@ -35,26 +197,302 @@ class CelestialDataLoader:
             "metadata": {}
         }
     
-    def get_stars(self):
+    def get_stars(self, data=None):
         """Retorna lista de tuplas (nombre, ra_h, dec_deg, size)"""
+        if data is None:
+            data = self.data
         return [(s['name'], s['ra_hours'], s['dec_degrees'], s.get('size', 6)) 
-                for s in self.data.get('stars', [])]
+                for s in data.get('stars', [])]
     
-    def get_galaxies(self):
+    def get_galaxies(self, data=None):
         """Retorna lista de tuplas (nombre, ra_h, dec_deg, size)"""
+        if data is None:
+            data = self.data
         return [(g['name'], g['ra_hours'], g['dec_degrees'], g.get('size', 8)) 
-                for g in self.data.get('galaxies', [])]
+                for g in data.get('galaxies', [])]
     
-    def get_planets(self):
+    def get_planets(self, data=None):
         """Retorna lista de tuplas (nombre, ra_h, dec_deg, size)"""
+        if data is None:
+            data = self.data
         return [(p['name'], p['ra_hours'], p['dec_degrees'], p.get('size', 0.4)) 
-                for p in self.data.get('planets', [])]
+                for p in data.get('planets', [])]
     
-    def get_moon(self):
+    def get_moon(self, data=None):
         """Retorna tupla (ra_h, dec_deg, size)"""
-        moon = self.data.get('moon', {})
+        if data is None:
+            data = self.data
+        moon = data.get('moon', {})
         return (moon.get('ra_hours', 0), moon.get('dec_degrees', 0), moon.get('size', 1.2))
     
+    @staticmethod
+    def _has_proper_motion(data):
+        """Indica si alguna estrella del catálogo trae movimiento propio"""
+        return any('pm_ra_mas' in s or 'pm_dec_mas' in s for s in data.get('stars', []))
+    
+    def _star_arrays(self, data, epoch):
+        """Estrellas propagadas por movimiento propio a una época (una sola pasada)"""
+        stars = data.get('stars', [])
+        default_epoch = data.get('metadata', {}).get('epoch', 2000.0)
+        names = [s['name'] for s in stars]
+        ra_h, dec_deg, vectors = propagate_proper_motion(
+            [s['ra_hours'] for s in stars],
+            [s['dec_degrees'] for s in stars],
+            [s.get('pm_ra_mas', 0.0) for s in stars],
+            [s.get('pm_dec_mas', 0.0) for s in stars],
+            epoch - np.array([s.get('epoch', default_epoch) for s in stars], dtype=np.float64),
+            [s.get('parallax_mas', 0.0) for s in stars],
+            [s.get('radial_velocity_kms', 0.0) for s in stars],
+        )
+        return names, ra_h, dec_deg, vectors.reshape(-1, 3)
+    
+    def _category_arrays(self, data, category, epoch=None):
+        """
+        Arma (nombres, ra_h, dec_deg, vectores unitarios) de una categoría
+        
+        Las estrellas con movimiento propio se propagan a epoch (época juliana;
+        None = la del estado publicado).
+        """
+        if category == 'stars' and self._has_proper_motion(data):
+            return self._star_arrays(data, self._state.epoch if epoch is None else epoch)
+        
+        if category == 'moon':
+            ra, dec, _ = self.get_moon(data)
+            objects = [('Luna', ra, dec, None)]
+        else:
+            getters = {'stars': self.get_stars, 'galaxies': self.get_galaxies, 'planets': self.get_planets}
+            objects = getters[category](data)
+        
+        names = [name for name, _, _, _ in objects]
+        ra_h = np.array([ra for _, ra, _, _ in objects], dtype=np.float64)
+        dec_deg = np.array([dec for _, _, dec, _ in objects], dtype=np.float64)
+        return names, ra_h, dec_deg, equatorial_unit_vectors(ra_h, dec_deg).reshape(-1, 3)
+    
+    def _select_catalog_rows(self, data, mag_limit):
+        """
+        Filas del catálogo columnar a publicar: hasta mag_limit y sin las del JSON
+        
+        El archivo está ordenado por magnitud, así que solo se lee el prefijo.
+        Una estrella del JSON con el mismo nombre reemplaza a la fila del catálogo.
+        
+        Returns:
+            CatalogStars o None si no hay catálogo columnar
+        """
+        if self.columnar is None:
+            return None
+        
+        count = self.columnar.count_brighter(mag_limit)
+        keep = np.ones(count, dtype=bool)
+        for star in data.get('stars', []):
+            # El JSON puede nombrar la estrella distinto que el catálogo ('Sirius' y 'HIP 32349')
+            for name in (star['name'],) + self._aliases(star):
+                index = self.columnar.find(name)
+                if index is not None and index < count:
+                    keep[index] = False
+        
+        rows = np.flatnonzero(keep)
+        return CatalogStars(
+            rows,
+            np.asarray(self.columnar['size'][:count][keep], dtype=np.float32),
+            self.columnar.colors(count)[keep],
+        )
+    
+    def _columnar_arrays(self, catalog, epoch):
+        """(nombres, ra_h, dec_deg, vectores unitarios) de las filas publicadas del catálogo columnar"""
+        if catalog is None:
+            return [], np.zeros(0), np.zeros(0), np.zeros((0, 3))
+        
+        stop = int(catalog.rows[-1]) + 1 if len(catalog.rows) else 0
+        ra_h, dec_deg, vectors = self.columnar.positions(epoch, stop)
+        rows = catalog.rows
+        return self.columnar.row_names(rows), ra_h[rows], dec_deg[rows], vectors[rows]
+    
+    @staticmethod
+    def _aliases(obj):
+        """Alias de un objeto del JSON: los de la tabla y los de su campo 'aliases'"""
+        return tuple(ALIASES.get(obj['name'], ())) + tuple(obj.get('aliases', ()))
+    
+    def _build_name_index(self, data):
+        """Índice de nombres y alias del JSON (Luna y planetas primero, luego estrellas y galaxias)"""
+        objects = ([dict(data.get('moon', {}), name='Luna')] + data.get('planets', [])
+                   + data.get('stars', []) + data.get('galaxies', []))
+        # Los trigramas de la búsqueda aproximada se arman acá, no en la primera consulta
+        return NameIndex.from_names(
+            [obj['name'] for obj in objects],
+            {obj['name']: self._aliases(obj) for obj in objects},
+        ).build_trigrams()
+    
+    def resolve_name(self, name, fuzzy=False):
+        """
+        Nombre canónico de un objeto del JSON (por nombre o alias) o del catálogo columnar
+        
+        Args:
+            name: texto buscado ('sirio', 'α CMa', 'HIP 32349', 'moon'...)
+            fuzzy: si True y no hay coincidencia exacta, acepta el nombre más
+                   parecido del JSON (errores de tipeo)
+        
+        Returns:
+            str: nombre canónico o None
+        """
+        names = self._state.index
+        canonical = names.lookup(name)
+        if canonical is not None:
+            return canonical
+        if self.columnar is not None:
+            index = self.columnar.find(name)
+            if index is not None:
+                return self.columnar.name(index)
+        if fuzzy:
+            return names.resolve(name)
+        return None
+    
+    def suggest_names(self, prefix, limit=8):
+        """
+        Sugerencias para texto a medio escribir: prefijos del JSON (con alias),
+        luego del catálogo columnar (más brillantes primero) y, si faltan,
+        nombres parecidos del JSON
+        
+        Returns:
+            list: nombres canónicos, sin repetir
+        """
+        index = self._state.index
+        names = [name for name, _ in index.complete(prefix, limit)]
+        if self.columnar is not None and len(names) < limit:
+            # Filas reemplazadas por el JSON ('HIP 32349') se sugieren con su nombre del JSON
+            for name, _ in self.columnar.complete(prefix, limit):
+                name = index.lookup(name) or name
+                if name not in names:
+                    names.append(name)
+        if len(names) < limit:
+            names += [name for name, _ in index.fuzzy(prefix, limit, prefix=True)
+                      if name not in names]
+        return names[:limit]
+    
+    def find_object(self, name):
+        """
+        Busca un objeto por nombre o alias en el JSON y luego en el catálogo columnar
+        
+        Returns:
+            dict: objeto con el formato del JSON (posición en la época publicada) o None
+        """
+        state = self.get_state()
+        canonical = state.index.lookup(name)
+        obj = state.objects.get((canonical or name).lower().strip())
+        if obj is not None or self.columnar is None:
+            return obj
+        
+        index = self.columnar.find(name)
+        if index is None:
+            return None
+        return self.columnar.get_object(index, state.epoch)
+    
+    def get_unit_vectors(self, category):
+        """
+        Retorna los vectores unitarios ecuatoriales precalculados de una categoría
+        
+        Args:
+            category: 'stars', 'galaxies', 'planets', 'moon' o 'catalog'
+        
+        Returns:
+            np.ndarray: array (N, 3) en el mismo orden que get_stars/get_galaxies/...
+        """
+        return self._state.arrays[category][3]
+    
+    def get_catalog_arrays(self):
+        """
+        Retorna el catálogo completo como arrays para cálculos vectorizados
+        
+        Returns:
+            tuple: (lista de nombres, array RA en horas, array DEC en grados)
+                   en orden estrellas, galaxias, planetas y Luna
+        """
+        arrays = [self._state.arrays[category] for category in CATEGORIES]
+        names = [name for category_names, _, _, _ in arrays for name in category_names]
+        ra_h = np.concatenate([ra for _, ra, _, _ in arrays])
+        dec_deg = np.concatenate([dec for _, _, dec, _ in arrays])
+        return names, ra_h, dec_deg
+    
+    def publish_updates(self, updates, persist=False):
+        """
+        Publica nuevas coordenadas de forma atómica (copia en escritura)
+        
+        Solo se copian los objetos modificados y se recalculan los arrays de
+        sus categorías; el resto del catálogo se comparte con el estado anterior.
+        
+        Args:
+            updates: dict {nombre: {campo: valor}}, p. ej. {'Luna': {'ra_hours': 5.2}}
+            persist: si True, registra además las posiciones en el estado de
+                     efemérides (escrituras agrupadas; el JSON no se reescribe)
+        
+        Returns:
+            int: versión publicada
+        """
+        now = datetime.now(timezone.utc).isoformat()
+        updates = {name: dict(fields, last_update=now) for name, fields in updates.items()}
+        
+        with self._write_lock:
+            state = self._state
+            data, changed = self._apply_updates(state.data, updates)
+            
+            if not changed:
+                return state.version
+            
+            arrays = dict(state.arrays)
+            for category in changed:
+                arrays[category] = self._category_arrays(data, category, state.epoch)
+            
+            # Un único reemplazo de referencia: los lectores ven el estado viejo o el nuevo
+            self._state = state._replace(version=state.version + 1, data=data, arrays=arrays,
+                                         objects=self._build_objects_dict(data, arrays))
+            
+            # Con el lock: un reload no puede leer el estado persistido sin estas posiciones
+            if persist:
+                self.ephemeris_state.record(updates)
+            return self._state.version
+    
+    @staticmethod
+    def _apply_updates(data, updates):
+        """
+        Copia de data con los campos de updates aplicados (solo se copian los objetos tocados)
+        
+        Returns:
+            tuple: (nuevo data, lista de categorías modificadas)
+        """
+        data = dict(data)
+        changed = []
+        
+        for category in ('stars', 'galaxies', 'planets'):
+            objects = data.get(category, [])
+            if any(obj['name'] in updates for obj in objects):
+                data[category] = [
+                    dict(obj, **updates[obj['name']]) if obj['name'] in updates else obj
+                    for obj in objects
+                ]
+                changed.append(category)
+        
+        if 'Luna' in updates and 'moon' in data:
+            data['moon'] = dict(data['moon'], **updates['Luna'])
+            changed.append('moon')
+        
+        return data, changed
+    
+    def publish_ephemeris(self, ephemeris_data, persist=False):
+        """
+        Publica posiciones de efemérides (formato de calculate_ephemeris)
+        
+        Args:
+            ephemeris_data: dict {'Luna': (ra_h, dec_deg), 'Marte': (...), ...}
+            persist: si True, registra además las posiciones en el estado de efemérides
+        
+        Returns:
+            int: versión publicada
+        """
+        updates = {
+            name: {'ra_hours': float(ra), 'dec_degrees': float(dec)}
+            for name, (ra, dec) in ephemeris_data.items()
+        }
+        return self.publish_updates(updates, persist)
+    
     def update_planets(self, planets_dict):
         """
         Actualiza las coordenadas de los planetas
@@ -62,56 +500,54 @@ class CelestialDataLoader:
         Args:
             planets_dict: dict con formato {'Mercurio': (ra_h, dec_deg, size), ...}
         """
-        for planet in self.data.get('planets', []):
-            name = planet['name']
-            if name in planets_dict:
-                ra, dec, size = planets_dict[name]
-                planet['ra_hours'] = ra
-                planet['dec_degrees'] = dec
-                planet['size'] = size
-                planet['last_update'] = datetime.now(timezone.utc).isoformat()
-        
-        self._save_json()
+        updates = {
+            name: {'ra_hours': ra, 'dec_degrees': dec, 'size': size}
+            for name, (ra, dec, size) in planets_dict.items()
+        }
+        self.publish_updates(updates, persist=True)
     
     def update_moon(self, ra_hours, dec_degrees, size):
         """Actualiza las coordenadas de la Luna"""
-        self.data['moon']['ra_hours'] = ra_hours
-        self.data['moon']['dec_degrees'] = dec_degrees
-        self.data['moon']['size'] = size
-        self.data['moon']['last_update'] = datetime.now(timezone.utc).isoformat()
-        
-        self._save_json()
+        updates = {'Luna': {'ra_hours': ra_hours, 'dec_degrees': dec_degrees, 'size': size}}
+        self.publish_updates(updates, persist=True)
     
-    def _save_json(self):
-        """Guarda los datos al archivo JSON"""
-        try:
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(self.data, f, indent=2, ensure_ascii=False)
-            return True
-        except Exception as e:
-            print(f"ERROR guardando {self.json_file}: {e}")
-            return False
-    
-    def get_all_objects_dict(self):
+    def _build_objects_dict(self, data, arrays):
         """
-        Retorna diccionario con todos los objetos para busqueda
-        Las claves son nombres en minusculas, valores son diccionarios completos
+        Arma el diccionario de búsqueda (nombre en minúsculas → objeto) de un estado
+        
+        Las estrellas con movimiento propio se copian con la posición propagada
+        de arrays, así el tracker apunta a la posición de la época actual.
         """
         objects = {}
         
         for category in ['stars', 'galaxies', 'planets']:
-            for obj in self.data.get(category, []):
+            for obj in data.get(category, []):
                 name = obj['name'].lower()
                 objects[name] = obj  # Almacenar el diccionario completo
         
-        # Manejar la Luna
-        moon = self.data.get('moon', {})
-        moon['name'] = 'luna'
+        if self._has_proper_motion(data):
+            _, ra_h, dec_deg, _ = arrays['stars']
+            for obj, ra, dec in zip(data['stars'], ra_h.tolist(), dec_deg.tolist()):
+                if 'pm_ra_mas' in obj or 'pm_dec_mas' in obj:
+                    objects[obj['name'].lower()] = dict(obj, ra_hours=ra, dec_degrees=dec)
+        
+        # Manejar la Luna (copia: el estado publicado no se modifica)
+        moon = dict(data.get('moon', {}), name='luna')
         objects['luna'] = moon
         objects['moon'] = moon
         
         return objects
     
+    def get_all_objects_dict(self):
+        """
+        Retorna diccionario con todos los objetos para busqueda
+        Las claves son nombres en minusculas, valores son diccionarios completos
+        
+        El diccionario pertenece al estado publicado: no modificarlo.
+        """
+        self.ensure_epoch()
+        return self._state.objects
+    
     def get_object_list_text(self):
         """Retorna texto con la lista de objetos disponibles"""
         stars = ", ".join([name for name, _, _, _ in self.get_stars()])
@@ -136,15 +572,78 @@ def get_all_celestial_objects():
     return _loader.get_all_objects_dict()
 
 
+def find_celestial_object(name):
+    """Retorna el objeto (JSON o catálogo columnar) con ese nombre, o None"""
+    return _loader.find_object(name)
+
+
+def resolve_object_name(name, fuzzy=False):
+    """Retorna el nombre canónico (acepta alias y, con fuzzy, errores de tipeo) o None"""
+    return _loader.resolve_name(name, fuzzy)
+
+
+def suggest_object_names(prefix, limit=8):
+    """Retorna sugerencias de nombres para un texto a medio escribir"""
+    return _loader.suggest_names(prefix, limit)
+
+
+def get_catalog_state():
+    """Retorna el CatalogState publicado actualmente"""
+    return _loader.get_state()
+
+
+def get_catalog_version():
+    """Retorna la versión del catálogo publicado (cambia con cada actualización)"""
+    return _loader.version
+
+
+def publish_ephemeris(ephemeris_data, persist=False):
+    """Publica posiciones de efemérides en el catálogo en vivo"""
+    return _loader.publish_ephemeris(ephemeris_data, persist)
+
+
+def save_ephemeris_state(ephemeris_data):
+    """
+    Publica posiciones de efemérides y las escribe ya en el estado persistido
+    
+    Usa el EphemerisStateStore del cargador (el mismo lock y el mismo archivo
+    que las actualizaciones en vivo), sin esperar el intervalo entre escrituras.
+    
+    Args:
+        ephemeris_data: dict {'Luna': (ra_h, dec_deg), 'Marte': (...), ...}
+    
+    Returns:
+        bool: True si se guardó
+    """
+    store = _loader.ephemeris_state
+    if not store.path:
+        print("ERROR: EPHEMERIS_STATE_FILE no está configurado")
+        return False
+    writes = store.writes
+    _loader.publish_ephemeris(ephemeris_data, persist=True)
+    store.flush()
+    return store.writes > writes
+
+
+def get_unit_vectors(category):
+    """Retorna los vectores unitarios ecuatoriales precalculados de una categoría"""
+    return _loader.get_unit_vectors(category)
+
+
+def get_catalog_arrays():
+    """Retorna (nombres, ra_h, dec_deg) del catálogo completo como arrays"""
+    return _loader.get_catalog_arrays()
+
+
 def get_object_list_text():
     """Retorna el texto con la lista de objetos disponibles"""
     return _loader.get_object_list_text()
 
 
 def reload_data():
-    """Recarga los datos desde el JSON"""
-    global _loader, REAL_STARS, GALAXIES, PLANETS, MOON_RA_DEC
-    _loader = CelestialDataLoader()
+    """Recarga los datos desde el JSON (publica una versión nueva del mismo cargador)"""
+    global REAL_STARS, GALAXIES, PLANETS, MOON_RA_DEC
+    _loader.reload()
     REAL_STARS = _loader.get_stars()
     GALAXIES = _loader.get_galaxies()
     PLANETS = _loader.get_planets()
@@ -0,0 +1,419 @@
+# columnar_catalog.py
+"""
+Catálogo de estrellas en formato columnar binario (un .npy por columna)
+
+Pensado para catálogos de 10⁵–10⁶ estrellas (Hipparcos, Tycho-2), donde el
+JSON no escala. Cada columna se abre con np.load(mmap_mode='r') (un np.memmap):
+abrir el catálogo solo lee las cabeceras y el sistema operativo carga las
+páginas a medida que se tocan. Las filas se guardan ordenadas por magnitud,
+así un límite de magnitud es un prefijo del archivo y el resto nunca se lee.
+
+Estructura de la carpeta:
+    catalog.json       metadatos (formato, filas, época, origen, columnas)
+    ra_hours.npy       float64 (N,)
+    dec_degrees.npy    float64 (N,)
+    mag.npy            float32 (N,)
+    color.npy          uint8 (N, 3), RGB 0-255
+    size.npy           float32 (N,), tamaño de punto
+    names.npy          uint8, nombres UTF-8 concatenados (tabla de strings)
+    name_offsets.npy   int64 (N + 1,), inicio de cada nombre en names.npy
+    name_order.npy     int64 (N,), filas ordenadas por nombre en minúsculas
+    pm_ra_mas.npy ...  opcionales: pm_ra_mas, pm_dec_mas, parallax_mas, radial_velocity_kms
+"""
+import json
+import os
+from collections.abc import Sequence
+import numpy as np
+from shared.calculations.astronomy import equatorial_unit_vectors, propagate_proper_motion
+
+FORMAT_VERSION = 1
+META_FILE = 'catalog.json'
+
+# Columnas obligatorias y su tipo en disco
+COLUMNS = {
+    'ra_hours': np.float64,
+    'dec_degrees': np.float64,
+    'mag': np.float32,
+    'color': np.uint8,
+    'size': np.float32,
+}
+
+# Columnas de movimiento propio (todas o ninguna)
+MOTION_COLUMNS = {
+    'pm_ra_mas': np.float32,
+    'pm_dec_mas': np.float32,
+    'parallax_mas': np.float32,
+    'radial_velocity_kms': np.float32,
+}
+
+
+def _column_path(path, column):
+    return os.path.join(path, column + '.npy')
+
+
+def _save_column(path, column, values):
+    """Guarda una columna (archivo temporal + rename)"""
+    tmp_path = _column_path(path, column) + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        np.save(f, values)
+    os.replace(tmp_path, _column_path(path, column))
+
+
+def encode_names(names):
+    """
+    Arma la tabla de strings de una lista de nombres
+
+    Returns:
+        tuple: (blob uint8 con los nombres UTF-8 concatenados, offsets int64 (N + 1,))
+    """
+    encoded = [name.encode('utf-8') for name in names]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(name) for name in encoded], out=offsets[1:])
+    return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+
+class ColumnarCatalogWriter:
+    """
+    Escribe un catálogo columnar por bloques
+
+    Cada bloque se agrega a archivos crudos temporales (uno por columna), así
+    la memoria depende del bloque y no del catálogo. close() ordena por
+    magnitud y arma los .npy finales columna por columna.
+    """
+
+    def __init__(self, path, motion=False, epoch=2000.0, source=''):
+        """
+        Args:
+            path: carpeta destino (se crea si no existe)
+            motion: si True, se escriben las columnas de movimiento propio
+            epoch: época juliana de las posiciones
+            source: descripción del origen de los datos
+        """
+        self.path = path
+        self.epoch = float(epoch)
+        self.source = source
+        self.dtypes = dict(COLUMNS, **(MOTION_COLUMNS if motion else {}))
+        self.rows = 0
+        os.makedirs(path, exist_ok=True)
+        self._parts = {
+            column: open(self._part_path(column), 'wb')
+            for column in list(self.dtypes) + ['names', 'name_lengths']
+        }
+
+    def _part_path(self, column):
+        return os.path.join(self.path, column + '.part')
+
+    def append(self, names, ra_hours, dec_degrees, mag, color, size, motion=None):
+        """
+        Agrega un bloque de filas
+
+        Args:
+            names: lista de N nombres
+            ra_hours, dec_degrees, mag, size: arrays (N,)
+            color: array (N, 3) RGB, en 0-1 (float) o 0-255 (uint8)
+            motion: dict opcional {'pm_ra_mas': ..., 'pm_dec_mas': ..., 'parallax_mas': ...,
+                    'radial_velocity_kms': ...}; las columnas ausentes valen 0
+        """
+        count = len(names)
+        color = np.asarray(color)
+        if color.dtype != np.uint8:
+            color = np.clip(np.rint(color * 255), 0, 255).astype(np.uint8)
+
+        columns = {
+            'ra_hours': ra_hours, 'dec_degrees': dec_degrees, 'mag': mag,
+            'color': color.reshape(-1, 3), 'size': size,
+        }
+        motion = motion or {}
+        for column in self.dtypes:
+            values = motion.get(column, 0.0) if column in MOTION_COLUMNS else columns[column]
+            shape = (count, 3) if column == 'color' else (count,)
+            values = np.broadcast_to(np.asarray(values, dtype=self.dtypes[column]), shape)
+            self._parts[column].write(np.ascontiguousarray(values).tobytes())
+
+        blob, offsets = encode_names(names)
+        self._parts['names'].write(blob.tobytes())
+        self._parts['name_lengths'].write(np.diff(offsets).tobytes())
+        self.rows += count
+
+    def close(self, chunk_size=1000000):
+        """
+        Ordena por magnitud y escribe las columnas finales y los metadatos
+
+        Args:
+            chunk_size: filas por bloque al reordenar la tabla de nombres
+
+        Returns:
+            int: filas escritas
+        """
+        for f in self._parts.values():
+            f.close()
+
+        n = self.rows
+        mag = np.fromfile(self._part_path('mag'), dtype=np.float32)
+        order = np.argsort(np.where(np.isnan(mag), np.inf, mag), kind='stable')
+        del mag
+
+        for column, dtype in self.dtypes.items():
+            shape = (n, 3) if column == 'color' else (n,)
+            part = np.fromfile(self._part_path(column), dtype=dtype).reshape(shape)
+            _save_column(self.path, column, part[order])
+            del part
+
+        # Tabla de nombres en el nuevo orden, por bloques de filas
+        lengths = np.fromfile(self._part_path('name_lengths'), dtype=np.int64)
+        old_offsets = np.concatenate(([0], np.cumsum(lengths)))
+        offsets = np.concatenate(([0], np.cumsum(lengths[order])))
+        blob_in = np.memmap(self._part_path('names'), dtype=np.uint8, mode='r') \
+            if offsets[-1] else np.zeros(0, dtype=np.uint8)
+        blob = np.empty(offsets[-1], dtype=np.uint8)
+        keys = []
+        for start in range(0, n, chunk_size):
+            rows = order[start:start + chunk_size]
+            row_lengths = lengths[rows]
+            first, last = offsets[start], offsets[start + len(rows)]
+            # Índice de cada byte de salida en el blob de entrada
+            shift = np.repeat(old_offsets[rows] - offsets[start:start + len(rows)], row_lengths)
+            blob[first:last] = blob_in[np.arange(first, last) + shift]
+            chunk = blob[first:last].tobytes()
+            bounds = (offsets[start:start + len(rows) + 1] - first).tolist()
+            keys.append(np.array([chunk[a:b].decode('utf-8').lower().encode('utf-8')
+                                  for a, b in zip(bounds[:-1], bounds[1:])], dtype=bytes))
+        del blob_in
+
+        # Orden por nombre en minúsculas: bytes UTF-8 ordenan igual que los códigos
+        name_order = np.argsort(np.concatenate(keys), kind='stable') if keys else np.zeros(0)
+        _save_column(self.path, 'names', blob)
+        _save_column(self.path, 'name_offsets', offsets.astype(np.int64))
+        _save_column(self.path, 'name_order', name_order.astype(np.int64))
+
+        meta = {
+            'format': FORMAT_VERSION,
+            'rows': n,
+            'epoch': self.epoch,
+            'source': self.source,
+            'columns': list(self.dtypes),
+        }
+        with open(os.path.join(self.path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2, ensure_ascii=False)
+
+        self._remove_parts()
+        return n
+
+    def abort(self):
+        """Descarta lo escrito (los .npy de un catálogo anterior no se tocan)"""
+        for f in self._parts.values():
+            f.close()
+        self._remove_parts()
+
+    def _remove_parts(self):
+        for column in self._parts:
+            if os.path.exists(self._part_path(column)):
+                os.remove(self._part_path(column))
+
+
+def write_columnar_catalog(path, ra_hours, dec_degrees, mag, color, size, names,
+                           motion=None, epoch=2000.0, source=''):
+    """
+    Escribe un catálogo columnar completo de una vez (ordena las filas por magnitud)
+
+    Args:
+        path: carpeta destino (se crea si no existe)
+        ra_hours, dec_degrees, mag, size: arrays (N,)
+        color: array (N, 3) RGB, en 0-1 (float) o 0-255 (uint8)
+        names: lista de N nombres
+        motion: dict opcional {'pm_ra_mas': ..., 'pm_dec_mas': ..., 'parallax_mas': ...,
+                'radial_velocity_kms': ...}; las columnas ausentes valen 0
+        epoch: época juliana de las posiciones
+        source: descripción del origen de los datos
+
+    Returns:
+        int: filas escritas
+    """
+    writer = ColumnarCatalogWriter(path, motion=bool(motion), epoch=epoch, source=source)
+    writer.append(names, ra_hours, dec_degrees, mag, color, size, motion)
+    return writer.close()
+
+
+class RowNames(Sequence):
+    """Nombres de un subconjunto de filas, decodificados recién al leerlos"""
+
+    def __init__(self, catalog, rows):
+        self._catalog = catalog
+        self._rows = rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._catalog.name(int(row)) for row in self._rows[i]]
+        return self._catalog.name(int(self._rows[i]))
+
+
+class ColumnarCatalog:
+    """Catálogo columnar abierto como memmap (solo lectura)"""
+
+    def __init__(self, path):
+        """
+        Args:
+            path: carpeta del catálogo (ver write_columnar_catalog)
+        """
+        self.path = path
+        with open(os.path.join(path, META_FILE), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+        if self.meta.get('format') != FORMAT_VERSION:
+            raise ValueError(f"formato {self.meta.get('format')} no soportado")
+
+        self.epoch = float(self.meta.get('epoch', 2000.0))
+        self.columns = {
+            column: np.load(_column_path(path, column), mmap_mode='r')
+            for column in self.meta['columns']
+        }
+        self._names = np.load(_column_path(path, 'names'), mmap_mode='r')
+        self._offsets = np.load(_column_path(path, 'name_offsets'), mmap_mode='r')
+        self._order = np.load(_column_path(path, 'name_order'), mmap_mode='r')
+
+    @classmethod
+    def open(cls, path):
+        """
+        Abre un catálogo columnar
+
+        Returns:
+            ColumnarCatalog o None si la carpeta no existe o es inválida
+        """
+        if not path or not os.path.exists(os.path.join(path, META_FILE)):
+            return None
+        try:
+            catalog = cls(path)
+        except Exception as e:
+            print(f"ERROR abriendo el catálogo columnar {path}: {e}")
+            return None
+        print(f"Catálogo columnar: {len(catalog)} estrellas desde {path}")
+        return catalog
+
+    def __len__(self):
+        return len(self._order)
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    @property
+    def has_proper_motion(self):
+        return 'pm_ra_mas' in self.columns
+
+    def name(self, index):
+        """Nombre de una fila"""
+        start, stop = self._offsets[index], self._offsets[index + 1]
+        return self._names[start:stop].tobytes().decode('utf-8')
+
+    def names(self, stop=None):
+        """Nombres de las primeras stop filas (None = todas)"""
+        stop = len(self) if stop is None else stop
+        offsets = self._offsets[:stop + 1].tolist()
+        blob = self._names[:offsets[-1]].tobytes()
+        return [blob[a:b].decode('utf-8') for a, b in zip(offsets[:-1], offsets[1:])]
+
+    def row_names(self, rows):
+        """Secuencia perezosa con los nombres de las filas indicadas"""
+        return RowNames(self, rows)
+
+    def _bisect(self, key, lo=0):
+        """Primera posición de name_order cuyo nombre en minúsculas no es menor que key"""
+        hi = len(self._order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.name(int(self._order[mid])).lower() < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, name):
+        """
+        Busca una fila por nombre (sin distinguir mayúsculas)
+
+        Búsqueda binaria sobre name_order: O(log N) sin armar ningún índice en memoria.
+
+        Returns:
+            int: índice de la fila o None si no existe
+        """
+        key = name.lower().strip()
+        lo = self._bisect(key)
+        if lo < len(self._order):
+            index = int(self._order[lo])
+            if self.name(index).lower() == key:
+                return index
+        return None
+
+    def complete(self, prefix, limit=8):
+        """
+        Nombres que empiezan con prefix, de la estrella más brillante a la más débil
+
+        Los nombres con el prefijo son un rango contiguo de name_order; como las
+        filas están ordenadas por magnitud, las más brillantes son los índices menores.
+
+        Returns:
+            list: tuplas (nombre, fila)
+        """
+        key = prefix.lower().strip()
+        if not key:
+            return []
+        lo = self._bisect(key)
+        hi = self._bisect(key + '\uffff', lo)
+        rows = np.asarray(self._order[lo:hi])
+        if len(rows) > limit:
+            rows = np.partition(rows, limit - 1)[:limit]
+        return [(self.name(row), row) for row in np.sort(rows).tolist()]
+
+    def count_brighter(self, mag_limit):
+        """Filas con magnitud <= mag_limit (son un prefijo: el archivo está ordenado)"""
+        if mag_limit is None:
+            return len(self)
+        return int(np.searchsorted(self.columns['mag'], mag_limit, side='right'))
+
+    def positions(self, epoch=None, stop=None, start=0):
+        """
+        RA/DEC y vectores unitarios de las filas start:stop
+
+        Args:
+            epoch: época juliana a la que propagar los movimientos propios (None = la del catálogo)
+            stop: fila final, exclusiva (None = todas)
+            start: primera fila
+
+        Returns:
+            tuple: (ra_h (N,), dec_deg (N,), vectores unitarios (N, 3)) en float64
+        """
+        rows = slice(start, len(self) if stop is None else stop)
+        ra_h = np.asarray(self.columns['ra_hours'][rows], dtype=np.float64)
+        dec_deg = np.asarray(self.columns['dec_degrees'][rows], dtype=np.float64)
+        if epoch is None or not self.has_proper_motion:
+            return ra_h, dec_deg, equatorial_unit_vectors(ra_h, dec_deg).reshape(-1, 3)
+
+        ra_h, dec_deg, vectors = propagate_proper_motion(
+            ra_h, dec_deg,
+            self.columns['pm_ra_mas'][rows], self.columns['pm_dec_mas'][rows],
+            epoch - self.epoch,
+            self.columns['parallax_mas'][rows], self.columns['radial_velocity_kms'][rows],
+        )
+        return ra_h, dec_deg, vectors.reshape(-1, 3)
+
+    def colors(self, stop=None):
+        """Colores RGB en 0-1 (float32) de las primeras stop filas"""
+        return self.columns['color'][:stop].astype(np.float32) / 255.0
+
+    def get_object(self, index, epoch=None):
+        """
+        Una fila con el formato de los objetos del JSON
+
+        Returns:
+            dict: name, ra_hours, dec_degrees, size, color, mag (posición propagada a epoch)
+        """
+        ra_h, dec_deg, _ = self.positions(epoch, index + 1, start=index)
+        return {
+            'name': self.name(index),
+            'ra_hours': float(ra_h[0]),
+            'dec_degrees': float(dec_deg[0]),
+            'size': float(self.columns['size'][index]),
+            'color': (self.columns['color'][index] / 255.0).tolist(),
+            'mag': float(self.columns['mag'][index]),
+        }
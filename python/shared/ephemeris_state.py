@@ -0,0 +1,144 @@
+# ephemeris_state.py
+"""
+Estado mutable de efemérides, separado del catálogo estático
+
+celestial_data.json queda como catálogo (nombres, colores, tamaños, posiciones
+de referencia) y ya no se reescribe en cada recálculo. Las últimas posiciones
+de la Luna, los planetas y el Sol van a un archivo chico aparte, escrito con
+archivo temporal + rename (nunca queda a medio escribir) y como mucho una vez
+por intervalo: las actualizaciones intermedias se agrupan en memoria y se
+escriben juntas. Al cargar, el catálogo aplica este estado encima del JSON.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from config import EPHEMERIS_STATE_FILE, EPHEMERIS_STATE_INTERVAL
+
+FORMAT_VERSION = 1
+
+
+def write_json_atomic(path, data, indent=None):
+    """
+    Escribe un JSON con archivo temporal + fsync + rename
+
+    Un corte en medio de la escritura deja el archivo anterior intacto.
+
+    Args:
+        path: archivo destino
+        data: objeto serializable
+        indent: sangría del JSON (None = compacto)
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=indent, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class EphemerisStateStore:
+    """Últimas posiciones publicadas por objeto, con escrituras agrupadas y atómicas"""
+
+    def __init__(self, path=EPHEMERIS_STATE_FILE, interval=EPHEMERIS_STATE_INTERVAL):
+        """
+        Args:
+            path: archivo del estado (None = no persistir)
+            interval: segundos mínimos entre escrituras
+        """
+        self.path = path
+        self.interval = interval
+        self._objects = {}  # nombre → campos actualizados ({'ra_hours': ..., 'last_update': ...})
+        self._dirty = False
+        self._last_write = None  # time.monotonic() de la última escritura
+        self._timer = None
+        self._lock = threading.Lock()
+        self.writes = 0
+        if path:
+            # Lo pendiente se escribe al salir
+            atexit.register(self.flush)
+
+    def load(self):
+        """
+        Lee el estado persistido (ignora un archivo ausente o inválido)
+
+        Returns:
+            dict: {nombre: {campo: valor}} listo para publish_updates
+        """
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+            if stored.get('format') != FORMAT_VERSION:
+                print(f"WARNING: {self.path} tiene un formato desconocido, se ignora")
+                return {}
+            objects = stored.get('objects', {})
+        except Exception as e:
+            print(f"WARNING: no se pudo leer el estado de efemérides {self.path}: {e}")
+            return {}
+
+        with self._lock:
+            # Lo que ya se registró en esta sesión es más nuevo que el archivo
+            self._objects = dict(objects, **self._objects)
+            return {name: dict(fields) for name, fields in self._objects.items()}
+
+    def record(self, updates):
+        """
+        Registra posiciones nuevas y agenda la escritura
+
+        Si pasó el intervalo desde la última escritura se escribe ya; si no, un
+        temporizador escribe una sola vez al cumplirse, con todo lo acumulado.
+
+        Args:
+            updates: dict {nombre: {campo: valor}}
+        """
+        if not self.path:
+            return
+        with self._lock:
+            for name, fields in updates.items():
+                self._objects[name] = dict(self._objects.get(name, {}), **fields)
+            self._dirty = True
+            if self._timer is not None:
+                return
+            if self._last_write is not None:
+                wait = self.interval - (time.monotonic() - self._last_write)
+                if wait > 0:
+                    self._timer = threading.Timer(wait, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+                    return
+        self.flush()
+
+    def flush(self):
+        """
+        Escribe ahora lo pendiente (no hace nada si no hay cambios)
+
+        Returns:
+            bool: True si se escribió el archivo
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty or not self.path:
+                return False
+            # El archivo es chico (~1 KB): se escribe con el lock para no
+            # pisar un estado nuevo con uno viejo desde otro hilo
+            state = {
+                'format': FORMAT_VERSION,
+                'updated': datetime.now(timezone.utc).isoformat(),
+                'objects': self._objects,
+            }
+            try:
+                write_json_atomic(self.path, state)
+            except Exception as e:
+                print(f"WARNING: no se pudo guardar el estado de efemérides {self.path}: {e}")
+                return False
+            self._dirty = False
+            self._last_write = time.monotonic()
+            self.writes += 1
+            return True
+
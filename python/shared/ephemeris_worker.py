@@ -0,0 +1,283 @@
+# ephemeris_worker.py
+"""
+Recálculo periódico de Sol, Luna y planetas en segundo plano
+
+El hilo calcula las posiciones fuera del bucle de render y del serial, y las
+publica en el catálogo en vivo con un único reemplazo atómico. CoordinateCache,
+ObjectTracker y Server detectan el cambio por la versión del catálogo.
+
+Cada cuerpo tiene su propio intervalo: se estima su velocidad angular aparente
+y se lo recalcula justo antes de que su posición publicada supere el error de
+apuntado permitido.
+
+Si se le asigna un catálogo de cuerpos menores, el mismo hilo lo vuelve a
+propagar completo cada MINOR_BODIES_REFRESH_INTERVAL segundos.
+"""
+import threading
+import time
+import numpy as np
+from datetime import datetime, timezone
+from shared.calculations.astronomy import equatorial_unit_vectors
+from config import (
+    EPHEMERIS_TABLE_FILE, EPHEMERIS_REFRESH_INTERVAL,
+    EPHEMERIS_ERROR_BUDGET, EPHEMERIS_MIN_INTERVAL, MINOR_BODIES_REFRESH_INTERVAL,
+    EPHEMERIS_ANALYTIC_FALLBACK
+)
+
+# Separación entre las dos evaluaciones usadas para estimar la velocidad angular
+RATE_PROBE_SECONDS = 60.0
+
+
+def angular_rates(ra_h, dec_deg, dt):
+    """
+    Velocidad angular aparente a partir de dos posiciones por cuerpo
+
+    Args:
+        ra_h, dec_deg: arrays (B, 2) con la posición en t y en t + dt
+        dt: separación en segundos
+
+    Returns:
+        np.ndarray: array (B,) en segundos de arco por segundo
+    """
+    v = equatorial_unit_vectors(ra_h, dec_deg)
+    cross = np.linalg.norm(np.cross(v[:, 0], v[:, 1]), axis=-1)
+    dot = np.sum(v[:, 0] * v[:, 1], axis=-1)
+    return np.degrees(np.arctan2(cross, dot)) * 3600 / dt
+
+
+class RefreshScheduler:
+    """Decide qué cuerpos recalcular según su velocidad angular y el error permitido"""
+
+    def __init__(self, bodies, error_budget=EPHEMERIS_ERROR_BUDGET,
+                 min_interval=EPHEMERIS_MIN_INTERVAL, max_interval=EPHEMERIS_REFRESH_INTERVAL):
+        """
+        Args:
+            bodies: nombres de los cuerpos a planificar
+            error_budget: error de posición tolerado en segundos de arco
+            min_interval, max_interval: límites del intervalo de cada cuerpo en segundos
+        """
+        self.error_budget = error_budget
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.rates = {name: None for name in bodies}   # segundos de arco por segundo
+        self.next_due = {name: 0.0 for name in bodies}  # reloj monotónico; 0 = ya
+
+    def interval(self, name):
+        """Segundos hasta que el cuerpo acumule el error permitido"""
+        rate = self.rates[name]
+        if not rate:
+            return self.max_interval
+        return min(max(self.error_budget / rate, self.min_interval), self.max_interval)
+
+    def due(self, now):
+        """Cuerpos cuyo recálculo está vencido"""
+        return [name for name, t in self.next_due.items() if t <= now]
+
+    def record(self, name, rate, now):
+        """Registra un recálculo y programa el siguiente"""
+        self.rates[name] = rate
+        self.next_due[name] = now + self.interval(name)
+
+    def postpone(self, names, now, delay=None):
+        """Reprograma cuerpos cuyo cálculo falló (sin red, fuera de rango...)"""
+        for name in names:
+            self.next_due[name] = now + (self.max_interval if delay is None else delay)
+
+    def seconds_until_next(self, now):
+        """Tiempo de espera hasta el próximo cuerpo vencido"""
+        return max(0.0, min(self.next_due.values()) - now)
+
+    def summary(self):
+        """Dict nombre → (velocidad en grados/hora, intervalo en segundos)"""
+        # Segundos de arco por segundo equivalen numéricamente a grados por hora
+        return {name: (rate, self.interval(name)) for name, rate in self.rates.items()}
+
+
+class EphemerisWorker:
+    """Hilo que recalcula las efemérides de cada cuerpo cuando lo necesita y las publica"""
+
+    def __init__(self, location_lat=-32.4833, location_lon=-58.229561,
+                 table_file=EPHEMERIS_TABLE_FILE, persist=True, scheduler=None,
+                 minor_bodies=None, minor_interval=MINOR_BODIES_REFRESH_INTERVAL):
+        """
+        Args:
+            location_lat, location_lon: ubicación del observador en grados
+                (la misma del cálculo de inicio y de las tablas precalculadas)
+            table_file: tablas de Chebyshev precalculadas (None = solo skyfield)
+            persist: si True, las publicaciones se registran en el estado de
+                efemérides (como mucho una escritura por EPHEMERIS_STATE_INTERVAL)
+            scheduler: RefreshScheduler (por defecto, uno con los valores de config)
+            minor_bodies: MinorBodyCatalog a propagar en segundo plano (opcional)
+            minor_interval: segundos entre propagaciones del catálogo de cuerpos menores
+        """
+        from shared.calculations.ephemeris_calculator import EPHEMERIS_BODIES
+
+        self.location_lat = location_lat
+        self.location_lon = location_lon
+        self.table_file = table_file
+        self.persist = persist
+        self.scheduler = scheduler or RefreshScheduler(EPHEMERIS_BODIES)
+        self.minor_bodies = minor_bodies
+        self.minor_interval = minor_interval
+        self._minor_due = 0.0
+        self.running = False
+        self.thread = None
+        self._stop_event = threading.Event()
+        self._table = None
+        self._table_loaded = False
+        self.last_update = None  # (datetime UTC, fuente, versión publicada)
+
+    def start(self):
+        """Inicia el hilo de recálculo (daemon: no impide cerrar la aplicación)"""
+        if self.running:
+            return
+        self.running = True
+        self._stop_event.clear()
+        # Los cuerpos menores se propagan apenas arranca el hilo: el renderer
+        # no dibuja ninguno hasta tener el primer snapshot
+        self._minor_due = 0.0
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        print(f"[Efemérides] Recálculo adaptativo en segundo plano "
+              f"(error máx. {self.scheduler.error_budget:.0f}\")")
+
+    def stop(self):
+        """Detiene el hilo y espera a que termine el cálculo en curso"""
+        if not self.running:
+            return
+        self.running = False
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=5.0)
+
+    def _loop(self):
+        """Bucle del hilo: duerme hasta el próximo cuerpo vencido (interrumpible) y lo recalcula"""
+        while not self._stop_event.wait(self._seconds_until_next()):
+            if self.minor_bodies is not None and self._minor_due <= time.monotonic():
+                self.refresh_minor_bodies()
+            
+            due = self.scheduler.due(time.monotonic())
+            if not due:
+                continue
+            try:
+                version = self.refresh(names=due)
+            except Exception as e:
+                print(f"[Efemérides] Error al recalcular: {e}")
+                version = None
+            if version is None:
+                self.scheduler.postpone(due, time.monotonic())
+
+    def _seconds_until_next(self):
+        """Espera hasta el próximo cuerpo vencido o la próxima propagación de cuerpos menores"""
+        now = time.monotonic()
+        wait = self.scheduler.seconds_until_next(now)
+        if self.minor_bodies is not None:
+            wait = min(wait, max(0.0, self._minor_due - now))
+        return wait
+
+    def refresh_minor_bodies(self, unix_seconds=None):
+        """
+        Propaga el catálogo de cuerpos menores y programa la próxima propagación
+
+        Returns:
+            bool: True si se propagó correctamente
+        """
+        self._minor_due = time.monotonic() + self.minor_interval
+        t0 = time.perf_counter()
+        try:
+            self.minor_bodies.refresh(time.time() if unix_seconds is None else unix_seconds)
+        except Exception as e:
+            print(f"[Efemérides] Error al propagar cuerpos menores: {e}")
+            return False
+        print(f"[Efemérides] {len(self.minor_bodies)} cuerpos menores propagados "
+              f"({(time.perf_counter() - t0)*1000:.0f} ms)")
+        return True
+
+    def _get_table(self):
+        """Abre las tablas precalculadas una sola vez"""
+        if not self._table_loaded:
+            from shared.calculations.ephemeris_tables import EphemerisTable
+            self._table = EphemerisTable.load(self.table_file)
+            self._table_loaded = True
+        return self._table
+
+    def compute(self, date=None, names=None):
+        """
+        Calcula posiciones y velocidades angulares para un instante
+
+        Args:
+            date: datetime UTC (None = ahora)
+            names: cuerpos a calcular (None = todos)
+
+        Returns:
+            tuple: (dict {'Luna': (ra_h, dec_deg), ...} o None,
+                    dict {'Luna': segundos de arco por segundo, ...},
+                    fuente 'tabla'/'skyfield'/'analítica')
+        """
+        from shared.calculations.ephemeris_calculator import (
+            EPHEMERIS_BODIES, calculate_ephemeris_batch
+        )
+
+        if date is None:
+            date = datetime.now(timezone.utc)
+        if names is None:
+            names = list(EPHEMERIS_BODIES)
+        times = np.array([date.timestamp(), date.timestamp() + RATE_PROBE_SECONDS])
+
+        table = self._get_table()
+        if (table is not None and table.covers(times[-1])
+                and table.matches_site(self.location_lat, self.location_lon)):
+            source = 'tabla'
+            radec = [table.radec(name, times)[:2] for name in names]
+            ra_h = np.array([ra for ra, _ in radec])
+            dec_deg = np.array([dec for _, dec in radec])
+        else:
+            source = 'skyfield'
+            batch = calculate_ephemeris_batch(
+                times, self.location_lat, self.location_lon,
+                bodies={name: EPHEMERIS_BODIES[name] for name in names}
+            )
+            if batch is None and EPHEMERIS_ANALYTIC_FALLBACK:
+                from shared.calculations.analytic_ephemeris import analytic_ephemeris_batch
+                source = 'analítica'
+                batch = analytic_ephemeris_batch(times, self.location_lat, self.location_lon, names)
+            if batch is None:
+                return None, {}, source
+            ra_h, dec_deg = batch['ra_hours'], batch['dec_degrees']
+
+        positions = {name: (float(ra_h[i, 0]), float(dec_deg[i, 0])) for i, name in enumerate(names)}
+        rates = dict(zip(names, angular_rates(ra_h, dec_deg, RATE_PROBE_SECONDS).tolist()))
+        return positions, rates, source
+
+    def refresh(self, date=None, names=None):
+        """
+        Recalcula y publica las posiciones (puede llamarse también en forma sincrónica)
+
+        Args:
+            date: datetime UTC (None = ahora)
+            names: cuerpos a recalcular (None = todos)
+
+        Returns:
+            int: versión del catálogo publicada, o None si no se pudo calcular
+        """
+        # Import diferido: el catálogo se carga recién al publicar
+        from shared.celestial_data import publish_ephemeris
+
+        t0 = time.perf_counter()
+        ephemeris, rates, source = self.compute(date, names)
+        if ephemeris is None:
+            return None
+
+        version = publish_ephemeris(ephemeris, persist=self.persist)
+        now = time.monotonic()
+        for name, rate in rates.items():
+            self.scheduler.record(name, rate, now)
+
+        self.last_update = (datetime.now(timezone.utc), source, version)
+        print(f"[Efemérides] {', '.join(ephemeris)} actualizados ({source}, "
+              f"{(time.perf_counter() - t0)*1000:.0f} ms, versión {version})")
+        return version
+
+
+# Instancia global compartida por la aplicación gráfica y la de consola
+ephemeris_worker = EphemerisWorker()
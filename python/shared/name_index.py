@@ -0,0 +1,366 @@
+# name_index.py
+"""
+Índice de nombres: búsqueda exacta, completado por prefijo y búsqueda tolerante a errores
+
+Las claves normalizadas (minúsculas, sin acentos, letras griegas escritas)
+se guardan ordenadas: es un trie aplanado, donde todas las claves con un
+prefijo forman un rango contiguo que se encuentra con dos búsquedas binarias.
+Dentro del rango, las mejores sugerencias salen de un argpartition sobre el
+rango de importancia, así completar cuesta O(log N + rango) en C.
+
+La búsqueda aproximada usa un índice de trigramas (se arma con build_trigrams
+al cargar o, si no, en la primera consulta) para elegir pocos candidatos y la distancia de Damerau-Levenshtein
+para ordenarlos.
+"""
+import bisect
+import threading
+import unicodedata
+import numpy as np
+
+# Letras griegas (símbolo y abreviatura de 3 letras de los catálogos) → nombre
+GREEK_LETTERS = {
+    'α': 'alpha', 'β': 'beta', 'γ': 'gamma', 'δ': 'delta', 'ε': 'epsilon', 'ζ': 'zeta',
+    'η': 'eta', 'θ': 'theta', 'ι': 'iota', 'κ': 'kappa', 'λ': 'lambda', 'μ': 'mu',
+    'ν': 'nu', 'ξ': 'xi', 'ο': 'omicron', 'π': 'pi', 'ρ': 'rho', 'σ': 'sigma',
+    'τ': 'tau', 'υ': 'upsilon', 'φ': 'phi', 'χ': 'chi', 'ψ': 'psi', 'ω': 'omega',
+}
+GREEK_ABBREVIATIONS = {
+    'alf': 'alpha', 'bet': 'beta', 'gam': 'gamma', 'del': 'delta', 'eps': 'epsilon',
+    'zet': 'zeta', 'tet': 'theta', 'iot': 'iota', 'kap': 'kappa', 'lam': 'lambda',
+    'ksi': 'xi', 'omi': 'omicron', 'sig': 'sigma', 'ups': 'upsilon', 'ome': 'omega',
+}
+
+# Alias de los objetos del JSON: número HIP, Bayer, Flamsteed y nombres en
+# inglés y castellano. Los nombres que no estén en el catálogo se ignoran.
+ALIASES = {
+    'Acrux': ('α Cru', 'HIP 60718', 'Alpha Crucis'),
+    'Aldebaran': ('α Tau', '87 Tau', 'HIP 21421', 'Aldebarán'),
+    'Hadar': ('β Cen', 'HIP 68702', 'Agena'),
+    'Adhara': ('ε CMa', '21 CMa', 'HIP 33579'),
+    'Castor': ('α Gem', '66 Gem', 'HIP 36850', 'Cástor'),
+    'Gacrux': ('γ Cru', 'HIP 61084'),
+    'Bellatrix': ('γ Ori', '24 Ori', 'HIP 25336'),
+    'Elnath': ('β Tau', '112 Tau', 'HIP 25428'),
+    'Saiph': ('κ Ori', '53 Ori', 'HIP 27366'),
+    'Regulus': ('α Leo', '32 Leo', 'HIP 49669', 'Régulo'),
+    'Sirius': ('α CMa', '9 CMa', 'HIP 32349', 'Sirio'),
+    'Betelgeuse': ('α Ori', '58 Ori', 'HIP 27989'),
+    'Rigel': ('β Ori', '19 Ori', 'HIP 24436'),
+    'Vega': ('α Lyr', '3 Lyr', 'HIP 91262'),
+    'Antares': ('α Sco', '21 Sco', 'HIP 80763'),
+    'Polaris': ('α UMi', '1 UMi', 'HIP 11767', 'Estrella Polar', 'North Star'),
+    'Altair': ('α Aql', '53 Aql', 'HIP 97649'),
+    'Deneb': ('α Cyg', '50 Cyg', 'HIP 102098'),
+    'Spica': ('α Vir', '67 Vir', 'HIP 65474', 'Espiga'),
+    'Arcturus': ('α Boo', '16 Boo', 'HIP 69673', 'Arturo'),
+    'Canopus': ('α Car', 'HIP 30438', 'Canopo'),
+    'Achernar': ('α Eri', 'HIP 7588'),
+    'Alpha Centauri': ('α Cen', 'HIP 71683', 'Rigil Kentaurus', 'Rigil Kent', 'Alfa Centauri'),
+    'Fomalhaut': ('α PsA', '24 PsA', 'HIP 113368'),
+    'Diphda': ('β Cet', '16 Cet', 'HIP 3419', 'Deneb Kaitos'),
+    'Mintaka': ('δ Ori', '34 Ori', 'HIP 25930'),
+    'Alnilam': ('ε Ori', '46 Ori', 'HIP 26311'),
+    'Alnitak': ('ζ Ori', '50 Ori', 'HIP 26727'),
+    'Electra': ('17 Tau', 'HIP 17499'),
+    'Merope': ('23 Tau', 'HIP 17608'),
+    'Alcyone': ('η Tau', '25 Tau', 'HIP 17702'),
+    'Atlas': ('27 Tau', 'HIP 17847'),
+    'Pleione': ('28 Tau', 'HIP 17851'),
+    'Taygeta': ('19 Tau', 'HIP 17531'),
+    'Maia': ('20 Tau', 'HIP 17573'),
+    'Sol': ('Sun',),
+    'Luna': ('Moon',),
+    'Mercurio': ('Mercury',),
+    'Marte': ('Mars',),
+    'Jupiter': ('Júpiter',),
+    'Saturno': ('Saturn',),
+    'LMC': ('Gran Nube de Magallanes', 'Large Magellanic Cloud'),
+    'SMC': ('Pequeña Nube de Magallanes', 'Small Magellanic Cloud', 'NGC 292'),
+    'M31': ('Andromeda', 'Andrómeda', 'NGC 224'),
+    'M33': ('Triangulum', 'Galaxia del Triángulo', 'NGC 598'),
+    'M81': ('Galaxia de Bode', "Bode's Galaxy", 'NGC 3031'),
+    'M51': ('Whirlpool', 'Galaxia del Remolino', 'NGC 5194'),
+}
+
+# Penalización de importancia de un alias frente al nombre principal
+ALIAS_PENALTY = 0.5
+
+# Nombres de letras griegas (primera palabra de las claves Bayer: 'beta ori')
+_GREEK_NAMES = frozenset(GREEK_LETTERS.values())
+
+# Máximo de candidatos por trigramas que se comparan con la distancia de edición
+FUZZY_CANDIDATES = 16
+
+# Máximo de ids de trigramas contados por consulta: en índices grandes los
+# trigramas comunes ('hip' en 120k nombres HIP) se descartan, primero los raros
+FUZZY_MAX_POSTINGS = 8192
+
+
+# Signos ASCII → espacio (camino rápido de normalize)
+_ASCII_PUNCTUATION = str.maketrans({c: ' ' for c in map(chr, range(128)) if not c.isalnum()})
+
+
+def normalize(name, partial=False):
+    """
+    Clave de búsqueda de un nombre
+
+    Minúsculas, sin acentos ni signos, letras griegas escritas ('α Cen' y
+    'alf Cen' → 'alpha cen') y un único espacio entre palabras.
+
+    Args:
+        name: texto a normalizar
+        partial: si True, name está a medio escribir: la abreviatura griega se
+                 reemplaza solo si la primera palabra está terminada ('Bet Ori'
+                 sí, 'Bet' no, porque puede ser el comienzo de 'Betelgeuse')
+    """
+    text = name.lower()
+    if text.isascii():
+        text = text.translate(_ASCII_PUNCTUATION)
+    else:
+        text = ''.join(GREEK_LETTERS.get(c, c) for c in text)
+        text = unicodedata.normalize('NFKD', text)
+        text = ''.join(c if c.isalnum() else ' ' for c in text if not unicodedata.combining(c))
+    words = text.split()
+    finished = not partial or len(words) > 1 or text[-1:].isspace()
+    if words and finished and words[0] in GREEK_ABBREVIATIONS:
+        words[0] = GREEK_ABBREVIATIONS[words[0]]
+    return ' '.join(words)
+
+
+def edit_distance(a, b, limit, prefix=False):
+    """
+    Distancia de Damerau-Levenshtein (transposiciones adyacentes) acotada
+
+    Args:
+        a, b: textos a comparar
+        limit: distancia máxima de interés
+        prefix: si True, distancia de a al comienzo de b más parecido (a a medio escribir)
+
+    Returns:
+        int: distancia, o limit + 1 si la supera
+    """
+    if prefix:
+        b = b[:len(a) + limit]
+    elif abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = ca != cb
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        # Ninguna fila futura puede bajar de limit (la transposición mira dos filas atrás)
+        if min(current) > limit and min(previous) >= limit:
+            return limit + 1
+        previous2, previous = previous, current
+    if prefix:
+        # La última fila tiene la distancia de a a cada prefijo de b
+        return min(previous[max(len(a) - limit, 1):])
+    return previous[-1]
+
+
+def max_typos(query):
+    """Errores tolerados según el largo de la consulta"""
+    return 0 if len(query) < 3 else 1 if len(query) < 6 else 2
+
+
+def _gaps(lo, hi, ranges):
+    """Partes de [lo, hi) que no cubren los rangos ordenados y disjuntos de ranges"""
+    gaps = []
+    for a, b in ranges:
+        if a > lo:
+            gaps.append((lo, a))
+        lo = max(lo, b)
+    if lo < hi:
+        gaps.append((lo, hi))
+    return gaps
+
+
+def _trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class NameIndex:
+    """Índice inmutable de nombres → nombre canónico, con importancia para ordenar"""
+
+    def __init__(self, entries=()):
+        """
+        Args:
+            entries: iterable de (texto, nombre canónico, importancia); menor
+                     importancia = mejor sugerencia. Un texto repetido se queda
+                     con la entrada más importante.
+        """
+        best = {}
+        for text, name, rank in entries:
+            key = normalize(text)
+            if key and (key not in best or rank < best[key][1]):
+                best[key] = (name, rank)
+
+        self._entries = best
+        self._keys = sorted(best)
+        self._names = [best[key][0] for key in self._keys]
+        self._ranks = np.array([best[key][1] for key in self._keys], dtype=np.float64)
+        self._trigram_index = None
+        self._trigram_lock = threading.Lock()
+
+    @classmethod
+    def from_names(cls, names, aliases=None):
+        """
+        Índice de una lista de nombres (la posición en la lista es la importancia)
+
+        Args:
+            names: nombres canónicos
+            aliases: dict opcional nombre → alias
+        """
+        aliases = aliases or {}
+        return cls(
+            (text, name, rank + ALIAS_PENALTY * (text != name))
+            for rank, name in enumerate(names)
+            for text in (name,) + tuple(aliases.get(name, ()))
+        )
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, name):
+        return normalize(name) in self._entries
+
+    def lookup(self, name):
+        """Nombre canónico de un nombre o alias exacto (normalizado), o None"""
+        entry = self._entries.get(normalize(name))
+        return None if entry is None else entry[0]
+
+    def _range(self, key):
+        """Rango [lo, hi) de las claves que empiezan con key (dos búsquedas binarias)"""
+        lo = bisect.bisect_left(self._keys, key)
+        return lo, bisect.bisect_left(self._keys, key + '\uffff', lo)
+
+    def complete(self, prefix, limit=8):
+        """
+        Nombres canónicos cuyas claves empiezan con prefix, de mayor a menor importancia
+
+        Returns:
+            list: tuplas (nombre canónico, importancia), sin repetir nombres
+        """
+        key = normalize(prefix, partial=True)
+        if not key:
+            return []
+        lo, hi = self._range(key)
+        segments = [(lo, hi, 0)]
+        if ' ' not in key:
+            # Primera palabra a medio escribir: 'Bet' puede ser 'Betelgeuse' o
+            # 'Bet Ori'. Las claves Bayer ('beta ori') van después de los nombres
+            # propios, y si la palabra es una abreviatura griega se busca además
+            # el rango del nombre de la letra
+            bayer = sorted(self._range(greek + ' ') for greek in _GREEK_NAMES
+                           if greek != key and greek.startswith(key))
+            folded = normalize(prefix)
+            if bayer or folded != key:
+                segments = [(a, b, 0) for a, b in _gaps(lo, hi, bayer)]
+                segments += [(a, b, 1) for a, b in bayer]
+                if folded != key:
+                    segments.append(self._range(folded) + (1,))
+
+        # Mejores claves de cada rango (sin recorrer el rango en Python); se
+        # piden más que limit porque varios alias llevan al mismo nombre
+        take = limit * 4
+        penalties = {}
+        for seg_lo, seg_hi, penalty in segments:
+            if seg_hi - seg_lo > take:
+                picks = (np.argpartition(self._ranks[seg_lo:seg_hi], take - 1)[:take] + seg_lo).tolist()
+            else:
+                picks = range(seg_lo, seg_hi)
+            for i in picks:
+                penalties[i] = min(penalties.get(i, penalty), penalty)
+        picks = sorted(penalties, key=lambda i: (penalties[i], self._ranks[i], len(self._keys[i])))
+        return self._unique([(self._names[i], float(self._ranks[i])) for i in picks], limit)
+
+    def fuzzy(self, query, limit=8, max_distance=None, prefix=False):
+        """
+        Nombres parecidos a query (tolera errores de tipeo)
+
+        Args:
+            query: texto buscado
+            limit: cantidad máxima de resultados
+            max_distance: errores tolerados (None = según el largo, ver max_typos)
+            prefix: si True, compara contra el comienzo de cada clave (texto a medio escribir)
+
+        Returns:
+            list: tuplas (nombre canónico, distancia), de menor a mayor distancia e importancia
+        """
+        key = normalize(query, partial=prefix)
+        limit_distance = max_typos(key) if max_distance is None else max_distance
+        if not key or limit_distance == 0:
+            return []
+
+        postings = sorted((ids for gram in _trigrams(key)
+                           for ids in (self._trigrams().get(gram),) if ids is not None), key=len)
+        if not postings:
+            return []
+        # Los trigramas más raros primero, hasta FUZZY_MAX_POSTINGS ids (siempre al menos uno)
+        total = np.cumsum([len(ids) for ids in postings])
+        postings = postings[:max(1, int(np.searchsorted(total, FUZZY_MAX_POSTINGS, side='right')))]
+        # Candidatos: las claves que comparten más trigramas con la consulta
+        ids, counts = np.unique(np.concatenate(postings), return_counts=True)
+        take = min(FUZZY_CANDIDATES, len(ids))
+        candidates = ids[np.argpartition(-counts, take - 1)[:take]]
+
+        scored = []
+        for i in candidates.tolist():
+            distance = edit_distance(key, self._keys[i], limit_distance, prefix)
+            if distance <= limit_distance:
+                scored.append((distance, self._ranks[i], self._names[i]))
+        scored.sort()
+        return self._unique([(name, distance) for distance, _, name in scored], limit)
+
+    def resolve(self, name):
+        """Nombre canónico por coincidencia exacta o, si no hay, el más parecido (o None)"""
+        exact = self.lookup(name)
+        if exact is not None:
+            return exact
+        matches = self.fuzzy(name, limit=1)
+        return matches[0][0] if matches else None
+
+    def build_trigrams(self):
+        """
+        Arma ya el índice de trigramas de fuzzy
+
+        Con cientos de miles de nombres tarda casi un segundo: se llama al
+        cargar el catálogo, no en la primera búsqueda desde la GUI.
+
+        Returns:
+            NameIndex: el mismo índice
+        """
+        self._trigrams()
+        return self
+
+    def _trigrams(self):
+        """Índice trigrama → ids de clave (se arma una sola vez, ver build_trigrams)"""
+        if self._trigram_index is None:
+            with self._trigram_lock:
+                if self._trigram_index is None:
+                    grams = {}
+                    for i, key in enumerate(self._keys):
+                        for gram in _trigrams(key):
+                            grams.setdefault(gram, []).append(i)
+                    self._trigram_index = {
+                        gram: np.array(ids, dtype=np.int32) for gram, ids in grams.items()
+                    }
+        return self._trigram_index
+
+    @staticmethod
+    def _unique(results, limit):
+        """Primeras limit tuplas sin repetir el nombre canónico"""
+        seen = set()
+        unique = []
+        for name, value in results:
+            if name not in seen:
+                seen.add(name)
+                unique.append((name, value))
+                if len(unique) == limit:
+                    break
+        return unique
@@ -0,0 +1,80 @@
+# sidereal_clock.py
+"""
+Reloj sideral monotónico compartido por tracker, renderer, servidor y CLI
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from shared.calculations.astronomy import calculate_lst
+from config import LOCATION_LONGITUDE
+
+# Grados de tiempo sideral por segundo SI
+SIDEREAL_DEG_PER_SECOND = 360.98564736629 / 86400.0
+
+
+class SiderealClock:
+    """
+    Ancla UTC→LST una vez y deriva el LST de un reloj monotónico
+
+    Cada lectura cuesta una resta y una multiplicación; el cálculo de
+    calendario completo solo se repite al re-sincronizar.
+    """
+
+    def __init__(self, longitude_deg=LOCATION_LONGITUDE, resync_interval=600.0,
+                 time_source=time.perf_counter, utc_source=None):
+        """
+        Args:
+            longitude_deg: longitud del observador en grados
+            resync_interval: segundos entre re-sincronizaciones automáticas (None = nunca)
+            time_source: función monotónica en segundos (inyectable para pruebas)
+            utc_source: función que retorna el datetime UTC actual
+        """
+        self.longitude_deg = longitude_deg
+        self.resync_interval = resync_interval
+        self._time_source = time_source
+        self._utc_source = utc_source or (lambda: datetime.now(timezone.utc))
+        self._lock = threading.Lock()
+        self._anchor = None  # (t_monotónico, lst_deg, utc)
+        self.sync()
+
+    def sync(self):
+        """Re-ancla el reloj contra el UTC actual"""
+        with self._lock:
+            now_utc = self._utc_source()
+            t = self._time_source()
+            lst_deg, _ = calculate_lst(now_utc, self.longitude_deg)
+            # Reemplazo atómico de la tupla: los lectores nunca ven un ancla a medias
+            self._anchor = (t, lst_deg, now_utc)
+
+    def _elapsed(self):
+        """Segundos desde el ancla, re-sincronizando si venció el intervalo"""
+        t = self._time_source()
+        anchor = self._anchor
+        elapsed = t - anchor[0]
+
+        if self.resync_interval is not None and elapsed > self.resync_interval:
+            self.sync()
+            anchor = self._anchor
+            elapsed = self._time_source() - anchor[0]
+
+        return anchor, elapsed
+
+    def lst(self):
+        """
+        Retorna el LST actual
+
+        Returns:
+            tuple: (LST en grados, LST en horas)
+        """
+        anchor, elapsed = self._elapsed()
+        lst_deg = (anchor[1] + elapsed * SIDEREAL_DEG_PER_SECOND) % 360
+        return lst_deg, lst_deg / 15
+
+    def utc_now(self):
+        """Retorna el datetime UTC derivado del reloj monotónico"""
+        anchor, elapsed = self._elapsed()
+        return anchor[2] + timedelta(seconds=elapsed)
+
+
+# Instancia global compartida por todos los subsistemas
+sidereal_clock = SiderealClock()
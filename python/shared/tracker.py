@@ -2,26 +2,96 @@
 """
 Sistema de rastreo de objetos celestes
 """
-from datetime import datetime, timezone
-from shared.calculations.astronomy import calculate_lst, ra_dec_to_xyz, calculate_vector_angles
-from shared.celestial_data import get_all_celestial_objects
-from config import LOCATION_LONGITUDE
+from shared.calculations.astronomy import (
+    project_many, calculate_vector_angles,
+    equatorial_unit_vectors, project_unit_vectors, scale_projection, precision_dtype
+)
+from shared.calculations.apparent_place import apparent_place, apply_refraction
+from shared.celestial_data import (
+    find_celestial_object, resolve_object_name, suggest_object_names
+)
+import threading
+from shared.name_index import NameIndex
+from shared.sidereal_clock import sidereal_clock
+from config import USE_APPARENT_PLACE, USE_REFRACTION, POINTING_PRECISION
 
 
 class ObjectTracker:
     """Clase para gestionar el rastreo de objetos celestes"""
     
-    def __init__(self):
+    def __init__(self, clock=sidereal_clock, use_apparent=USE_APPARENT_PLACE,
+                 use_refraction=USE_REFRACTION, precision=POINTING_PRECISION, satellites=None,
+                 minor_bodies=None):
         self.tracking_object = None
-        self.celestial_objects = get_all_celestial_objects()
+        self.clock = clock
+        self.satellites = satellites  # SatelliteCatalog opcional
+        self.minor_bodies = minor_bodies  # MinorBodyCatalog opcional
+        self.use_apparent = use_apparent
+        self.use_refraction = use_refraction
+        self.dtype = precision_dtype(precision)
+        self._extra_index = None  # nombres de satélites y cuerpos menores (se arma en segundo plano)
+        if satellites is not None or minor_bodies is not None:
+            # Con todos los cuerpos del MPC son más de un millón de nombres: fuera del hilo de la GUI
+            threading.Thread(target=self._build_extra_index, daemon=True).start()
     
-    def start_tracking(self, object_name):
-        """Inicia el rastreo de un objeto"""
-        obj_lower = object_name.lower().strip()
-        if obj_lower in self.celestial_objects:
-            self.tracking_object = object_name.strip()
-            return True
-        return False
+    def resolve(self, object_name, fuzzy=False):
+        """
+        Nombre canónico de un objeto rastreable
+        
+        Prueba, en orden, nombre o alias exacto del catálogo, satélites, cuerpos
+        menores y, si fuzzy, el nombre del catálogo más parecido (errores de tipeo).
+        
+        Args:
+            object_name: nombre o alias buscado
+            fuzzy: si True, tolera errores de tipeo (solo para el cuadro de búsqueda)
+        
+        Returns:
+            str: nombre canónico o None
+        """
+        name = object_name.strip()
+        if not name:
+            return None
+        canonical = resolve_object_name(name)
+        if canonical is not None:
+            return canonical
+        for catalog in (self.satellites, self.minor_bodies):
+            if catalog is not None and name in catalog:
+                return catalog.get_name(name)
+        return resolve_object_name(name, fuzzy=True) if fuzzy else None
+    
+    def suggest(self, prefix, limit=8):
+        """
+        Sugerencias de nombres rastreables para un texto a medio escribir
+        
+        Returns:
+            list: nombres canónicos (catálogo primero, luego satélites y cuerpos menores)
+        """
+        if not prefix.strip():
+            return []
+        names = suggest_object_names(prefix, limit)
+        extra = self._extra_index  # None mientras se arma: solo faltan esas sugerencias
+        if len(names) < limit and extra is not None:
+            names += [name for name, _ in extra.complete(prefix, limit) if name not in names]
+        return names[:limit]
+    
+    def _build_extra_index(self):
+        """Arma el índice de nombres de satélites y cuerpos menores (hilo de fondo)"""
+        names = [name for catalog in (self.satellites, self.minor_bodies)
+                 if catalog is not None for name in catalog.names]
+        if names:
+            self._extra_index = NameIndex.from_names(names)
+    
+    def is_trackable(self, object_name, fuzzy=False):
+        """Indica si el nombre corresponde a un objeto del catálogo, un satélite o un cuerpo menor"""
+        return self.resolve(object_name, fuzzy) is not None
+    
+    def start_tracking(self, object_name, fuzzy=False):
+        """Inicia el rastreo de un objeto (acepta alias y, si fuzzy, errores de tipeo)"""
+        canonical = self.resolve(object_name, fuzzy)
+        if canonical is None:
+            return False
+        self.tracking_object = canonical
+        return True
     
     def stop_tracking(self):
         """Detiene el rastreo"""
@@ -48,23 +118,10 @@ class ObjectTracker:
         if not self.tracking_object:
             return False
         
-        obj_lower = self.tracking_object.lower()
-        if obj_lower not in self.celestial_objects:
+        target = self._target_position()
+        if target is None:
             return False
-        
-        # Obtener coordenadas RA/DEC del objeto
-        obj_data = self.celestial_objects[obj_lower]
-        ra_h = obj_data['ra_hours']
-        dec_deg = obj_data['dec_degrees']
-        size = obj_data.get('size', 1.0)
-        color = obj_data.get('color', [1.0, 1.0, 1.0])
-        
-        # Calcular LST actual
-        now_utc = datetime.now(timezone.utc)
-        lst_deg, lst_h = calculate_lst(now_utc, LOCATION_LONGITUDE)
-        
-        # Convertir a coordenadas 3D
-        target_x, target_y, target_z = ra_dec_to_xyz(ra_h, dec_deg, lst_h)
+        target_x, target_y, target_z = target
         
         # Calcular ángulos para apuntar al objeto
         yaw, pitch = calculate_vector_angles(
@@ -76,4 +133,45 @@ class ObjectTracker:
         vector.yaw = yaw
         vector.pitch = pitch
         
-        return True
\ No newline at end of file
+        return True
+    
+    def _target_position(self):
+        """
+        Posición 3D (modo 'xyz') del objeto rastreado en este instante
+        
+        Returns:
+            tuple: (x, y, z) o None si el objeto ya no existe o no se pudo propagar
+        """
+        obj_lower = self.tracking_object.lower()
+        obj_data = find_celestial_object(obj_lower)
+        if obj_data is not None:
+            return self._project_target(obj_data['ra_hours'], obj_data['dec_degrees'])
+        
+        # Satélites: se propagan en cada llamada (se mueven grados por segundo)
+        if self.satellites is not None and obj_lower in self.satellites:
+            return self.satellites.position(obj_lower, self.clock.utc_now().timestamp(), mode='xyz')
+        
+        # Asteroides y cometas: se propaga solo el objetivo, al instante actual
+        if self.minor_bodies is not None and obj_lower in self.minor_bodies:
+            ra_h, dec_deg = self.minor_bodies.radec_one(obj_lower, self.clock.utc_now().timestamp())
+            return self._project_target(ra_h, dec_deg)
+        return None
+    
+    def _project_target(self, ra_h, dec_deg):
+        """Proyecta el objetivo a coordenadas 3D con el LST del reloj compartido"""
+        lst_deg, lst_h = self.clock.lst()
+        
+        if self.use_apparent or self.use_refraction:
+            return self._project_apparent(ra_h, dec_deg, lst_h)
+        return project_many([ra_h], [dec_deg], lst_h, mode='xyz', dtype=self.dtype)[0]
+    
+    def _project_apparent(self, ra_h, dec_deg, lst_h):
+        """Proyecta el objetivo aplicando posición aparente y/o refracción"""
+        vectors = equatorial_unit_vectors([ra_h], [dec_deg], dtype=self.dtype)
+        if self.use_apparent:
+            vectors = apparent_place.transform(vectors, self.clock.utc_now().timestamp())
+        
+        xyz = project_unit_vectors(vectors, lst_h, dome_radius=1.0)
+        if self.use_refraction:
+            xyz = apply_refraction(xyz)
+        return scale_projection(xyz, mode='xyz')[0]